@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Compresión de respuestas: bytes transmitidos frente a CPU.
+
+Primera parte, sin red: comprime con cada codificación disponible (gzip y, con
+pip install .[compression], br y zstd) y varios niveles las respuestas típicas
+del servidor: list_agents con 100 y 1000 agentes, list_models con el catálogo
+completo y una sesión SSE de 50 get_agent comprimida como flujo, con un flush
+por evento como hace CompressionMiddleware. Para cada caso informa bytes,
+ratio, tiempo de compresión y descompresión (mínimo de varias repeticiones) y
+el tiempo total estimado a --bandwidth-mbps: comprimir + transmitir +
+descomprimir, frente a transmitir sin comprimir. Los agentes del sustituto
+se parecen mucho entre sí, así que los ratios de list_agents son optimistas;
+los de list_models y los tiempos por byte son representativos.
+
+Segunda parte: lista agentes con AzureFoundryClient contra
+benchmarks/foundry_standin.py --gzip, pidiendo Accept-Encoding por defecto y
+"identity". Informa bytes recibidos y decodificados
+(foundry_response_bytes_total) y la latencia en loopback, donde el ancho de
+banda no limita y solo se ve el coste de CPU. Uso:
+
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --bandwidth-mbps 20 --agents 2000
+    python benchmarks/bench_compression.py --json compresion.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from creacion_agente_mcp.domain.value_objects import AIModel  # noqa: E402
+from creacion_agente_mcp.infrastructure.azure import (  # noqa: E402
+    AzureAgentRepository,
+    AzureFoundryClient,
+    AzureFoundryConfig,
+)
+from creacion_agente_mcp.infrastructure.azure.azure_foundry_client import (  # noqa: E402
+    AzureAgentResponse,
+)
+from creacion_agente_mcp.observability import ServerMetrics  # noqa: E402
+from creacion_agente_mcp.presentation.agent_encoder import AgentEncoder  # noqa: E402
+from creacion_agente_mcp.presentation.compression import (  # noqa: E402
+    Compressor,
+    available_encodings,
+)
+from creacion_agente_mcp.presentation.mcp_server import _encode_model_list  # noqa: E402
+from bench_load import free_port, wait_for  # noqa: E402
+from foundry_standin import seed_agent  # noqa: E402
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 9, 11), "zstd": (1, 3, 9, 19)}
+
+def decompressor(encoding: str) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        return lambda data: zlib.decompressobj(31).decompress(data)
+    if encoding == "br":
+        import brotli
+
+        return lambda data: brotli.Decompressor().process(data)
+    import zstandard
+
+    return lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+def sse_frame(request_id: int, text: str) -> bytes:
+    result = {"content": [{"type": "text", "text": text}], "isError": False}
+    message = json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result})
+    return f"event: message\r\ndata: {message}\r\n\r\n".encode()
+
+def payloads() -> dict[str, list[bytes]]:
+    # Each payload is the list of body chunks the middleware sees; SSE sends one per event
+    repository = AzureAgentRepository(
+        AzureFoundryClient(AzureFoundryConfig(endpoint="https://bench.invalid", api_key="bench"))
+    )
+    agents = [
+        repository._map_response_to_agent(AzureAgentResponse(**seed_agent(0, index)))
+        for index in range(1000)
+    ]
+    encoder = AgentEncoder()
+    return {
+        "list_agents[100]": [encoder.encode_list(agents[:100]).encode()],
+        "list_agents[1000]": [encoder.encode_list(agents).encode()],
+        "list_models": [_encode_model_list(AIModel.catalog().query()).encode()],
+        "sse get_agent x50": [
+            sse_frame(index, encoder.encode(agent)) for index, agent in enumerate(agents[:50])
+        ],
+    }
+
+def best_of(operation: Callable[[], Any], budget: float = 0.2, max_rounds: int = 50) -> float:
+    best = float("inf")
+    deadline = time.perf_counter() + budget
+    for _ in range(max_rounds):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+        if time.perf_counter() > deadline:
+            break
+    return best
+
+def compress(encoding: str, level: int, chunks: list[bytes]) -> bytes:
+    compressor = Compressor(encoding, level)
+    stream = len(chunks) > 1
+    out = b"".join(compressor.compress(chunk, flush=stream) for chunk in chunks)
+    return out + compressor.finish()
+
+def measure_codecs(bandwidth: float) -> list[dict[str, Any]]:
+    rows = []
+    for name, chunks in payloads().items():
+        size = sum(len(chunk) for chunk in chunks)
+        rows.append(
+            {
+                "payload": name,
+                "encoding": "identity",
+                "level": None,
+                "bytes": size,
+                "compress_ms": 0.0,
+                "decompress_ms": 0.0,
+                "total_ms": size / bandwidth * 1000,
+            }
+        )
+        for encoding in available_encodings():
+            decode = decompressor(encoding)
+            for level in LEVELS[encoding]:
+                data = compress(encoding, level, chunks)
+                assert decode(data) == b"".join(chunks)
+                compress_time = best_of(lambda: compress(encoding, level, chunks))
+                decompress_time = best_of(lambda: decode(data))
+                rows.append(
+                    {
+                        "payload": name,
+                        "encoding": encoding,
+                        "level": level,
+                        "bytes": len(data),
+                        "compress_ms": compress_time * 1000,
+                        "decompress_ms": decompress_time * 1000,
+                        "total_ms": (compress_time + len(data) / bandwidth + decompress_time)
+                        * 1000,
+                    }
+                )
+    return rows
+
+def received(metrics: ServerMetrics) -> tuple[float, float]:
+    # (wire, decoded) bytes of list_agents responses so far, whatever their encoding
+    counter = metrics.upstream_response_bytes
+    wire = decoded = 0.0
+    for encoding in ("gzip", "br", "zstd", "deflate", "identity"):
+        wire += counter.value(operation="list_agents", encoding=encoding, stage="wire")
+        decoded += counter.value(operation="list_agents", encoding=encoding, stage="decoded")
+    return wire, decoded
+
+async def measure_foundry(agents: int, rounds: int) -> list[dict[str, Any]]:
+    # In its own process: sharing the event loop with the client distorts the timings
+    port = free_port()
+    standin = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).resolve().parent / "foundry_standin.py"),
+            "--port", str(port),
+            "--projects", "1",
+            "--agents", str(agents),
+            "--latency-ms", "0",
+            "--jitter-ms", "0",
+            "--gzip",
+        ]
+    )
+    rows = []
+    try:
+        wait_for(f"http://127.0.0.1:{port}/api/projects")
+        for accept_encoding in (None, "identity"):
+            metrics = ServerMetrics()
+            client = AzureFoundryClient(
+                AzureFoundryConfig(
+                    endpoint=f"http://127.0.0.1:{port}",
+                    api_key="bench",
+                    accept_encoding=accept_encoding,
+                    project_index_ttl=0,
+                ),
+                metrics=metrics,
+            )
+            await client.list_agents("proyecto-0")
+            before = received(metrics)
+            samples = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                await client.list_agents("proyecto-0")
+                samples.append(time.perf_counter() - started)
+            wire, decoded = (
+                (after - start) / rounds for after, start in zip(received(metrics), before)
+            )
+            await client.aclose()
+            rows.append(
+                {
+                    "accept_encoding": accept_encoding or "por defecto",
+                    "wire_bytes": wire,
+                    "decoded_bytes": decoded,
+                    "p50_ms": statistics.median(samples) * 1000,
+                }
+            )
+    finally:
+        standin.terminate()
+        standin.wait()
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=100.0,
+        help="ancho de banda para estimar el tiempo de transmisión",
+    )
+    parser.add_argument(
+        "--agents", type=int, default=1000, help="agentes del proyecto en la parte de Foundry"
+    )
+    parser.add_argument("--rounds", type=int, default=20, help="listados por modo contra Foundry")
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    args = parser.parse_args()
+    bandwidth = args.bandwidth_mbps * 1_000_000 / 8
+
+    codecs = measure_codecs(bandwidth)
+    print(f"Códecs (total estimado a {args.bandwidth_mbps:g} Mbit/s)")
+    print(
+        f"{'carga':<20} {'codificación':<12} {'nivel':>5} {'bytes':>10} {'ratio':>7} "
+        f"{'comprimir':>11} {'MB/s':>8} {'descomprimir':>13} {'total':>10}"
+    )
+    identity: dict[str, int] = {}
+    for row in codecs:
+        if row["encoding"] == "identity":
+            identity[row["payload"]] = row["bytes"]
+        original = identity[row["payload"]]
+        speed = original / row["compress_ms"] / 1000 if row["compress_ms"] else float("inf")
+        print(
+            f"{row['payload']:<20} {row['encoding']:<12} {row['level'] or '-':>5} "
+            f"{row['bytes']:>10,} {original / row['bytes']:>6.1f}x "
+            f"{row['compress_ms']:>8.3f} ms {speed:>8.0f} {row['decompress_ms']:>10.3f} ms "
+            f"{row['total_ms']:>7.2f} ms"
+        )
+
+    foundry = asyncio.run(measure_foundry(args.agents, args.rounds))
+    print(f"\nFoundry (sustituto con gzip, {args.agents} agentes, loopback)")
+    print(f"{'Accept-Encoding':<16} {'recibidos':>12} {'decodificados':>14} {'p50':>10}")
+    for row in foundry:
+        print(
+            f"{row['accept_encoding']:<16} {row['wire_bytes']:>12,.0f} "
+            f"{row['decoded_bytes']:>14,.0f} {row['p50_ms']:>7.2f} ms"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"codecs": codecs, "foundry": foundry}, indent=2, ensure_ascii=False) + "\n"
+        )
+
+if __name__ == "__main__":
+    main()
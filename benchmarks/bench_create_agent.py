@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark de creaciones por segundo de `create_agent` solo en CPU.
+
+Recorre el camino completo de una creación (argumentos de la herramienta,
+CreateAgentDTO, CreateAgentUseCase, AzureAgentRepository y mapeo de la
+respuesta) contra un cliente de Azure AI Foundry simulado que devuelve el
+cuerpo enviado sin tocar la red. Uso:
+
+    python benchmarks/bench_create_agent.py --iterations 20000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from creacion_agente_mcp.application.use_cases import (  # noqa: E402
+    CreateAgentDTO,
+    CreateAgentUseCase,
+)
+from creacion_agente_mcp.infrastructure.azure import (  # noqa: E402
+    AzureAgentRepository,
+    AzureFoundryClient,
+    AzureFoundryConfig,
+)
+from creacion_agente_mcp.infrastructure.azure.azure_foundry_client import (  # noqa: E402
+    AzureAgentResponse,
+)
+
+ARGUMENTS = {
+    "project_name": "bench-project",
+    "name": "agente-bench",
+    "model_name": "gpt-4o",
+    "temperature": 0.3,
+    "max_tokens": 4096,
+    "instructions": "Eres un asistente que responde preguntas sobre facturación.",
+    "tools": ["buscar_factura", "enviar_correo"],
+    "metadata": {"team": "billing", "env": "bench"},
+}
+
+class EchoFoundryClient(AzureFoundryClient):
+    # Encodes the body like httpx would and echoes it back as the created agent
+    async def create_agent(self, project_name: str, request: Any) -> AzureAgentResponse:
+        payload = request if isinstance(request, dict) else request.model_dump(exclude_none=True)
+        body = json.loads(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        return AzureAgentResponse(id="asst_bench", created_at=1700000000, **body)
+
+def build_use_case() -> CreateAgentUseCase:
+    client = EchoFoundryClient(AzureFoundryConfig(endpoint="https://bench.invalid", api_key="bench"))
+    return CreateAgentUseCase(AzureAgentRepository(client))
+
+async def run_phase(use_case: CreateAgentUseCase, phase: str, iterations: int) -> float:
+    dto = CreateAgentDTO(**ARGUMENTS)
+    started = time.perf_counter()
+    if phase == "dto":
+        for _ in range(iterations):
+            CreateAgentDTO(**ARGUMENTS)
+    elif phase == "build":
+        for _ in range(iterations):
+            use_case._build_agent(dto)
+    else:
+        for _ in range(iterations):
+            await use_case.execute(CreateAgentDTO(**ARGUMENTS))
+    return time.perf_counter() - started
+
+async def measure(iterations: int, repeat: int) -> dict[str, float]:
+    use_case = build_use_case()
+    await run_phase(use_case, "create", min(iterations, 1000))
+    results = {}
+    for phase in ("dto", "build", "create"):
+        gc.collect()
+        results[phase] = min([await run_phase(use_case, phase, iterations) for _ in range(repeat)])
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="creaciones por medición")
+    parser.add_argument("--repeat", type=int, default=5, help="mediciones por fase (se toma la mejor)")
+    args = parser.parse_args()
+
+    results = asyncio.run(measure(args.iterations, args.repeat))
+    print(f"{'fase':>8} {'ops/s':>12} {'us/op':>8}")
+    for phase, elapsed in results.items():
+        print(f"{phase:>8} {args.iterations / elapsed:>12.0f} {elapsed / args.iterations * 1e6:>8.2f}")
+
+if __name__ == "__main__":
+    main()
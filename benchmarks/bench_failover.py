@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Enrutado entre endpoints regionales de Foundry y conmutación por error.
+
+Arranca un benchmarks/foundry_standin.py por región, cada uno con su latencia
+(--latencies-ms; la primera región es la más rápida) y un AzureFoundryClient
+con todos ellos como AZURE_AI_ENDPOINT + AZURE_AI_ENDPOINTS. Durante
+--phase-seconds por fase, --concurrency tareas piden get_agent sin pausa:
+
+    normal       todas las regiones sanas: el tráfico va a la más rápida
+    caída        la región más rápida se detiene: errores de conexión
+    recuperada   vuelve a arrancar: las sondas la readmiten y recupera el tráfico
+    503          arranca devolviendo 503 en la mitad de las respuestas
+
+Para cada fase informa peticiones por región (foundry_endpoint_requests_total),
+conmutaciones (foundry_failovers_total), errores vistos por el cliente y
+latencia p50/p99. get_agent es idempotente, así que ninguna fase debería
+devolver errores: falla (código 1) si alguna los tiene. Uso:
+
+    python benchmarks/bench_failover.py
+    python benchmarks/bench_failover.py --latencies-ms 5 30 60 --phase-seconds 10
+    python benchmarks/bench_failover.py --json conmutacion.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from creacion_agente_mcp.infrastructure.azure import (  # noqa: E402
+    AzureFoundryClient,
+    AzureFoundryConfig,
+)
+from creacion_agente_mcp.infrastructure.azure.endpoint_router import (  # noqa: E402
+    endpoint_label,
+)
+from creacion_agente_mcp.observability import ServerMetrics  # noqa: E402
+from bench_load import free_port, wait_for  # noqa: E402
+from foundry_standin import agent_id  # noqa: E402
+
+STANDIN = Path(__file__).resolve().parent / "foundry_standin.py"
+PHASES = ("normal", "caída", "recuperada", "503")
+
+class Region:
+    def __init__(self, latency_ms: float) -> None:
+        self.latency_ms = latency_ms
+        self.port = free_port()
+        self.endpoint = f"http://127.0.0.1:{self.port}"
+        self.process: Optional[subprocess.Popen[bytes]] = None
+
+    def start(self, error_rate: float = 0.0) -> None:
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                str(STANDIN),
+                "--port", str(self.port),
+                "--projects", "1",
+                "--agents", "50",
+                "--latency-ms", str(self.latency_ms),
+                "--jitter-ms", str(self.latency_ms / 10),
+                "--error-rate", str(error_rate),
+            ]
+        )
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
+
+def snapshot(metrics: ServerMetrics, regions: list[Region]) -> dict[str, float]:
+    counts = {}
+    for region in regions:
+        label = endpoint_label(region.endpoint)
+        for outcome in ("success", "failure"):
+            counts[f"{label}/{outcome}"] = metrics.endpoint_requests.value(
+                endpoint=label, outcome=outcome
+            )
+    counts["failovers"] = sum(value for _, value in metrics.upstream_failovers.samples())
+    return counts
+
+async def run_phase(
+    client: AzureFoundryClient, seconds: float, concurrency: int
+) -> tuple[list[float], int]:
+    samples: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+
+    async def worker(offset: int) -> None:
+        nonlocal errors
+        index = offset
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                await client.get_agent("proyecto-0", agent_id(0, index % 50))
+            except Exception:
+                errors += 1
+            samples.append(time.perf_counter() - started)
+            index += concurrency
+
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return samples, errors
+
+async def run(args: argparse.Namespace) -> int:
+    regions = [Region(latency) for latency in args.latencies_ms]
+    for region in regions:
+        region.start()
+    metrics = ServerMetrics()
+    client = AzureFoundryClient(
+        AzureFoundryConfig(
+            endpoint=regions[0].endpoint,
+            endpoints=[region.endpoint for region in regions[1:]],
+            api_key="bench",
+            project_index_ttl=0,
+            not_found_ttl=0,
+            slow_request_threshold=0,
+            endpoint_probe_interval=args.probe_interval,
+        ),
+        metrics=metrics,
+    )
+    fastest = regions[0]
+    rows: list[dict[str, Any]] = []
+    try:
+        for region in regions:
+            wait_for(f"{region.endpoint}/api/projects")
+        for phase in PHASES:
+            if phase == "caída":
+                fastest.stop()
+            elif phase == "recuperada":
+                fastest.start()
+            elif phase == "503":
+                fastest.stop()
+                fastest.start(error_rate=0.5)
+            before = snapshot(metrics, regions)
+            samples, errors = await run_phase(client, args.phase_seconds, args.concurrency)
+            after = snapshot(metrics, regions)
+            delta = {key: after[key] - before[key] for key in after}
+            quantiles = statistics.quantiles(samples, n=100)
+            rows.append(
+                {
+                    "phase": phase,
+                    "requests": len(samples),
+                    "errors": errors,
+                    "failovers": delta.pop("failovers"),
+                    "per_endpoint": delta,
+                    "p50_ms": quantiles[49] * 1000,
+                    "p99_ms": quantiles[98] * 1000,
+                }
+            )
+    finally:
+        await client.aclose()
+        for region in regions:
+            region.stop()
+
+    labels = [endpoint_label(region.endpoint) for region in regions]
+    header = " ".join(f"{f'{region.latency_ms:g} ms':>16}" for region in regions)
+    print(f"Regiones (latencia): {', '.join(labels)}")
+    print(
+        f"{'fase':<11} {'peticiones':>10} {'errores':>8} {'conmutaciones':>13} {header} "
+        f"{'p50':>9} {'p99':>9}"
+    )
+    for row in rows:
+        per_endpoint = " ".join(
+            f"{row['per_endpoint'][f'{label}/success']:>8.0f} ok/"
+            f"{row['per_endpoint'][f'{label}/failure']:<4.0f}"
+            for label in labels
+        )
+        print(
+            f"{row['phase']:<11} {row['requests']:>10} {row['errors']:>8} "
+            f"{row['failovers']:>13.0f} {per_endpoint} "
+            f"{row['p50_ms']:>6.1f} ms {row['p99_ms']:>6.1f} ms"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2, ensure_ascii=False) + "\n")
+    failed = [row for row in rows if row["errors"]]
+    for row in failed:
+        print(f"FALLO: {row['errors']} errores en la fase {row['phase']}", file=sys.stderr)
+    return 1 if failed else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--latencies-ms", type=float, nargs="+", default=[10.0, 40.0],
+        help="latencia de cada región; la primera es la que cae",
+    )
+    parser.add_argument("--phase-seconds", type=float, default=5.0, help="duración de cada fase")
+    parser.add_argument("--concurrency", type=int, default=8, help="peticiones simultáneas")
+    parser.add_argument(
+        "--probe-interval", type=float, default=0.5, help="FOUNDRY_ENDPOINT_PROBE_INTERVAL"
+    )
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    args = parser.parse_args()
+    if len(args.latencies_ms) < 2:
+        parser.error("hacen falta al menos dos regiones")
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
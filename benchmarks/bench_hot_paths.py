@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks de los caminos calientes: dominio, mapeo y serialización.
+
+Mide sin red ni Azure la construcción de ModelConfiguration,
+CreateAgentUseCase.execute con un repositorio simulado, el mapeo de respuestas
+de Foundry a Agent (de 1 a 10 000 agentes), Agent.to_dict más la codificación
+JSON y el despacho de MCPServer._call_tool. Cada caso se repite en varias
+rondas y se informa mínimo, mediana, media y desviación por operación.
+
+Las rondas se alternan entre casos y el mínimo de cada caso, el estadístico
+menos sensible al ruido de la máquina, se compara con la línea base en
+benchmarks/baselines/hot_paths.json; falla (código 1) si algún caso empeora más
+que su umbral. Las líneas base dependen de la máquina: regenerarlas con --save
+en la misma máquina que ejecuta la comparación. Uso:
+
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --filter map_response --rounds 20
+    python benchmarks/bench_hot_paths.py --save
+    python benchmarks/bench_hot_paths.py --json resultados.json --threshold 0.5
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from creacion_agente_mcp.application.use_cases import (  # noqa: E402
+    CreateAgentDTO,
+    CreateAgentUseCase,
+    GetAgentUseCase,
+    ListAgentsUseCase,
+)
+from creacion_agente_mcp.domain.entities import Agent  # noqa: E402
+from creacion_agente_mcp.domain.repositories import IAgentRepository  # noqa: E402
+from creacion_agente_mcp.domain.value_objects import AgentId, ModelConfiguration  # noqa: E402
+from creacion_agente_mcp.infrastructure.azure import (  # noqa: E402
+    AzureAgentRepository,
+    AzureFoundryClient,
+    AzureFoundryConfig,
+)
+from creacion_agente_mcp.infrastructure.azure.azure_foundry_client import (  # noqa: E402
+    AzureAgentResponse,
+)
+from creacion_agente_mcp.presentation.agent_encoder import AgentEncoder  # noqa: E402
+from creacion_agente_mcp.presentation.mcp_server import MCPServer  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+
+# Allowed slowdown of the fastest round against the baseline; cases can override it there
+DEFAULT_THRESHOLD = 0.25
+
+# Each round runs long enough to dwarf timer resolution and loop overhead
+MIN_ROUND_TIME = 0.05
+
+PROJECT = "bench-project"
+
+ARGUMENTS = {
+    "project_name": PROJECT,
+    "name": "agente-bench",
+    "model_name": "gpt-4o",
+    "temperature": 0.3,
+    "max_tokens": 4096,
+    "instructions": "Eres un asistente que responde preguntas sobre facturación.",
+    "tools": ["buscar_factura", "enviar_correo"],
+    "metadata": {"team": "billing", "env": "bench"},
+}
+
+def synthetic_response(index: int) -> AzureAgentResponse:
+    return AzureAgentResponse(
+        id=f"asst_{index:06d}",
+        name=f"agente-{index}",
+        model="gpt-4o",
+        instructions="Eres un asistente que responde preguntas sobre facturación.",
+        tools=[
+            {"type": "function", "function": {"name": "buscar_factura"}},
+            {"type": "function", "function": {"name": "enviar_correo"}},
+        ],
+        metadata={"team": "billing", "temperature": 0.3, "maxTokens": 4096},
+        created_at=1700000000 + index,
+    )
+
+def synthetic_agents(count: int) -> list[Agent]:
+    repository = AzureAgentRepository(client(), max_cached_agents=0)
+    return [repository._map_response_to_agent(synthetic_response(i)) for i in range(count)]
+
+def client() -> AzureFoundryClient:
+    return AzureFoundryClient(AzureFoundryConfig(endpoint="https://bench.invalid", api_key="bench"))
+
+class StubAgentRepository(IAgentRepository):
+    # In-memory repository: measures the use cases and the server, not Foundry
+    def __init__(self, agents: Optional[list[Agent]] = None) -> None:
+        self._agents = {agent.id.value: agent for agent in agents or []}
+
+    async def create(self, project_name: str, agent: Agent) -> Agent:
+        return agent
+
+    async def find_by_id(self, project_name: str, agent_id: AgentId) -> Agent | None:
+        return self._agents.get(agent_id.value)
+
+    async def find_all(self, project_name: str) -> list[Agent]:
+        return list(self._agents.values())
+
+    async def delete(self, project_name: str, agent_id: AgentId) -> None:
+        self._agents.pop(agent_id.value, None)
+
+def build_server(agents: list[Agent]) -> MCPServer:
+    repository = StubAgentRepository(agents)
+    return MCPServer(
+        create_agent_use_case=CreateAgentUseCase(repository),
+        get_agent_use_case=GetAgentUseCase(repository),
+        list_agents_use_case=ListAgentsUseCase(repository),
+        azure_client=client(),
+    )
+
+# name -> setup; setup returns the operation to time, sync or async
+CASES: dict[str, Callable[[], Callable[[], Any]]] = {}
+
+def case(name: str) -> Callable[[Callable[[], Callable[[], Any]]], Any]:
+    def register(setup: Callable[[], Callable[[], Any]]) -> Any:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+@case("model_configuration")
+def _model_configuration() -> Callable[[], Any]:
+    return lambda: ModelConfiguration(model_name="gpt-4o", temperature=0.3, max_tokens=4096)
+
+@case("model_configuration_detect_provider")
+def _model_configuration_detect() -> Callable[[], Any]:
+    return lambda: ModelConfiguration(model_name="claude-3-5-sonnet")
+
+@case("create_agent_execute")
+def _create_agent_execute() -> Callable[[], Awaitable[Any]]:
+    use_case = CreateAgentUseCase(StubAgentRepository())
+    return lambda: use_case.execute(CreateAgentDTO(**ARGUMENTS))
+
+def _map_responses(count: int, cached: bool) -> Callable[[], Any]:
+    responses = [synthetic_response(i) for i in range(count)]
+    repository = AzureAgentRepository(client(), max_cached_agents=count if cached else 0)
+
+    def run() -> None:
+        for response in responses:
+            repository._map_response_to_agent(response)
+
+    if cached:
+        run()
+    return run
+
+for _count in (1, 100, 10000):
+    case(f"map_response[{_count}]")(lambda count=_count: _map_responses(count, cached=False))
+case("map_response_cached[10000]")(lambda: _map_responses(10000, cached=True))
+
+@case("agent_to_dict_json")
+def _agent_to_dict_json() -> Callable[[], Any]:
+    agent = synthetic_agents(1)[0]
+    return lambda: json.dumps(agent.to_dict(), indent=2)
+
+@case("agent_encoder_list[1000]")
+def _agent_encoder_list() -> Callable[[], Any]:
+    agents = synthetic_agents(1000)
+    encoder = AgentEncoder()
+    encoder.encode_list(agents)
+    return lambda: encoder.encode_list(agents)
+
+@case("call_tool_get_agent")
+def _call_tool_get_agent() -> Callable[[], Awaitable[Any]]:
+    agents = synthetic_agents(1)
+    server = build_server(agents)
+    arguments = {"projectName": PROJECT, "agentId": agents[0].id.value}
+    return lambda: server._call_tool("get_agent", arguments)
+
+@case("call_tool_list_agents[100]")
+def _call_tool_list_agents() -> Callable[[], Awaitable[Any]]:
+    server = build_server(synthetic_agents(100))
+    return lambda: server._call_tool("list_agents", {"projectName": PROJECT})
+
+@case("call_tool_list_models")
+def _call_tool_list_models() -> Callable[[], Awaitable[Any]]:
+    server = build_server([])
+    return lambda: server._call_tool("list_models", {"supportsTools": True})
+
+async def time_round(operation: Callable[[], Any], iterations: int, is_async: bool) -> float:
+    started = time.perf_counter()
+    if is_async:
+        for _ in range(iterations):
+            await operation()
+    else:
+        for _ in range(iterations):
+            operation()
+    return time.perf_counter() - started
+
+class Benchmark:
+    def __init__(self, setup: Callable[[], Callable[[], Any]]) -> None:
+        self.operation = setup()
+        self.is_async = False
+        self.iterations = 1
+        self.times: list[float] = []
+
+    async def calibrate(self) -> None:
+        result = self.operation()
+        self.is_async = asyncio.iscoroutine(result)
+        if self.is_async:
+            await result
+        # Doubles as the warm-up round
+        while (elapsed := await self.run_round()) < MIN_ROUND_TIME:
+            factor = 2 if elapsed < MIN_ROUND_TIME / 10 else 1 + int(MIN_ROUND_TIME / elapsed)
+            self.iterations *= factor
+
+    async def run_round(self) -> float:
+        started = time.perf_counter()
+        if self.is_async:
+            for _ in range(self.iterations):
+                await self.operation()
+        else:
+            for _ in range(self.iterations):
+                self.operation()
+        return time.perf_counter() - started
+
+    def stats(self) -> dict[str, Any]:
+        median = statistics.median(self.times)
+        return {
+            "rounds": len(self.times),
+            "iterations": self.iterations,
+            "min": min(self.times),
+            "max": max(self.times),
+            "mean": statistics.fmean(self.times),
+            "median": median,
+            "stddev": statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+            "ops": 1 / median,
+        }
+
+async def measure(
+    setups: dict[str, Callable[[], Callable[[], Any]]], rounds: int
+) -> dict[str, dict[str, Any]]:
+    benchmarks = {name: Benchmark(setup) for name, setup in setups.items()}
+    for benchmark in benchmarks.values():
+        await benchmark.calibrate()
+
+    # Rounds go round-robin across cases, so a slow spell on a shared machine is
+    # spread over every case instead of failing whichever case it landed on
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for benchmark in benchmarks.values():
+                benchmark.times.append(await benchmark.run_round() / benchmark.iterations)
+    finally:
+        gc.enable()
+    return {name: benchmark.stats() for name, benchmark in benchmarks.items()}
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+def compare(
+    results: dict[str, dict[str, Any]], baseline: dict[str, Any], threshold: Optional[float]
+) -> list[str]:
+    regressions = []
+    cases = baseline.get("cases", {})
+    print(
+        f"{'caso':<36} {'mínimo':>11} {'mediana':>11} {'ops/s':>11} {'desv.':>7} {'base':>11} "
+        f"{'cambio':>8}"
+    )
+    for name, stats in results.items():
+        line = (
+            f"{name:<36} {format_time(stats['min']):>11} {format_time(stats['median']):>11} "
+            f"{stats['ops']:>11.0f} "
+            f"{stats['stddev'] / stats['mean'] * 100:>6.1f}%"
+        )
+        reference = cases.get(name)
+        if reference is None:
+            print(f"{line} {'-':>11} {'nuevo':>8}")
+            continue
+        limit = threshold
+        if limit is None:
+            limit = reference.get("threshold", baseline.get("threshold", DEFAULT_THRESHOLD))
+        change = stats["min"] / reference["min"] - 1
+        line += f" {format_time(reference['min']):>11} {change * 100:>+7.1f}%"
+        if change > limit:
+            regressions.append(f"{name}: {change * 100:+.1f}% (umbral {limit * 100:.0f}%)")
+            line += "  REGRESIÓN"
+        print(line)
+    return regressions
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def machine_info() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--rounds", type=int, default=10, help="rondas por caso")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="fichero de línea base")
+    parser.add_argument("--save", action="store_true", help="guarda los resultados como línea base")
+    parser.add_argument("--json", type=Path, help="escribe los resultados en este fichero")
+    parser.add_argument(
+        "--threshold", type=float, help="empeoramiento tolerado (0.25 = 25%%) para todos los casos"
+    )
+    args = parser.parse_args()
+
+    selected = {name: setup for name, setup in CASES.items() if args.filter in name}
+    if not selected:
+        parser.error(f"ningún caso contiene '{args.filter}': {', '.join(CASES)}")
+
+    results = asyncio.run(measure(selected, args.rounds))
+    baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.threshold)
+
+    document = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "cases": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    if args.save:
+        # Keep per-case thresholds and cases that were not run this time
+        cases = baseline.get("cases", {})
+        for name, stats in results.items():
+            if "threshold" in cases.get(name, {}):
+                stats = {**stats, "threshold": cases[name]["threshold"]}
+            cases[name] = stats
+        document.update(threshold=baseline.get("threshold", DEFAULT_THRESHOLD), cases=cases)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"\nlínea base guardada en {args.baseline}")
+    elif regressions:
+        print("\nregresiones:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Memoria pico de list_agents según el número de agentes del proyecto.
+
+Compara, con tracemalloc y sin red, el listado acumulado (una sola respuesta de
+Foundry con todos los agentes, ListAgentsUseCase.execute y
+AgentEncoder.encode_list) con el listado por páginas que usa el servidor
+(limit/after, ListAgentsUseCase.stream y AgentEncoder.encode_pages). Las
+respuestas de Foundry se sirven desde memoria con httpx.MockTransport y ya
+codificadas, así que solo cuenta lo que asigna el cliente. Las cachés de
+agentes y de codificación tienen el tamaño de producción
+(AGENT_CACHE_MAX_ENTRIES por defecto, o --cache-entries).
+
+Para cada tamaño se informa el tamaño del documento JSON devuelto, el pico de
+memoria, lo que retienen las cachés al terminar y el exceso transitorio (pico
+menos documento y cachés). En el listado por páginas el exceso depende del
+tamaño de página y las cachés del límite de entradas, ninguno del número de
+agentes; falla (código 1) si el exceso supera --budget-kb o las cachés
+--cache-budget-kb en algún tamaño. Uso:
+
+    python benchmarks/bench_list_memory.py
+    python benchmarks/bench_list_memory.py --counts 100 1000 10000 50000 --page-size 50
+    python benchmarks/bench_list_memory.py --cache-entries 0
+    python benchmarks/bench_list_memory.py --json memoria.json
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from creacion_agente_mcp.application.use_cases import ListAgentsUseCase  # noqa: E402
+from creacion_agente_mcp.config import Settings  # noqa: E402
+from creacion_agente_mcp.infrastructure.azure import (  # noqa: E402
+    AzureAgentRepository,
+    AzureFoundryClient,
+    AzureFoundryConfig,
+)
+from creacion_agente_mcp.presentation.agent_encoder import AgentEncoder  # noqa: E402
+from foundry_standin import seed_agent  # noqa: E402
+
+PROJECT = "proyecto-0"
+
+def encoded_pages(count: int, page_size: int) -> dict[str, bytes]:
+    # Response body for each cursor ("" is the first page), encoded before measuring
+    agents = [seed_agent(0, index) for index in range(count)]
+    pages = {}
+    after = ""
+    for start in range(0, max(count, 1), page_size):
+        page = agents[start : start + page_size]
+        pages[after] = json.dumps(
+            {
+                "object": "list",
+                "data": page,
+                "first_id": page[0]["id"] if page else None,
+                "last_id": page[-1]["id"] if page else None,
+                "has_more": start + page_size < count,
+            }
+        ).encode()
+        after = page[-1]["id"] if page else ""
+    return pages
+
+def build(
+    pages: dict[str, bytes], page_size: int, cache_entries: int
+) -> tuple[ListAgentsUseCase, AgentEncoder]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        after = parse_qs(request.url.query.decode()).get("after", [""])[0]
+        return httpx.Response(
+            200, content=pages[after], headers={"Content-Type": "application/json"}
+        )
+
+    config = AzureFoundryConfig(
+        endpoint="https://bench.invalid",
+        api_key="bench",
+        list_page_size=page_size,
+        project_index_ttl=0,
+        slow_request_threshold=0,
+    )
+    client = AzureFoundryClient(config)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # Both caches sized as main.build_mcp_server does
+    repository = AzureAgentRepository(client, max_cached_agents=cache_entries)
+    return ListAgentsUseCase(repository), AgentEncoder(max_entries=cache_entries)
+
+async def buffered(use_case: ListAgentsUseCase, encoder: AgentEncoder) -> str:
+    agents = await use_case.execute(PROJECT)
+    return encoder.encode_list(agents)
+
+async def streamed(use_case: ListAgentsUseCase, encoder: AgentEncoder) -> str:
+    pages = use_case.stream(PROJECT)
+    async with contextlib.aclosing(pages):
+        return await encoder.encode_pages(pages)
+
+async def measure(
+    count: int,
+    served_page_size: int,
+    page_size: int,
+    cache_entries: int,
+    listing: Callable[[ListAgentsUseCase, AgentEncoder], Awaitable[str]],
+) -> dict[str, Any]:
+    # served_page_size is what the mock returns per response, whatever limit is asked
+    pages = encoded_pages(count, served_page_size)
+    use_case, encoder = build(pages, page_size, cache_entries)
+    # A first call outside the measurement warms imports, the pool and lazy state
+    await listing(*build(encoded_pages(1, page_size), page_size, cache_entries))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        text = await listing(use_case, encoder)
+        peak = tracemalloc.get_traced_memory()[1] - before
+        gc.collect()
+        # Still allocated with the document alive: what the caches keep after the call
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    document = sys.getsizeof(text)
+    cache = max(retained - document, 0)
+    return {
+        "agents": count,
+        "document": document,
+        "peak": peak,
+        "cache": cache,
+        "excess": peak - document - cache,
+    }
+
+def kb(size: int) -> str:
+    return f"{size / 1024:,.0f} KB"
+
+async def run(args: argparse.Namespace) -> int:
+    results: dict[str, list[dict[str, Any]]] = {"acumulado": [], "por páginas": []}
+    for count in args.counts:
+        # Everything in one response, as list_agents behaved before paging
+        results["acumulado"].append(
+            await measure(count, max(count, 1), args.page_size, args.cache_entries, buffered)
+        )
+        results["por páginas"].append(
+            await measure(count, args.page_size, args.page_size, args.cache_entries, streamed)
+        )
+
+    print(f"Cachés de agentes y de codificación: {args.cache_entries} entradas")
+    print(
+        f"{'modo':<12} {'agentes':>8} {'documento':>12} {'pico':>12} {'cachés':>12} "
+        f"{'exceso':>12}"
+    )
+    for mode, rows in results.items():
+        for row in rows:
+            print(
+                f"{mode:<12} {row['agents']:>8} {kb(row['document']):>12} "
+                f"{kb(row['peak']):>12} {kb(row['cache']):>12} {kb(row['excess']):>12}"
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    failed = False
+    for row in results["por páginas"]:
+        if row["excess"] > args.budget_kb * 1024:
+            failed = True
+            print(
+                f"FALLO: {row['agents']} agentes por páginas exceden {kb(row['excess'])} "
+                f"(presupuesto {args.budget_kb} KB)",
+                file=sys.stderr,
+            )
+        if row["cache"] > args.cache_budget_kb * 1024:
+            failed = True
+            print(
+                f"FALLO: con {row['agents']} agentes las cachés retienen {kb(row['cache'])} "
+                f"(presupuesto {args.cache_budget_kb} KB)",
+                file=sys.stderr,
+            )
+    return 1 if failed else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[100, 1000, 10000, 30000],
+        help="número de agentes del proyecto en cada medición",
+    )
+    parser.add_argument("--page-size", type=int, default=100, help="agentes por página (1-100)")
+    parser.add_argument(
+        "--budget-kb", type=int, default=2048,
+        help="exceso máximo del listado por páginas sobre el documento y las cachés",
+    )
+    parser.add_argument(
+        "--cache-entries", type=int,
+        default=Settings.model_fields["agent_cache_max_entries"].default,
+        help="AGENT_CACHE_MAX_ENTRIES (por defecto el de producción)",
+    )
+    parser.add_argument(
+        "--cache-budget-kb", type=int, default=16384,
+        help="memoria máxima que pueden retener las cachés tras un listado",
+    )
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Generador de carga de extremo a extremo para el servidor MCP, sin red externa.
+
+Arranca un sustituto local de Azure AI Foundry (benchmarks/foundry_standin.py)
+y el servidor MCP apuntando a él, abre N sesiones MCP concurrentes por stdio
+(un proceso por sesión, como cada ventana de Copilot o Claude Desktop), SSE o
+streamable HTTP, y lanza una mezcla ponderada de herramientas a un ritmo
+objetivo en lazo abierto: cada llamada sale a su hora aunque las anteriores no
+hayan terminado, y su latencia se mide desde esa hora, así que las colas del
+servidor no quedan ocultas. Informa throughput, latencias p50/p95/p99/máx por
+herramienta y el desglose de errores. Uso:
+
+    python benchmarks/bench_load.py --transport streamable-http --sessions 200 --rate 400
+    python benchmarks/bench_load.py --transport stdio --sessions 20 --rate 50 --duration 30
+    python benchmarks/bench_load.py --mix get_agent=6,list_agents=2,create_agent=1 \\
+        --latency-ms 80 --error-rate 0.01 --server-env RESPONSE_CACHE_TTLS={} --json carga.json
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from foundry_standin import agent_id, project_name  # noqa: E402
+
+TOOLS = ("create_agent", "get_agent", "list_agents", "list_models", "list_projects")
+
+# Roughly what a Copilot session does: mostly reads, a few creations
+DEFAULT_MIX = "get_agent=5,list_agents=3,list_models=2,list_projects=1,create_agent=1"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        tool, _, weight = part.partition("=")
+        if tool not in TOOLS:
+            raise argparse.ArgumentTypeError(f"herramienta desconocida: {tool}")
+        mix[tool] = float(weight or 1)
+    return mix
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Nearest rank on sorted values
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))]
+
+class Workload:
+    def __init__(self, mix: dict[str, float], projects: int, agents: int, seed: int) -> None:
+        self._tools = list(mix)
+        self._weights = list(mix.values())
+        self._projects = projects
+        self._agents = agents
+        self._random = random.Random(seed)
+        self._created = itertools.count()
+
+    def next_call(self) -> tuple[str, dict[str, Any]]:
+        tool = self._random.choices(self._tools, self._weights)[0]
+        project = self._random.randrange(self._projects)
+        arguments: dict[str, Any] = {"projectName": project_name(project)}
+        if tool == "get_agent":
+            arguments["agentId"] = agent_id(project, self._random.randrange(self._agents))
+        elif tool == "create_agent":
+            arguments.update(name=f"carga-{next(self._created)}", modelName="gpt-4o", temperature=0.3)
+        elif tool == "list_projects":
+            arguments = {}
+        return tool, arguments
+
+class Results:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter[str]] = defaultdict(Counter)
+        self.late = 0
+
+    def record(self, tool: str, latency: float, error: Optional[str]) -> None:
+        self.latencies[tool].append(latency)
+        if error is not None:
+            self.errors[tool][error] += 1
+
+def classify(result: Any) -> Optional[str]:
+    # Tool failures come back as "Error: ..." text, with isError only on some paths
+    text = result.content[0].text if result.content else ""
+    if not result.isError and not text.startswith("Error: "):
+        return None
+    # Group by the stable part of the message: "Server overloaded (queue_full), retry
+    # after 1s" -> "Server overloaded (queue_full)", URLs and agent ids dropped
+    message = text.removeprefix("Error: ").split(" for url ")[0].split(", retry")[0]
+    return message.split(": ")[0][:80] or "tool error"
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.processes: list[subprocess.Popen] = []
+        self.cache_dir = tempfile.mkdtemp(prefix="bench-load-")
+        self.standin_url = args.foundry
+
+    def server_env(self, transport: str, port: Optional[int] = None) -> dict[str, str]:
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(ROOT.parent),
+            "AZURE_AI_ENDPOINT": self.standin_url,
+            "AZURE_AI_API_KEY": "standin",
+            "MCP_TRANSPORT": transport,
+            "MODEL_CATALOG_CACHE_DIR": self.cache_dir,
+            # An empty settings file keeps a local .env from leaking into the run
+            "SETTINGS_FILE": os.devnull,
+        }
+        if port is not None:
+            env.update(MCP_HOST="127.0.0.1", MCP_PORT=str(port))
+        for assignment in self.args.server_env:
+            key, _, value = assignment.partition("=")
+            env[key] = value
+        return env
+
+    def spawn(self, command: list[str], env: Optional[dict[str, str]] = None) -> None:
+        self.processes.append(
+            subprocess.Popen(
+                command, env=env, cwd="/", stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        )
+
+    def start_standin(self) -> None:
+        port = free_port()
+        self.spawn(
+            [
+                sys.executable,
+                str(ROOT / "foundry_standin.py"),
+                "--port", str(port),
+                "--projects", str(self.args.projects),
+                "--agents", str(self.args.agents),
+                "--latency-ms", str(self.args.latency_ms),
+                "--jitter-ms", str(self.args.jitter_ms),
+                "--error-rate", str(self.args.error_rate),
+            ]
+        )
+        self.standin_url = f"http://127.0.0.1:{port}"
+        wait_for(f"{self.standin_url}/api/projects")
+
+    def start_http_server(self) -> str:
+        port = free_port()
+        self.spawn(
+            [sys.executable, "-m", "creacion_agente_mcp.main"],
+            env=self.server_env(self.args.transport, port),
+        )
+        wait_for(f"http://127.0.0.1:{port}/healthz")
+        path = "/sse" if self.args.transport == "sse" else "/mcp"
+        return f"http://127.0.0.1:{port}{path}"
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    @contextlib.asynccontextmanager
+    async def connect(self, url: Optional[str]) -> AsyncIterator[ClientSession]:
+        transport = self.args.transport
+        if transport == "stdio":
+            params = StdioServerParameters(
+                command=sys.executable,
+                args=["-m", "creacion_agente_mcp.main"],
+                env=self.server_env("stdio"),
+                cwd="/",
+            )
+            client = stdio_client(params, errlog=open(os.devnull, "w"))
+        elif transport == "sse":
+            client = sse_client(url, timeout=self.args.timeout)
+        else:
+            client = streamablehttp_client(url, timeout=self.args.timeout)
+        async with client as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                await session.initialize()
+                yield session
+
+async def hold_session(
+    test: LoadTest,
+    url: Optional[str],
+    sessions: list[ClientSession],
+    ready: asyncio.Event,
+    done: asyncio.Event,
+    failures: Counter[str],
+) -> None:
+    # Contexts must exit in the task that entered them, so each session lives here
+    def settled() -> None:
+        if len(sessions) + sum(failures.values()) == test.args.sessions:
+            ready.set()
+
+    try:
+        async with test.connect(url) as session:
+            sessions.append(session)
+            settled()
+            await done.wait()
+    except Exception as e:
+        if not ready.is_set():
+            failures[type(e).__name__] += 1
+            settled()
+
+async def call(
+    session: ClientSession,
+    tool: str,
+    arguments: dict[str, Any],
+    scheduled: float,
+    timeout: float,
+    results: Optional[Results],
+) -> None:
+    error = None
+    try:
+        result = await asyncio.wait_for(session.call_tool(tool, arguments), timeout)
+        error = classify(result)
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = type(e).__name__
+    if results is not None:
+        results.record(tool, time.perf_counter() - scheduled, error)
+
+async def run(test: LoadTest) -> tuple[Results, float, float, Counter[str]]:
+    args = test.args
+    url = None if args.transport == "stdio" else test.start_http_server()
+
+    sessions: list[ClientSession] = []
+    ready, done = asyncio.Event(), asyncio.Event()
+    failures: Counter[str] = Counter()
+    opened = time.perf_counter()
+    holders = [
+        asyncio.create_task(hold_session(test, url, sessions, ready, done, failures))
+        for _ in range(args.sessions)
+    ]
+    await ready.wait()
+    setup = time.perf_counter() - opened
+    if not sessions:
+        raise RuntimeError(f"no se pudo abrir ninguna sesión: {dict(failures)}")
+
+    workload = Workload(args.mix, args.projects, args.agents, args.seed)
+    results = Results()
+    calls: set[asyncio.Task[None]] = set()
+    interval = 1 / args.rate
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    stop_at = measure_from + args.duration
+    try:
+        for index in itertools.count():
+            scheduled = started + index * interval
+            if scheduled >= stop_at:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -interval and scheduled >= measure_from:
+                # The generator itself fell behind; latencies still count from schedule
+                results.late += 1
+            tool, arguments = workload.next_call()
+            task = asyncio.create_task(
+                call(
+                    sessions[index % len(sessions)],
+                    tool,
+                    arguments,
+                    scheduled,
+                    args.timeout,
+                    results if scheduled >= measure_from else None,
+                )
+            )
+            calls.add(task)
+            task.add_done_callback(calls.discard)
+        await asyncio.gather(*calls)
+        elapsed = time.perf_counter() - measure_from
+    finally:
+        done.set()
+        await asyncio.gather(*holders, return_exceptions=True)
+    return results, elapsed, setup, failures
+
+def wait_for(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} no respondió en {timeout:.0f}s")
+
+def report(
+    results: Results, elapsed: float, setup: float, failures: Counter[str], args: argparse.Namespace
+) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "transport": args.transport,
+        "sessions": args.sessions,
+        "target_rate": args.rate,
+        "session_setup_seconds": setup,
+        "session_failures": dict(failures),
+        "late_dispatches": results.late,
+        "tools": {},
+    }
+    rows = [*sorted(results.latencies), "total"]
+    every = sorted(latency for values in results.latencies.values() for latency in values)
+    errors_total: Counter[str] = Counter()
+    for errors in results.errors.values():
+        errors_total.update(errors)
+
+    print(
+        f"{args.sessions} sesiones {args.transport}, objetivo {args.rate:g} llamadas/s, "
+        f"{elapsed:.1f}s medidos (sesiones abiertas en {setup:.2f}s)"
+    )
+    print(
+        f"{'herramienta':<14} {'llamadas':>9} {'/s':>8} {'errores':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8}"
+    )
+    for tool in rows:
+        latencies = every if tool == "total" else sorted(results.latencies[tool])
+        errors = errors_total if tool == "total" else results.errors[tool]
+        stats = {
+            "calls": len(latencies),
+            "throughput": len(latencies) / elapsed,
+            "errors": sum(errors.values()),
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+            "error_breakdown": dict(errors),
+        }
+        summary["tools"][tool] = stats
+        print(
+            f"{tool:<14} {stats['calls']:>9} {stats['throughput']:>8.1f} {stats['errors']:>8} "
+            f"{stats['p50'] * 1000:>8.1f} {stats['p95'] * 1000:>8.1f} "
+            f"{stats['p99'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}"
+        )
+
+    if errors_total:
+        print("\nerrores:")
+        for error, count in errors_total.most_common():
+            print(f"  {count:>7}  {error}")
+    if failures:
+        print(f"\nsesiones que no se pudieron abrir: {dict(failures)}")
+    if results.late:
+        print(f"\n{results.late} llamadas salieron tarde: el generador no alcanza el ritmo objetivo")
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=("stdio", "sse", "streamable-http"), default="streamable-http")
+    parser.add_argument("--sessions", type=int, default=50, help="sesiones MCP concurrentes")
+    parser.add_argument("--rate", type=float, default=100.0, help="llamadas por segundo en total")
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos medidos")
+    parser.add_argument("--warmup", type=float, default=3.0, help="segundos iniciales que no se miden")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"pesos por herramienta (default {DEFAULT_MIX})")
+    parser.add_argument("--timeout", type=float, default=30.0, help="timeout por llamada")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--projects", type=int, default=5, help="proyectos del sustituto de Foundry")
+    parser.add_argument("--agents", type=int, default=50, help="agentes por proyecto")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="latencia del sustituto de Foundry")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracción de 503 del sustituto")
+    parser.add_argument("--foundry", help="usar un sustituto ya arrancado (http://127.0.0.1:8800)")
+    parser.add_argument("--server-env", action="append", default=[], metavar="CLAVE=VALOR", help="variables extra para el servidor MCP")
+    parser.add_argument("--json", type=Path, help="escribe el resumen en este fichero")
+    args = parser.parse_args()
+
+    test = LoadTest(args)
+    try:
+        if args.foundry is None:
+            test.start_standin()
+        results, elapsed, setup, failures = asyncio.run(run(test))
+    finally:
+        test.stop()
+
+    summary = report(results, elapsed, setup, failures, args)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark de RPS del modo pre-fork (MCP_WORKERS) con transporte streamable HTTP.
+
+Levanta el servidor con distintos números de workers y mide peticiones por
+segundo de `tools/call list_models`, que no necesita Azure. Uso:
+
+    python benchmarks/bench_prefork.py --workers 1 2 4 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PAYLOAD = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "tools/call",
+    "params": {"name": "list_models", "arguments": {}},
+}
+HEADERS = {"Accept": "application/json, text/event-stream"}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(workers: int, port: int, control_port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "AZURE_AI_ENDPOINT": "https://bench.invalid",
+        "AZURE_AI_API_KEY": "bench",
+        "MCP_TRANSPORT": "streamable-http",
+        "MCP_HOST": "127.0.0.1",
+        "MCP_PORT": str(port),
+        "MCP_WORKERS": str(workers),
+        "MCP_CONTROL_PORT": str(control_port),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "creacion_agente_mcp.main"],
+        env=env,
+        cwd="/",
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.post(url, json=PAYLOAD, headers=HEADERS, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+async def drive(url: str, concurrency: int, duration: float) -> tuple[int, int]:
+    ok = 0
+    failed = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=10.0) as client:
+        stop_at = time.monotonic() + duration
+
+        async def loop() -> None:
+            nonlocal ok, failed
+            while time.monotonic() < stop_at:
+                try:
+                    response = await client.post(url, json=PAYLOAD, headers=HEADERS)
+                    if response.status_code == 200:
+                        ok += 1
+                    else:
+                        failed += 1
+                except httpx.HTTPError:
+                    failed += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return ok, failed
+
+def client_process(url: str, concurrency: int, duration: float, queue: multiprocessing.Queue) -> None:
+    queue.put(asyncio.run(drive(url, concurrency, duration)))
+
+def measure(workers: int, clients: int, concurrency: int, duration: float) -> tuple[float, int]:
+    port = free_port()
+    server = start_server(workers, port, free_port())
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        wait_ready(url)
+        queue: multiprocessing.Queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=client_process, args=(url, concurrency, duration, queue))
+            for _ in range(clients)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    ok = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    return ok / elapsed, failed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4, help="procesos generadores de carga")
+    parser.add_argument("--concurrency", type=int, default=16, help="peticiones concurrentes por proceso")
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos por medición")
+    args = parser.parse_args()
+
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print(f"{'workers':>8} {'RPS':>10} {'errores':>8} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        rps, failed = measure(workers, args.clients, args.concurrency, args.duration)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.1f} {failed:>8} {rps / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque en frío del punto de entrada stdio.
+
+Mide, en procesos nuevos, el tiempo de importación de `creacion_agente_mcp.main`
+(a partir de `python -X importtime`) y el tiempo hasta la primera respuesta a
+`initialize` por stdio con autenticación por API key. Falla (código 1) si la
+mediana supera el presupuesto. Uso:
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --import-budget-ms 800 --initialize-budget-ms 1200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets for the median of --runs, on a developer laptop; CI can pass its own
+IMPORT_BUDGET_MS = 600.0
+INITIALIZE_BUDGET_MS = 900.0
+
+# Only needed by HTTP transports or Entra ID auth; a stdio session with an API key
+# must not import them itself
+DEFERRED_MODULES = ("azure.identity", "msal")
+
+ENV = {
+    **os.environ,
+    "PYTHONPATH": str(ROOT),
+    "AZURE_AI_ENDPOINT": "https://bench.invalid",
+    "AZURE_AI_API_KEY": "bench",
+    "MCP_TRANSPORT": "stdio",
+}
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-startup", "version": "1.0.0"},
+    },
+}
+
+def parse_importtime(stderr: str) -> tuple[float, dict[str, float], set[str]]:
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    total = 0.0
+    by_package: dict[str, float] = defaultdict(float)
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        modules.add(name)
+        by_package[name.split(".")[0]] += int(self_us) / 1000
+        if name == "creacion_agente_mcp.main":
+            total = int(cumulative_us) / 1000
+    return total, by_package, modules
+
+def measure_import() -> tuple[float, dict[str, float], set[str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import creacion_agente_mcp.main"],
+        env=ENV,
+        cwd="/",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+def measure_initialize() -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "creacion_agente_mcp.main"],
+        env=ENV,
+        cwd="/",
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert process.stdin is not None and process.stdout is not None
+        process.stdin.write((json.dumps(INITIALIZE) + "\n").encode())
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - started
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        return elapsed * 1000
+    finally:
+        # Closing stdin is how MCP clients end a stdio session
+        if process.stdin is not None:
+            process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="procesos por medición")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--initialize-budget-ms", type=float, default=INITIALIZE_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=8, help="paquetes más costosos a mostrar")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _, _ in imports)
+    initialize_ms = statistics.median(measure_initialize() for _ in range(args.runs))
+
+    by_package: dict[str, float] = defaultdict(float)
+    for _, packages, _ in imports:
+        for package, ms in packages.items():
+            by_package[package] += ms / len(imports)
+    loaded = set.union(*(modules for _, _, modules in imports))
+
+    print(f"{'paquete':<24} {'ms (self)':>10}")
+    for package, ms in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{package:<24} {ms:>10.1f}")
+    print()
+    print(f"importación de creacion_agente_mcp.main: {import_ms:8.1f} ms (presupuesto {args.import_budget_ms:.0f})")
+    print(f"primera respuesta a initialize (stdio):  {initialize_ms:8.1f} ms (presupuesto {args.initialize_budget_ms:.0f})")
+
+    failures = [module for module in DEFERRED_MODULES if module in loaded]
+    if failures:
+        print(f"importados sin necesidad: {', '.join(failures)}")
+    if failures or import_ms > args.import_budget_ms or initialize_ms > args.initialize_budget_ms:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
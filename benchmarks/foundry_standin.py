@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita la API REST de Azure AI Foundry, para pruebas sin red.
+
+Sirve proyectos, agentes (assistants) y despliegues en memoria con la forma de
+las respuestas de Foundry, con latencia y tasa de errores configurables. El
+servidor MCP lo usa con AZURE_AI_ENDPOINT=http://127.0.0.1:<puerto> y
+cualquier AZURE_AI_API_KEY. Los proyectos se llaman proyecto-0, proyecto-1...
+y sus agentes asst_<proyecto>_<n>. Uso:
+
+    python benchmarks/foundry_standin.py --port 8800 --projects 5 --agents 50
+    python benchmarks/foundry_standin.py --latency-ms 40 --jitter-ms 20 --error-rate 0.01
+    python benchmarks/foundry_standin.py --gzip
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+DEPLOYMENTS = [
+    {"name": "gpt-4o", "modelName": "gpt-4o", "modelPublisher": "OpenAI", "modelVersion": "2024-08-06"},
+    {"name": "gpt-4o-mini", "modelName": "gpt-4o-mini", "modelPublisher": "OpenAI"},
+    {"name": "gpt-35-turbo", "modelName": "gpt-35-turbo", "modelPublisher": "OpenAI"},
+    {"name": "llama-3-70b", "modelName": "Meta-Llama-3-70B-Instruct", "modelPublisher": "Meta"},
+]
+
+def project_name(index: int) -> str:
+    return f"proyecto-{index}"
+
+def agent_id(project: int, index: int) -> str:
+    return f"asst_{project}_{index}"
+
+def seed_agent(project: int, index: int) -> dict[str, Any]:
+    return {
+        "id": agent_id(project, index),
+        "object": "assistant",
+        "name": f"agente-{index}",
+        "model": DEPLOYMENTS[index % len(DEPLOYMENTS)]["name"],
+        "instructions": "Eres un asistente que responde preguntas sobre facturación.",
+        "tools": [{"type": "function", "function": {"name": "buscar_factura"}}],
+        "metadata": {"team": "billing", "temperature": 0.3, "maxTokens": 4096},
+        "created_at": 1700000000 + index,
+    }
+
+class FoundryStandIn:
+    def __init__(
+        self,
+        projects: int = 5,
+        agents: int = 50,
+        latency: float = 0.02,
+        jitter: float = 0.01,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        gzip: bool = False,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.gzip = gzip
+        self.random = random.Random(seed)
+        self.agents: dict[str, dict[str, dict[str, Any]]] = {
+            project_name(p): {agent_id(p, i): seed_agent(p, i) for i in range(agents)}
+            for p in range(projects)
+        }
+        self.ids = itertools.count(agents)
+        self.requests = 0
+
+    async def _delay(self) -> Response | None:
+        # Simulated upstream latency; also where injected failures happen
+        self.requests += 1
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return JSONResponse({"error": {"code": "ServiceUnavailable"}}, status_code=503)
+        return None
+
+    def _project(self, request: Request) -> dict[str, dict[str, Any]] | None:
+        return self.agents.get(request.path_params["project"])
+
+    async def list_projects(self, request: Request) -> Response:
+        if failure := await self._delay():
+            return failure
+        return JSONResponse({"value": [{"name": name} for name in self.agents]})
+
+    async def assistants(self, request: Request) -> Response:
+        if failure := await self._delay():
+            return failure
+        agents = self._project(request)
+        if agents is None:
+            return JSONResponse({"error": {"code": "NotFound"}}, status_code=404)
+        if request.method == "GET":
+            return self._page(request, list(agents.values()))
+
+        body = await request.json()
+        agent = {
+            **body,
+            "id": f"asst_new_{next(self.ids)}",
+            "object": "assistant",
+            "created_at": int(time.time()),
+        }
+        agents[agent["id"]] = agent
+        return JSONResponse(agent)
+
+    def _page(self, request: Request, agents: list[dict[str, Any]]) -> Response:
+        # Cursor paging as in Foundry: limit (1-100, default 20) and after=<last id>
+        try:
+            limit = min(max(int(request.query_params.get("limit", "20")), 1), 100)
+        except ValueError:
+            limit = 20
+        start = 0
+        if after := request.query_params.get("after"):
+            ids = [agent["id"] for agent in agents]
+            start = ids.index(after) + 1 if after in ids else len(agents)
+        page = agents[start : start + limit]
+        return JSONResponse(
+            {
+                "object": "list",
+                "data": page,
+                "first_id": page[0]["id"] if page else None,
+                "last_id": page[-1]["id"] if page else None,
+                "has_more": start + limit < len(agents),
+            }
+        )
+
+    async def assistant(self, request: Request) -> Response:
+        if failure := await self._delay():
+            return failure
+        agents = self._project(request) or {}
+        agent = agents.get(request.path_params["agent_id"])
+        if agent is None:
+            return JSONResponse({"error": {"code": "NotFound"}}, status_code=404)
+        if request.method == "DELETE":
+            del agents[agent["id"]]
+            return JSONResponse({"id": agent["id"], "deleted": True})
+        return JSONResponse(agent)
+
+    async def deployments(self, request: Request) -> Response:
+        if failure := await self._delay():
+            return failure
+        if self._project(request) is None:
+            return JSONResponse({"error": {"code": "NotFound"}}, status_code=404)
+        if request.headers.get("if-none-match") == '"deployments-v1"':
+            return Response(status_code=304)
+        return JSONResponse({"value": DEPLOYMENTS}, headers={"ETag": '"deployments-v1"'})
+
+    async def root(self, request: Request) -> Response:
+        return Response(status_code=200)
+
+    def app(self) -> Starlette:
+        return Starlette(
+            routes=[
+                Route("/", self.root, methods=["GET", "HEAD"]),
+                Route("/api/projects", self.list_projects),
+                Route(
+                    "/api/projects/{project}/assistants",
+                    self.assistants,
+                    methods=["GET", "POST"],
+                ),
+                Route(
+                    "/api/projects/{project}/assistants/{agent_id}",
+                    self.assistant,
+                    methods=["GET", "DELETE"],
+                ),
+                Route("/api/projects/{project}/deployments", self.deployments),
+            ],
+            # Compresses for clients that send Accept-Encoding: gzip
+            middleware=[Middleware(GZipMiddleware, minimum_size=1024)] if self.gzip else [],
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--projects", type=int, default=5, help="proyectos sembrados")
+    parser.add_argument("--agents", type=int, default=50, help="agentes sembrados por proyecto")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="latencia media por petición")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="variación uniforme de la latencia")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracción de respuestas 503")
+    parser.add_argument("--gzip", action="store_true", help="comprime las respuestas con gzip")
+    args = parser.parse_args()
+
+    standin = FoundryStandIn(
+        projects=args.projects,
+        agents=args.agents,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        gzip=args.gzip,
+    )
+    uvicorn.run(standin.app(), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
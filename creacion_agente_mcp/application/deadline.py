@@ -0,0 +1,56 @@
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from ..domain.exceptions import DeadlineExceededException
+
+# Absolute time.monotonic() deadline of the current tool call, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlinePolicy:
+    def __init__(
+        self,
+        default_budget: float = 30.0,
+        tool_budgets: Optional[dict[str, float]] = None,
+    ) -> None:
+        self._default_budget = default_budget
+        self._tool_budgets = dict(tool_budgets or {})
+
+    def reconfigure(
+        self, default_budget: float, tool_budgets: Optional[dict[str, float]] = None
+    ) -> None:
+        # Calls already running keep the deadline they started with
+        self._default_budget = default_budget
+        self._tool_budgets = dict(tool_budgets or {})
+
+    def budget_for(self, tool: str, requested: Optional[float] = None) -> float:
+        # Clients may shorten the configured budget but never extend it
+        budget = self._tool_budgets.get(tool, self._default_budget)
+        if requested is not None and requested > 0:
+            budget = min(budget, requested)
+        return budget
+
+@contextlib.contextmanager
+def deadline_scope(budget: float) -> Iterator[float]:
+    deadline = time.monotonic() + budget
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+def remaining_budget() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def timeout_within_deadline(default: float) -> float:
+    remaining = remaining_budget()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceededException()
+    return min(default, remaining)
@@ -1,11 +1,22 @@
+import difflib
+from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from ...domain.entities import Agent, AgentProps
 from ...domain.value_objects import AgentName, AgentDescription, ModelConfiguration
-from ...domain.repositories import IAgentRepository
-from ...domain.exceptions import AgentCreationException
+from ...domain.repositories import IAgentRepository, IModelCatalogProvider
+from ...domain.exceptions import (
+    AgentCreationException,
+    DeadlineExceededException,
+    ModelNotFoundException,
+    ProjectNotFoundException,
+    ValidationException,
+)
+from ...observability import NoopTracer, Tracer
+
+_MODEL_PARAMETERS = ("temperature", "max_tokens", "top_p", "frequency_penalty", "presence_penalty")
 
 class CreateAgentDTO(BaseModel):
     project_name: str = Field(..., min_length=1)
@@ -22,43 +33,99 @@ class CreateAgentDTO(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 class CreateAgentUseCase:
-    def __init__(self, agent_repository: IAgentRepository) -> None:
+    def __init__(
+        self,
+        agent_repository: IAgentRepository,
+        tracer: Optional[Tracer] = None,
+        model_catalog: Optional[IModelCatalogProvider] = None,
+    ) -> None:
         self._agent_repository = agent_repository
+        self._tracer = tracer or NoopTracer()
+        self._model_catalog = model_catalog
 
     async def execute(self, dto: CreateAgentDTO) -> Agent:
+        with self._tracer.start_span(
+            "CreateAgentUseCase.execute", {"foundry.project": dto.project_name}
+        ):
+            try:
+                provider = await self._resolve_provider(dto)
+                with self._tracer.start_span("CreateAgentUseCase.build_agent"):
+                    agent = self._build_agent(dto, provider)
+                return await self._agent_repository.create(dto.project_name, agent)
+
+            except (
+                DeadlineExceededException,
+                ProjectNotFoundException,
+                ModelNotFoundException,
+                ValidationException,
+            ):
+                raise
+            except Exception as e:
+                raise AgentCreationException(str(e)) from e
+
+    async def _resolve_provider(self, dto: CreateAgentDTO) -> Optional[str]:
+        # Pre-flight: fail locally when the project's deployments are known and the
+        # model is not among them; otherwise fall back to the static catalog
+        if self._model_catalog is None:
+            return dto.provider
+        with self._tracer.start_span(
+            "CreateAgentUseCase.check_model", {"foundry.project": dto.project_name}
+        ):
+            catalog = await self._model_catalog.get_catalog(dto.project_name)
+        if catalog is None:
+            return dto.provider
+
+        info = catalog.get(dto.model_name)
+        if info is None:
+            suggestions = difflib.get_close_matches(dto.model_name, catalog.as_dict(), n=3)
+            raise ModelNotFoundException(dto.model_name, dto.project_name, suggestions)
+        return dto.provider or info.provider.value
+
+    def _build_agent(self, dto: CreateAgentDTO, provider: Optional[str] = None) -> Agent:
+        provider = provider or dto.provider
         try:
-            # Build model configuration
-            model_config_dict = {"model_name": dto.model_name}
-            if dto.provider:
-                model_config_dict["provider"] = dto.provider
-            if dto.temperature is not None:
-                model_config_dict["temperature"] = dto.temperature
-            if dto.max_tokens is not None:
-                model_config_dict["max_tokens"] = dto.max_tokens
-            if dto.top_p is not None:
-                model_config_dict["top_p"] = dto.top_p
-            if dto.frequency_penalty is not None:
-                model_config_dict["frequency_penalty"] = dto.frequency_penalty
-            if dto.presence_penalty is not None:
-                model_config_dict["presence_penalty"] = dto.presence_penalty
+            return self._build_single_pass(dto, provider)
+        except ValidationError as e:
+            raise ValidationException(_describe(e)) from e
 
-            # Create agent props
-            agent_props = AgentProps(
-                name=AgentName(value=dto.name),
-                description=AgentDescription(
-                    value=dto.instructions or f"Agent using {dto.model_name}"
-                ),
-                model_configuration=ModelConfiguration(**model_config_dict),
-                instructions=dto.instructions,
-                tools=dto.tools,
-                metadata={**dto.metadata, "project_name": dto.project_name},
-            )
+    def _build_single_pass(self, dto: CreateAgentDTO, provider: Optional[str]) -> Agent:
+        # One validation call for the whole aggregate: nested value objects are
+        # checked once instead of being built and then re-validated by AgentProps
+        model_config_dict: dict[str, Any] = {"model_name": dto.model_name}
+        if provider:
+            model_config_dict["provider"] = provider
+        for field in _MODEL_PARAMETERS:
+            value = getattr(dto, field)
+            if value is not None:
+                model_config_dict[field] = value
 
-            # Create and save agent
-            agent = Agent(agent_props)
-            created_agent = await self._agent_repository.create(dto.project_name, agent)
+        now = datetime.now()
+        agent_props = AgentProps.model_validate(
+            {
+                "name": {"value": dto.name},
+                "description": {"value": dto.instructions or f"Agent using {dto.model_name}"},
+                "model_configuration": model_config_dict,
+                "instructions": dto.instructions,
+                "tools": dto.tools,
+                "metadata": {**dto.metadata, "project_name": dto.project_name},
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        return Agent(agent_props)
 
-            return created_agent
+# Errors are reported against the value object that failed, as building them one by
+# one would have, without validating the aggregate a second time
+_VALUE_OBJECTS = {
+    "name": AgentName.__name__,
+    "description": AgentDescription.__name__,
+    "model_configuration": ModelConfiguration.__name__,
+}
 
-        except Exception as e:
-            raise AgentCreationException(str(e)) from e
+def _describe(error: ValidationError) -> str:
+    messages = []
+    for detail in error.errors():
+        field, *rest = detail["loc"] or ("",)
+        location = ".".join([_VALUE_OBJECTS.get(str(field), str(field)), *map(str, rest)])
+        messages.append(f"{location}: {detail['msg']}")
+    return ", ".join(messages)
@@ -1,17 +1,22 @@
+from typing import Optional
+
 from ...domain.entities import Agent
 from ...domain.value_objects import AgentId
 from ...domain.repositories import IAgentRepository
 from ...domain.exceptions import AgentNotFoundException
+from ...observability import NoopTracer, Tracer
 
 class GetAgentUseCase:
-    def __init__(self, agent_repository: IAgentRepository) -> None:
+    def __init__(self, agent_repository: IAgentRepository, tracer: Optional[Tracer] = None) -> None:
         self._agent_repository = agent_repository
+        self._tracer = tracer or NoopTracer()
 
     async def execute(self, project_name: str, agent_id: str) -> Agent:
-        id_vo = AgentId(value=agent_id)
-        agent = await self._agent_repository.find_by_id(project_name, id_vo)
+        with self._tracer.start_span("GetAgentUseCase.execute", {"foundry.project": project_name}):
+            id_vo = AgentId(value=agent_id)
+            agent = await self._agent_repository.find_by_id(project_name, id_vo)
 
-        if not agent:
-            raise AgentNotFoundException(agent_id)
+            if not agent:
+                raise AgentNotFoundException(agent_id)
 
-        return agent
+            return agent
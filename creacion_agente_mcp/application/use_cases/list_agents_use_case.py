@@ -1,9 +1,31 @@
+import contextlib
+from typing import AsyncIterator, Optional
+
 from ...domain.entities import Agent
 from ...domain.repositories import IAgentRepository
+from ...observability import NoopTracer, Tracer
 
 class ListAgentsUseCase:
-    def __init__(self, agent_repository: IAgentRepository) -> None:
+    def __init__(self, agent_repository: IAgentRepository, tracer: Optional[Tracer] = None) -> None:
         self._agent_repository = agent_repository
+        self._tracer = tracer or NoopTracer()
 
     async def execute(self, project_name: str) -> list[Agent]:
-        return await self._agent_repository.find_all(project_name)
+        with self._tracer.start_span(
+            "ListAgentsUseCase.execute", {"foundry.project": project_name}
+        ) as span:
+            agents = await self._agent_repository.find_all(project_name)
+            span.set_attribute("agents.count", len(agents))
+            return agents
+
+    async def stream(self, project_name: str) -> AsyncIterator[list[Agent]]:
+        with self._tracer.start_span(
+            "ListAgentsUseCase.stream", {"foundry.project": project_name}
+        ) as span:
+            count = 0
+            pages = self._agent_repository.iter_pages(project_name)
+            async with contextlib.aclosing(pages):
+                async for agents in pages:
+                    count += len(agents)
+                    yield agents
+            span.set_attribute("agents.count", count)
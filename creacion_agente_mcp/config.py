@@ -1,5 +1,7 @@
-from typing import Optional
+import os
+from typing import Literal, Optional
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -8,6 +10,10 @@ class Settings(BaseSettings):
     )
 
     azure_ai_endpoint: str
+    # More regional endpoints serving the same projects, JSON, e.g.
+    # ["https://res-westeurope.services.ai.azure.com"]; requests go to the fastest
+    # healthy one and fail over to the others
+    azure_ai_endpoints: list[str] = Field(default_factory=list)
     azure_ai_api_version: str = "2025-05-01"
 
     azure_ai_api_key: Optional[str] = None
@@ -15,6 +21,150 @@ class Settings(BaseSettings):
     azure_client_id: Optional[str] = None
     azure_client_secret: Optional[str] = None
     use_managed_identity: bool = False
+    foundry_request_timeout: float = Field(default=30.0, gt=0)
+    foundry_max_connections: int = Field(default=100, ge=1)
+    foundry_max_keepalive_connections: int = Field(default=20, ge=0)
+    # Foundry requests slower than this are logged with their phase breakdown (0 disables)
+    foundry_slow_request_threshold: float = Field(default=1.0, ge=0)
+    # Agents per page when listing; list_agents pages through the whole project
+    foundry_list_page_size: int = Field(default=100, ge=1, le=100)
+    # Accept-Encoding sent to Foundry; unset keeps httpx's default, "identity" disables it
+    foundry_accept_encoding: Optional[str] = None
+    # Endpoint routing (with AZURE_AI_ENDPOINTS): probe period in seconds, consecutive
+    # failures that eject an endpoint and consecutive successes that readmit it
+    foundry_endpoint_probe_interval: float = Field(default=5.0, gt=0)
+    foundry_endpoint_failure_threshold: int = Field(default=3, ge=1)
+    foundry_endpoint_recovery_successes: int = Field(default=2, ge=1)
+
+    # Local fast-fail for missing agents and unknown projects (seconds, 0 disables)
+    agent_not_found_ttl: float = Field(default=30.0, ge=0)
+    project_index_ttl: float = Field(default=300.0, ge=0)
+    project_index_refresh_interval: float = Field(default=30.0, ge=0)
+
+    # Tool deadlines in seconds; TOOL_DEADLINES is JSON, e.g. {"list_agents": 60}
+    tool_default_deadline: float = Field(default=30.0, gt=0)
+    tool_deadlines: dict[str, float] = Field(default_factory=dict)
+
+    # Model catalog synced from the project's Foundry deployments, cached on disk
+    # (default: <tmp>/creacion_agente_mcp) and refreshed with ETags in the background
+    model_catalog_enabled: bool = False
+    model_catalog_ttl: float = Field(default=600.0, ge=0)
+    model_catalog_cache_dir: Optional[str] = None
+
+    # MCP transport
+    mcp_transport: Literal["stdio", "sse", "streamable-http"] = "stdio"
+    mcp_host: str = "0.0.0.0"
+    mcp_port: int = Field(default=8000, ge=1, le=65535)
+
+    # Admission control (HTTP transports). ADMISSION_PRIORITIES is JSON, lower runs first,
+    # e.g. {"list_agents": 0}; ADMISSION_MAX_IN_FLIGHT=0 disables it. The per-session cap
+    # applies per client, identified as for rate limiting
+    admission_max_in_flight: int = Field(default=64, ge=0)
+    admission_max_in_flight_per_session: int = Field(default=8, ge=1)
+    admission_max_queue: int = Field(default=128, ge=0)
+    admission_queue_timeout: float = Field(default=5.0, gt=0)
+    admission_retry_after: float = Field(default=1.0, gt=0)
+    admission_priorities: dict[str, int] = Field(default_factory=dict)
+
+    # Per-client rate limiting (HTTP transports). Rates are tokens per second; each tool
+    # costs 1 token unless RATE_LIMIT_TOOL_COSTS (JSON) says otherwise
+    rate_limit_enabled: bool = False
+    rate_limit_read_rate: float = Field(default=10.0, gt=0)
+    rate_limit_read_burst: float = Field(default=50.0, gt=0)
+    rate_limit_write_rate: float = Field(default=1.0, gt=0)
+    rate_limit_write_burst: float = Field(default=5.0, gt=0)
+    rate_limit_tool_costs: dict[str, float] = Field(default_factory=dict)
+    rate_limit_api_key_header: str = "x-api-key"
+    rate_limit_trust_forwarded_for: bool = False
+    # API keys (JSON list) that identify a client on their own; any other key is ignored
+    # and the client is limited by IP
+    rate_limit_api_keys: list[str] = Field(default_factory=list)
+    rate_limit_max_clients: int = Field(default=10000, ge=1)
+    rate_limit_idle_ttl: float = Field(default=600.0, gt=0)
+
+    # Response compression (HTTP transports), negotiated with Accept-Encoding.
+    # COMPRESSION_ENCODINGS (JSON) is the server's preference order; br and zstd need
+    # pip install .[compression]. COMPRESSION_LEVELS (JSON) overrides the per-encoding level
+    compression_enabled: bool = False
+    compression_encodings: list[Literal["zstd", "br", "gzip"]] = Field(
+        default_factory=lambda: ["zstd", "br", "gzip"]
+    )
+    compression_min_size: int = Field(default=1024, ge=0)
+    compression_levels: dict[str, int] = Field(default_factory=dict)
+
+    # Graceful shutdown on SIGTERM/SIGINT: in-flight tool calls get SHUTDOWN_DRAIN_TIMEOUT
+    # seconds to finish, then are cancelled and given SHUTDOWN_ABORT_TIMEOUT more
+    shutdown_drain_timeout: float = Field(default=20.0, ge=0)
+    shutdown_abort_timeout: float = Field(default=5.0, gt=0)
+
+    # Tool response cache. RESPONSE_CACHE_TTLS is JSON, tool -> seconds ({} disables it);
+    # expired entries are served for RESPONSE_CACHE_STALE_TTL more while refreshing
+    response_cache_ttls: dict[str, float] = Field(
+        default_factory=lambda: {"list_models": 3600.0, "list_projects": 300.0}
+    )
+    response_cache_stale_ttl: float = Field(default=600.0, ge=0)
+    response_cache_max_entries: int = Field(default=256, ge=1)
+    # Agent entities kept per process for reuse and their encoded JSON (0 disables reuse)
+    agent_cache_max_entries: int = Field(default=1000, ge=0)
+
+    # Startup prewarm: token, pooled connections, project list and model catalogs are
+    # loaded concurrently before /readyz reports ready (bounded by PREWARM_TIMEOUT)
+    prewarm_enabled: bool = False
+    prewarm_timeout: float = Field(default=30.0, gt=0)
+    prewarm_connections: int = Field(default=4, ge=0)
+    prewarm_catalog_projects: int = Field(default=20, ge=0)
+
+    # Hot reload on SIGHUP, or when SETTINGS_FILE changes if SETTINGS_WATCH_INTERVAL > 0.
+    # SETTINGS_FILE (dotenv format, e.g. a mounted ConfigMap) is read from the environment;
+    # variables set in the process environment take precedence over it
+    settings_file: str = ".env"
+    settings_watch_interval: float = Field(default=0.0, ge=0)
+
+    # Audit log: one JSONL record per call to AUDIT_TOOLS (JSON list), written in batches
+    # from a bounded queue; when full, records are dropped and counted. With MCP_WORKERS > 1,
+    # AUDIT_FILE must contain {pid} so each worker writes and rotates its own file
+    audit_enabled: bool = False
+    audit_file: str = "audit.jsonl"
+    audit_tools: list[str] = Field(default_factory=lambda: ["create_agent"])
+    audit_max_queue: int = Field(default=10000, ge=1)
+    audit_batch_size: int = Field(default=500, ge=1)
+    audit_max_bytes: int = Field(default=100 * 1024 * 1024, ge=0)
+    audit_backups: int = Field(default=5, ge=0)
+    audit_fsync: bool = False
+
+    # Event loop lag: a tick every LOOP_MONITOR_INTERVAL seconds; when one is late by more
+    # than LOOP_MONITOR_THRESHOLD the stack of the code blocking the loop goes to stderr
+    loop_monitor_enabled: bool = False
+    loop_monitor_interval: float = Field(default=0.05, gt=0)
+    loop_monitor_threshold: float = Field(default=0.1, gt=0)
+
+    # On-demand profiling. GET /debug/profile?seconds=N and /debug/tasks (HTTP transports,
+    # Bearer PROFILING_ADMIN_TOKEN, refused without one) or SIGUSR1/SIGUSR2 (any transport) write folded
+    # stacks and task dumps to PROFILING_DIR; with PROFILING_SLOW_CALL_THRESHOLD > 0, tool
+    # calls slower than it are sampled too
+    profiling_enabled: bool = False
+    profiling_dir: str = "profiles"
+    profiling_admin_token: Optional[str] = None
+    profiling_sample_interval: float = Field(default=0.005, gt=0)
+    profiling_signal_duration: float = Field(default=30.0, gt=0)
+    profiling_max_duration: float = Field(default=300.0, gt=0)
+    profiling_slow_call_threshold: float = Field(default=0.0, ge=0)
+
+    # Health and readiness probes
+    readiness_cache_ttl: float = Field(default=10.0, ge=0)
+    readiness_timeout: float = Field(default=5.0, gt=0)
+
+    # Tracing: none (no-op), file (JSONL spans), memory, otel (OpenTelemetry API)
+    tracing_exporter: Literal["none", "file", "memory", "otel"] = "none"
+    tracing_file: str = "traces.jsonl"
+
+    # Pre-fork workers (HTTP transports only)
+    mcp_workers: int = Field(default=1, ge=1, le=64)
+    mcp_control_host: str = "127.0.0.1"
+    mcp_control_port: int = Field(default=8001, ge=1, le=65535)
+    mcp_worker_heartbeat_interval: float = Field(default=2.0, gt=0)
+    mcp_worker_heartbeat_timeout: float = Field(default=15.0, gt=0)
+    mcp_worker_shutdown_timeout: float = Field(default=30.0, gt=0)
 
     def validate_auth(self) -> None:
         has_api_key = bool(self.azure_ai_api_key)
@@ -30,7 +180,31 @@ class Settings(BaseSettings):
                 "3. USE_MANAGED_IDENTITY=true for Managed Identity (in Azure environments)"
             )
 
+    def validate_workers(self) -> None:
+        if self.mcp_workers > 1 and self.mcp_transport != "streamable-http":
+            raise ValueError(
+                "MCP_WORKERS > 1 requires MCP_TRANSPORT=streamable-http: stdio has a single "
+                "client and SSE sessions are bound to the process that opened them"
+            )
+        if self.mcp_workers > 1 and self.mcp_worker_shutdown_timeout <= (
+            self.shutdown_drain_timeout + self.shutdown_abort_timeout
+        ):
+            raise ValueError(
+                "MCP_WORKER_SHUTDOWN_TIMEOUT must be greater than "
+                "SHUTDOWN_DRAIN_TIMEOUT + SHUTDOWN_ABORT_TIMEOUT"
+            )
+        if self.mcp_workers > 1 and self.audit_enabled and "{pid}" not in self.audit_file:
+            raise ValueError(
+                "AUDIT_FILE must contain {pid} when MCP_WORKERS > 1, e.g. audit-{pid}.jsonl: "
+                "each worker writes and rotates its own file"
+            )
+        if self.mcp_worker_heartbeat_timeout <= self.mcp_worker_heartbeat_interval:
+            raise ValueError(
+                "MCP_WORKER_HEARTBEAT_TIMEOUT must be greater than MCP_WORKER_HEARTBEAT_INTERVAL"
+            )
+
 def get_settings() -> Settings:
-    settings = Settings()  # type: ignore
+    settings = Settings(_env_file=os.environ.get("SETTINGS_FILE", ".env"))  # type: ignore
     settings.validate_auth()
+    settings.validate_workers()
     return settings
@@ -1,3 +1,4 @@
+import itertools
 from datetime import datetime
 from typing import Any, Optional
 
@@ -16,8 +17,12 @@ class AgentProps(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+# Agents are immutable, so every entity is a distinct state with its own version
+_versions = itertools.count(1)
+
 class Agent:
     def __init__(self, props: AgentProps) -> None:
+        self._version = next(_versions)
         self._id = props.id
         self._name = props.name
         self._description = props.description
@@ -32,6 +37,10 @@ class Agent:
     def id(self) -> Optional[AgentId]:
         return self._id
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def name(self) -> AgentName:
         return self._name
@@ -1,13 +1,19 @@
 from .domain_exception import (
     DomainException,
     AgentNotFoundException,
+    ProjectNotFoundException,
+    ModelNotFoundException,
     AgentCreationException,
     ValidationException,
+    DeadlineExceededException,
 )
 
 __all__ = [
     "DomainException",
     "AgentNotFoundException",
+    "ProjectNotFoundException",
+    "ModelNotFoundException",
     "AgentCreationException",
     "ValidationException",
+    "DeadlineExceededException",
 ]
@@ -7,6 +7,27 @@ class AgentNotFoundException(DomainException):
         super().__init__(f"Agent with ID '{agent_id}' not found")
         self.agent_id = agent_id
 
+class ProjectNotFoundException(DomainException):
+    def __init__(self, project_name: str, suggestions: list[str] | None = None) -> None:
+        message = f"Project '{project_name}' not found"
+        if suggestions:
+            message += ". Did you mean: " + ", ".join(f"'{name}'" for name in suggestions) + "?"
+        super().__init__(message)
+        self.project_name = project_name
+        self.suggestions = suggestions or []
+
+class ModelNotFoundException(DomainException):
+    def __init__(
+        self, model_name: str, project_name: str, suggestions: list[str] | None = None
+    ) -> None:
+        message = f"Model '{model_name}' is not deployed in project '{project_name}'"
+        if suggestions:
+            message += ". Did you mean: " + ", ".join(f"'{name}'" for name in suggestions) + "?"
+        super().__init__(message)
+        self.model_name = model_name
+        self.project_name = project_name
+        self.suggestions = suggestions or []
+
 class AgentCreationException(DomainException):
     def __init__(self, message: str) -> None:
         super().__init__(f"Failed to create agent: {message}")
@@ -14,3 +35,11 @@ class AgentCreationException(DomainException):
 class ValidationException(DomainException):
     def __init__(self, message: str) -> None:
         super().__init__(f"Validation error: {message}")
+
+class DeadlineExceededException(DomainException):
+    def __init__(self, budget: float | None = None) -> None:
+        if budget is None:
+            super().__init__("Deadline exceeded before the operation could complete")
+        else:
+            super().__init__(f"Deadline of {budget:g}s exceeded")
+        self.budget = budget
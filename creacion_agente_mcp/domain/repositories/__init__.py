@@ -1,3 +1,4 @@
 from .agent_repository import IAgentRepository
+from .model_catalog_provider import IModelCatalogProvider
 
-__all__ = ["IAgentRepository"]
+__all__ = ["IAgentRepository", "IModelCatalogProvider"]
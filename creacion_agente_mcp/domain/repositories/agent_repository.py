@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from ..entities import Agent
 from ..value_objects import AgentId
@@ -16,6 +17,10 @@ class IAgentRepository(ABC):
     async def find_all(self, project_name: str) -> list[Agent]:
         pass
 
+    async def iter_pages(self, project_name: str) -> AsyncIterator[list[Agent]]:
+        # Repositories backed by a paged source override this to yield as pages arrive
+        yield await self.find_all(project_name)
+
     @abstractmethod
     async def delete(self, project_name: str, agent_id: AgentId) -> None:
         pass
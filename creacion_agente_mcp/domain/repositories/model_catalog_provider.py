@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+from ..value_objects import ModelCatalog
+
+class IModelCatalogProvider(ABC):
+    @abstractmethod
+    async def get_catalog(self, project_name: str) -> ModelCatalog | None:
+        # None when the project's deployments cannot be listed
+        pass
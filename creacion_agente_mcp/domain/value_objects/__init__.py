@@ -2,7 +2,7 @@ from .agent_id import AgentId
 from .agent_name import AgentName
 from .agent_description import AgentDescription
 from .model_configuration import ModelConfiguration
-from .ai_model import AIModelProvider, AIModel
+from .ai_model import AIModelProvider, AIModelInfo, AIModel, ModelCatalog
 
 __all__ = [
     "AgentId",
@@ -10,5 +10,7 @@ __all__ = [
     "AgentDescription",
     "ModelConfiguration",
     "AIModelProvider",
+    "AIModelInfo",
     "AIModel",
+    "ModelCatalog",
 ]
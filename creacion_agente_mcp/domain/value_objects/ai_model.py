@@ -1,5 +1,6 @@
+import bisect
 from enum import Enum
-from typing import NamedTuple
+from typing import Iterable, NamedTuple, Optional
 
 class AIModelProvider(str, Enum):
     AZURE_OPENAI = "azure_openai"
@@ -18,6 +19,83 @@ class AIModelInfo(NamedTuple):
     supports_tools: bool
     supports_vision: bool
 
+class ModelCatalog:
+    SORT_KEYS = ("catalog", "name", "maxTokens")
+
+    def __init__(self, models: Iterable[AIModelInfo]) -> None:
+        self._models: dict[str, AIModelInfo] = {info.model: info for info in models}
+        names = tuple(self._models)
+        self._all = frozenset(names)
+
+        # Precomputed indexes; a query is one set intersection plus an ordered walk
+        self._by_provider: dict[AIModelProvider, frozenset[str]] = {
+            provider: frozenset(n for n in names if self._models[n].provider == provider)
+            for provider in AIModelProvider
+        }
+        self._by_capability = {
+            ("tools", True): frozenset(n for n in names if self._models[n].supports_tools),
+            ("tools", False): frozenset(n for n in names if not self._models[n].supports_tools),
+            ("vision", True): frozenset(n for n in names if self._models[n].supports_vision),
+            ("vision", False): frozenset(n for n in names if not self._models[n].supports_vision),
+        }
+        by_tokens = sorted(names, key=lambda n: (self._models[n].max_tokens, n))
+        self._token_bounds = [self._models[n].max_tokens for n in by_tokens]
+        self._by_tokens = tuple(by_tokens)
+        self._orders = {
+            "catalog": names,
+            "name": tuple(sorted(names)),
+            "maxTokens": self._by_tokens,
+        }
+        self._queries: dict[tuple[object, ...], tuple[AIModelInfo, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, model_name: object) -> bool:
+        return model_name in self._models
+
+    def get(self, model_name: str) -> AIModelInfo | None:
+        return self._models.get(model_name)
+
+    def as_dict(self) -> dict[str, AIModelInfo]:
+        return dict(self._models)
+
+    def query(
+        self,
+        provider: Optional[AIModelProvider] = None,
+        supports_tools: Optional[bool] = None,
+        supports_vision: Optional[bool] = None,
+        min_max_tokens: Optional[int] = None,
+        sort: str = "catalog",
+        descending: bool = False,
+    ) -> tuple[AIModelInfo, ...]:
+        if sort not in self._orders:
+            raise ValueError(f"Unknown sort key: {sort}. Use one of {', '.join(self.SORT_KEYS)}")
+        key = (provider, supports_tools, supports_vision, min_max_tokens, sort, descending)
+        cached = self._queries.get(key)
+        if cached is not None:
+            return cached
+
+        selected = self._all
+        if provider is not None:
+            selected = selected & self._by_provider[provider]
+        if supports_tools is not None:
+            selected = selected & self._by_capability[("tools", supports_tools)]
+        if supports_vision is not None:
+            selected = selected & self._by_capability[("vision", supports_vision)]
+        if min_max_tokens is not None:
+            start = bisect.bisect_left(self._token_bounds, min_max_tokens)
+            selected = selected & frozenset(self._by_tokens[start:])
+
+        order = self._orders[sort]
+        if descending:
+            order = order[::-1]
+        result = tuple(self._models[n] for n in order if n in selected)
+        # Frozen results are shared between callers; min_max_tokens is open-ended, so cap the memo
+        if len(self._queries) < 512:
+            self._queries[key] = result
+        return result
+
 class AIModel:
     # OpenAI Models
     GPT_4 = "gpt-4"
@@ -91,6 +169,24 @@ class AIModel:
             supports_tools=True,
             supports_vision=True,
         ),
+        GPT_4O_MINI: AIModelInfo(
+            provider=AIModelProvider.AZURE_OPENAI,
+            model=GPT_4O_MINI,
+            display_name="GPT-4o mini",
+            description="Versión pequeña y económica de GPT-4o",
+            max_tokens=128000,
+            supports_tools=True,
+            supports_vision=True,
+        ),
+        GPT_4_32K: AIModelInfo(
+            provider=AIModelProvider.AZURE_OPENAI,
+            model=GPT_4_32K,
+            display_name="GPT-4 32K",
+            description="GPT-4 con contexto extendido",
+            max_tokens=32768,
+            supports_tools=True,
+            supports_vision=False,
+        ),
         GPT_35_TURBO: AIModelInfo(
             provider=AIModelProvider.AZURE_OPENAI,
             model=GPT_35_TURBO,
@@ -100,6 +196,15 @@ class AIModel:
             supports_tools=True,
             supports_vision=False,
         ),
+        GPT_35_TURBO_16K: AIModelInfo(
+            provider=AIModelProvider.AZURE_OPENAI,
+            model=GPT_35_TURBO_16K,
+            display_name="GPT-3.5 Turbo 16K",
+            description="GPT-3.5 Turbo con contexto extendido",
+            max_tokens=16384,
+            supports_tools=True,
+            supports_vision=False,
+        ),
         # Anthropic Models
         CLAUDE_35_SONNET: AIModelInfo(
             provider=AIModelProvider.ANTHROPIC,
@@ -128,6 +233,15 @@ class AIModel:
             supports_tools=True,
             supports_vision=True,
         ),
+        CLAUDE_3_HAIKU: AIModelInfo(
+            provider=AIModelProvider.ANTHROPIC,
+            model=CLAUDE_3_HAIKU,
+            display_name="Claude 3 Haiku",
+            description="Modelo más rápido y económico de Anthropic",
+            max_tokens=200000,
+            supports_tools=True,
+            supports_vision=True,
+        ),
         # Meta Models
         LLAMA_31_405B: AIModelInfo(
             provider=AIModelProvider.META,
@@ -147,6 +261,60 @@ class AIModel:
             supports_tools=True,
             supports_vision=False,
         ),
+        LLAMA_31_8B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_31_8B,
+            display_name="Llama 3.1 8B",
+            description="Modelo compacto de Meta con contexto largo",
+            max_tokens=128000,
+            supports_tools=True,
+            supports_vision=False,
+        ),
+        LLAMA_3_70B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_3_70B,
+            display_name="Llama 3 70B",
+            description="Modelo grande de la generación Llama 3",
+            max_tokens=8192,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        LLAMA_3_8B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_3_8B,
+            display_name="Llama 3 8B",
+            description="Modelo compacto de la generación Llama 3",
+            max_tokens=8192,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        LLAMA_2_70B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_2_70B,
+            display_name="Llama 2 70B",
+            description="Modelo grande de la generación Llama 2",
+            max_tokens=4096,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        LLAMA_2_13B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_2_13B,
+            display_name="Llama 2 13B",
+            description="Modelo mediano de la generación Llama 2",
+            max_tokens=4096,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        LLAMA_2_7B: AIModelInfo(
+            provider=AIModelProvider.META,
+            model=LLAMA_2_7B,
+            display_name="Llama 2 7B",
+            description="Modelo pequeño de la generación Llama 2",
+            max_tokens=4096,
+            supports_tools=False,
+            supports_vision=False,
+        ),
         # Mistral Models
         MISTRAL_LARGE: AIModelInfo(
             provider=AIModelProvider.MISTRAL,
@@ -166,6 +334,24 @@ class AIModel:
             supports_tools=True,
             supports_vision=False,
         ),
+        MISTRAL_8X7B: AIModelInfo(
+            provider=AIModelProvider.MISTRAL,
+            model=MISTRAL_8X7B,
+            display_name="Mixtral 8x7B",
+            description="Modelo mixture-of-experts de Mistral",
+            max_tokens=32000,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        MISTRAL_7B: AIModelInfo(
+            provider=AIModelProvider.MISTRAL,
+            model=MISTRAL_7B,
+            display_name="Mistral 7B",
+            description="Modelo abierto compacto de Mistral",
+            max_tokens=32000,
+            supports_tools=False,
+            supports_vision=False,
+        ),
         # Google Models
         GEMINI_15_PRO: AIModelInfo(
             provider=AIModelProvider.GOOGLE,
@@ -185,6 +371,24 @@ class AIModel:
             supports_tools=True,
             supports_vision=True,
         ),
+        GEMINI_PRO: AIModelInfo(
+            provider=AIModelProvider.GOOGLE,
+            model=GEMINI_PRO,
+            display_name="Gemini Pro",
+            description="Modelo de texto de la primera generación Gemini",
+            max_tokens=32760,
+            supports_tools=True,
+            supports_vision=False,
+        ),
+        GEMINI_PRO_VISION: AIModelInfo(
+            provider=AIModelProvider.GOOGLE,
+            model=GEMINI_PRO_VISION,
+            display_name="Gemini Pro Vision",
+            description="Modelo multimodal de la primera generación Gemini",
+            max_tokens=16384,
+            supports_tools=False,
+            supports_vision=True,
+        ),
         # Cohere Models
         COMMAND_R_PLUS: AIModelInfo(
             provider=AIModelProvider.COHERE,
@@ -195,8 +399,43 @@ class AIModel:
             supports_tools=True,
             supports_vision=False,
         ),
+        COMMAND_R: AIModelInfo(
+            provider=AIModelProvider.COHERE,
+            model=COMMAND_R,
+            display_name="Command R",
+            description="Modelo de Cohere para RAG y herramientas",
+            max_tokens=128000,
+            supports_tools=True,
+            supports_vision=False,
+        ),
+        COMMAND: AIModelInfo(
+            provider=AIModelProvider.COHERE,
+            model=COMMAND,
+            display_name="Command",
+            description="Modelo de texto general de Cohere",
+            max_tokens=4096,
+            supports_tools=False,
+            supports_vision=False,
+        ),
+        COMMAND_LIGHT: AIModelInfo(
+            provider=AIModelProvider.COHERE,
+            model=COMMAND_LIGHT,
+            display_name="Command Light",
+            description="Versión ligera y rápida de Command",
+            max_tokens=4096,
+            supports_tools=False,
+            supports_vision=False,
+        ),
     }
 
+    _CATALOG: Optional[ModelCatalog] = None
+
+    @classmethod
+    def catalog(cls) -> ModelCatalog:
+        if cls._CATALOG is None:
+            cls._CATALOG = ModelCatalog(cls._MODELS.values())
+        return cls._CATALOG
+
     @classmethod
     def get_model_info(cls, model_name: str) -> AIModelInfo | None:
         return cls._MODELS.get(model_name)
@@ -207,7 +446,7 @@ class AIModel:
 
     @classmethod
     def get_models_by_provider(cls, provider: AIModelProvider) -> dict[str, AIModelInfo]:
-        return {k: v for k, v in cls._MODELS.items() if v.provider == provider}
+        return {info.model: info for info in cls.catalog().query(provider=provider)}
 
     @classmethod
     def detect_provider(cls, model_name: str) -> AIModelProvider | None:
@@ -5,11 +5,13 @@ from .azure_foundry_client import (
     AzureAgentResponse,
 )
 from .azure_agent_repository import AzureAgentRepository
+from .foundry_model_catalog import FoundryModelCatalogProvider
 
 __all__ = [
     "AzureFoundryClient",
     "AzureFoundryConfig",
     "AzureAgentRepository",
+    "FoundryModelCatalogProvider",
     "AzureAgentRequest",
     "AzureAgentResponse",
 ]
@@ -1,5 +1,9 @@
+import contextlib
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, Optional
+
+from pydantic import ValidationError
 
 from ...domain.entities import Agent, AgentProps
 from ...domain.value_objects import (
@@ -9,34 +13,54 @@ from ...domain.value_objects import (
     ModelConfiguration,
 )
 from ...domain.repositories import IAgentRepository
-from .azure_foundry_client import AzureFoundryClient, AzureAgentRequest
+from ...observability import NoopTracer, Tracer
+from .azure_foundry_client import AzureFoundryClient
 
 class AzureAgentRepository(IAgentRepository):
-    def __init__(self, azure_client: AzureFoundryClient) -> None:
+    def __init__(
+        self,
+        azure_client: AzureFoundryClient,
+        tracer: Optional[Tracer] = None,
+        max_cached_agents: int = 1000,
+    ) -> None:
         self._azure_client = azure_client
+        self._tracer = tracer or NoopTracer()
+        self._max_cached_agents = max_cached_agents
+        # Identity map: an unchanged response maps to the same entity, which keeps
+        # its version and therefore its cached encoding
+        self._agents: OrderedDict[str, tuple[Any, Agent]] = OrderedDict()
 
     async def create(self, project_name: str, agent: Agent) -> Agent:
+        with self._tracer.start_span(
+            "AzureAgentRepository.create", {"foundry.project": project_name}
+        ):
+            return await self._create(project_name, agent)
+
+    async def _create(self, project_name: str, agent: Agent) -> Agent:
         # Build tools array
         tools = None
         if agent.tools:
             tools = [{"type": "function", "function": {"name": tool}} for tool in agent.tools]
 
-        # Build request
-        request = AzureAgentRequest(
-            model=agent.model_configuration.model_name,
-            name=agent.name.value,
-            instructions=agent.instructions,
-            tools=tools,
-            metadata={
-                **agent.metadata,
-                "description": agent.description.value,
-                "temperature": agent.model_configuration.temperature,
-                "maxTokens": agent.model_configuration.max_tokens,
-                "topP": agent.model_configuration.top_p,
-                "frequencyPenalty": agent.model_configuration.frequency_penalty,
-                "presencePenalty": agent.model_configuration.presence_penalty,
-            },
-        )
+        # Build the request body directly: the agent is already validated, and this
+        # is exactly what AzureAgentRequest.model_dump(exclude_none=True) would produce
+        request: dict[str, Any] = {
+            "model": agent.model_configuration.model_name,
+            "name": agent.name.value,
+        }
+        if agent.instructions is not None:
+            request["instructions"] = agent.instructions
+        if tools is not None:
+            request["tools"] = tools
+        request["metadata"] = {
+            **agent.metadata,
+            "description": agent.description.value,
+            "temperature": agent.model_configuration.temperature,
+            "maxTokens": agent.model_configuration.max_tokens,
+            "topP": agent.model_configuration.top_p,
+            "frequencyPenalty": agent.model_configuration.frequency_penalty,
+            "presencePenalty": agent.model_configuration.presence_penalty,
+        }
 
         # Create agent
         response = await self._azure_client.create_agent(project_name, request)
@@ -45,31 +69,108 @@ class AzureAgentRepository(IAgentRepository):
         return self._map_response_to_agent(response)
 
     async def find_by_id(self, project_name: str, agent_id: AgentId) -> Agent | None:
-        response = await self._azure_client.get_agent(project_name, agent_id.value)
+        with self._tracer.start_span(
+            "AzureAgentRepository.find_by_id", {"foundry.project": project_name}
+        ) as span:
+            response = await self._azure_client.get_agent(project_name, agent_id.value)
+            span.set_attribute("agent.found", response is not None)
 
-        if not response:
-            return None
+            if not response:
+                return None
 
-        return self._map_response_to_agent(response)
+            return self._map_response_to_agent(response)
 
     async def find_all(self, project_name: str) -> list[Agent]:
-        responses = await self._azure_client.list_agents(project_name)
-        return [self._map_response_to_agent(response) for response in responses]
+        with self._tracer.start_span(
+            "AzureAgentRepository.find_all", {"foundry.project": project_name}
+        ) as span:
+            responses = await self._azure_client.list_agents(project_name)
+            span.set_attribute("agents.count", len(responses))
+            return [self._map_response_to_agent(response) for response in responses]
+
+    async def iter_pages(self, project_name: str) -> AsyncIterator[list[Agent]]:
+        with self._tracer.start_span(
+            "AzureAgentRepository.iter_pages", {"foundry.project": project_name}
+        ) as span:
+            count = 0
+            pages = self._azure_client.iter_agent_pages(project_name)
+            async with contextlib.aclosing(pages):
+                async for responses in pages:
+                    count += len(responses)
+                    yield [self._map_response_to_agent(response) for response in responses]
+            span.set_attribute("agents.count", count)
 
     async def delete(self, project_name: str, agent_id: AgentId) -> None:
-        await self._azure_client.delete_agent(project_name, agent_id.value)
+        with self._tracer.start_span(
+            "AzureAgentRepository.delete", {"foundry.project": project_name}
+        ):
+            await self._azure_client.delete_agent(project_name, agent_id.value)
+            self._agents.pop(agent_id.value, None)
 
     def _map_response_to_agent(self, response: Any) -> Agent:
+        cached = self._agents.get(response.id)
+        if cached is not None and cached[0] == response:
+            self._agents.move_to_end(response.id)
+            return cached[1]
+
+        try:
+            agent = self._map_single_pass(response)
+        except ValidationError:
+            # Rebuild step by step so the error names the failing value object
+            agent = self._map_validated(response)
+
+        if self._max_cached_agents > 0:
+            self._agents[response.id] = (response, agent)
+            self._agents.move_to_end(response.id)
+            while len(self._agents) > self._max_cached_agents:
+                self._agents.popitem(last=False)
+        return agent
+
+    def _extract_tools(self, response: Any) -> list[str]:
+        if not response.tools:
+            return []
+        return [
+            tool.get("function", {}).get("name", "unknown")
+            for tool in response.tools
+            if isinstance(tool, dict)
+        ]
+
+    def _map_single_pass(self, response: Any) -> Agent:
+        metadata = response.metadata or {}
+        timestamp = (
+            datetime.fromtimestamp(response.created_at) if response.created_at else datetime.now()
+        )
+        agent_props = AgentProps.model_validate(
+            {
+                "id": {"value": response.id},
+                "name": {"value": response.name},
+                "description": {
+                    "value": metadata.get(
+                        "description", response.instructions or "Azure AI Foundry Agent"
+                    )
+                },
+                "model_configuration": {
+                    "model_name": response.model,
+                    "temperature": metadata.get("temperature", 0.7),
+                    "max_tokens": metadata.get("maxTokens"),
+                    "top_p": metadata.get("topP", 1.0),
+                    "frequency_penalty": metadata.get("frequencyPenalty", 0.0),
+                    "presence_penalty": metadata.get("presencePenalty", 0.0),
+                },
+                "instructions": response.instructions,
+                "tools": self._extract_tools(response),
+                "metadata": response.metadata,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+        return Agent(agent_props)
+
+    def _map_validated(self, response: Any) -> Agent:
         metadata = response.metadata or {}
 
         # Extract tools
-        tools = []
-        if response.tools:
-            tools = [
-                tool.get("function", {}).get("name", "unknown")
-                for tool in response.tools
-                if isinstance(tool, dict)
-            ]
+        tools = self._extract_tools(response)
 
         # Build model configuration
         model_config = ModelConfiguration(
@@ -1,12 +1,50 @@
+import asyncio
+import contextlib
+import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional, TypeVar
+from urllib.parse import quote, urlsplit
 
 import httpx
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
 from pydantic import BaseModel, Field, field_validator
 
+from ...application.deadline import timeout_within_deadline
+from ...observability import NoopTracer, ServerMetrics, Tracer
+from .endpoint_router import EndpointRouter, endpoint_label
+from .project_index import ProjectIndex
+from .request_timing import RequestTiming
+
+if TYPE_CHECKING:
+    from azure.identity import ClientSecretCredential, DefaultAzureCredential
+
+_LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+# Carries a request's phase timings from _send to _decode
+_TIMING = "creacion_agente_mcp.timing"
+
+# Retried on another endpoint after any failure; other methods only when the request
+# cannot have reached the server (connect errors), so create_agent never runs twice
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "DELETE"})
+
+T = TypeVar("T")
+
+def _validate_endpoint(v: str) -> str:
+    if not v or not v.strip():
+        raise ValueError("Endpoint cannot be empty")
+    v = v.strip()
+    # Plain http is only accepted for a local stand-in (load tests, offline runs)
+    url = urlsplit(v)
+    if url.scheme != "https" and not (url.scheme == "http" and url.hostname in _LOOPBACK_HOSTS):
+        raise ValueError("Endpoint must start with https:// (http:// only for localhost)")
+    return v.rstrip("/")
+
 class AzureFoundryConfig(BaseModel):
     endpoint: str = Field(..., min_length=1)
+    # Further regional endpoints serving the same projects; with any, each request goes
+    # to the fastest healthy endpoint and fails over to the next one
+    endpoints: list[str] = Field(default_factory=list)
     api_version: str = Field(default="2025-05-01")
 
     # Auth Option 1: API Key
@@ -20,15 +58,48 @@ class AzureFoundryConfig(BaseModel):
     # Auth Option 3: Managed Identity
     use_managed_identity: bool = False
 
+    # Upper bound per request; tool deadlines can only shorten it
+    request_timeout: float = Field(default=30.0, gt=0)
+
+    # Shared connection pool
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+
+    # Requests slower than this are logged with their per-phase breakdown (0 disables)
+    slow_request_threshold: float = Field(default=1.0, ge=0)
+
+    # Sent as Accept-Encoding; None keeps httpx's default (gzip and deflate, plus br and
+    # zstd when brotli and zstandard are installed), "identity" disables compression
+    accept_encoding: Optional[str] = None
+
+    # Agents per list_agents request; the service caps it at 100
+    list_page_size: int = Field(default=100, ge=1, le=100)
+
+    # Local fast-fail: 404s from get_agent are remembered for not_found_ttl seconds and
+    # project names are checked against a list_projects index (0 disables either)
+    not_found_ttl: float = Field(default=30.0, ge=0)
+    not_found_max_entries: int = Field(default=4096, ge=1)
+    project_index_ttl: float = Field(default=300.0, ge=0)
+    project_index_refresh_interval: float = Field(default=30.0, ge=0)
+
+    # Endpoint routing: probe period, consecutive failures that eject an endpoint and
+    # consecutive successes that readmit it
+    endpoint_probe_interval: float = Field(default=5.0, gt=0)
+    endpoint_failure_threshold: int = Field(default=3, ge=1)
+    endpoint_recovery_successes: int = Field(default=2, ge=1)
+
     @field_validator("endpoint")
     @classmethod
     def validate_endpoint(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Endpoint cannot be empty")
-        v = v.strip()
-        if not v.startswith("https://"):
-            raise ValueError("Endpoint must start with https://")
-        return v.rstrip("/")
+        return _validate_endpoint(v)
+
+    @field_validator("endpoints")
+    @classmethod
+    def validate_endpoints(cls, v: list[str]) -> list[str]:
+        return [_validate_endpoint(endpoint) for endpoint in v]
+
+    def all_endpoints(self) -> list[str]:
+        return list(dict.fromkeys([self.endpoint, *self.endpoints]))
 
     def validate_auth(self) -> None:
         has_api_key = bool(self.api_key)
@@ -64,88 +135,521 @@ class AzureProjectResponse(BaseModel):
     location: Optional[str] = None
     resource_group: Optional[str] = None
 
+def _parse_agent_page(
+    data: dict[str, Any],
+) -> tuple[list[AzureAgentResponse], bool, Optional[str]]:
+    return (
+        [AzureAgentResponse(**agent) for agent in data.get("data", [])],
+        bool(data.get("has_more")),
+        data.get("last_id"),
+    )
+
+# Changing these replaces the credential or the connection pool on reconfigure
+_CREDENTIAL_FIELDS = ("use_managed_identity", "tenant_id", "client_id", "client_secret")
+_POOL_FIELDS = (
+    "request_timeout",
+    "max_connections",
+    "max_keepalive_connections",
+    "accept_encoding",
+)
+
+def _changed(old: AzureFoundryConfig, new: AzureFoundryConfig, fields: tuple[str, ...]) -> bool:
+    return any(getattr(old, field) != getattr(new, field) for field in fields)
+
 class AzureFoundryClient:
-    def __init__(self, config: AzureFoundryConfig) -> None:
+    def __init__(
+        self,
+        config: AzureFoundryConfig,
+        metrics: Optional[ServerMetrics] = None,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
         config.validate_auth()
         self._config = config
-        self._credential: Optional[DefaultAzureCredential | ClientSecretCredential] = None
+        self._metrics = metrics or ServerMetrics()
+        self._tracer = tracer or NoopTracer()
+        self._credential = self._create_credential(config)
+        # Created on first use so pre-fork workers each build their own pool
+        self._http: Optional[httpx.AsyncClient] = None
+        # Pools and credentials replaced by reconfigure, closed once their requests end
+        self._retiring: set[asyncio.Task[None]] = set()
+        self._missing_agents: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._project_index: Optional[ProjectIndex] = None
+        if config.project_index_ttl > 0:
+            self._project_index = ProjectIndex(
+                self._list_project_names,
+                ttl=config.project_index_ttl,
+                refresh_interval=config.project_index_refresh_interval,
+                metrics=self._metrics,
+            )
+        self._router = self._create_router(config)
+        self._endpoint_labels = frozenset(map(endpoint_label, config.all_endpoints()))
 
-        # Initialize credential based on auth method
+    def _create_router(self, config: AzureFoundryConfig) -> Optional[EndpointRouter]:
+        # A single endpoint is used directly, without probes
+        endpoints = config.all_endpoints()
+        if len(endpoints) < 2:
+            return None
+        return EndpointRouter(
+            endpoints,
+            self._probe_endpoint,
+            probe_interval=config.endpoint_probe_interval,
+            failure_threshold=config.endpoint_failure_threshold,
+            recovery_successes=config.endpoint_recovery_successes,
+            metrics=self._metrics,
+        )
+
+    @staticmethod
+    def _create_credential(
+        config: AzureFoundryConfig,
+    ) -> Optional["DefaultAzureCredential | ClientSecretCredential"]:
+        # Initialize credential based on auth method; azure.identity is only
+        # imported when it is used, API-key sessions never load it
         if config.use_managed_identity:
-            self._credential = DefaultAzureCredential()
+            from azure.identity import DefaultAzureCredential
+
+            return DefaultAzureCredential()
         elif config.tenant_id and config.client_id and config.client_secret:
-            self._credential = ClientSecretCredential(
+            from azure.identity import ClientSecretCredential
+
+            return ClientSecretCredential(
                 tenant_id=config.tenant_id,
                 client_id=config.client_id,
                 client_secret=config.client_secret,
             )
+        return None
+
+    def reconfigure(self, config: AzureFoundryConfig) -> None:
+        # Applied between requests: calls already sent finish on the old pool and
+        # credential, which are closed after request_timeout; new calls use the new ones
+        config.validate_auth()
+        old = self._config
+        credential = None
+        if _changed(old, config, _CREDENTIAL_FIELDS):
+            credential, self._credential = self._credential, self._create_credential(config)
+        http = None
+        if _changed(old, config, _POOL_FIELDS):
+            http, self._http = self._http, None
+        if http is not None or credential is not None:
+            task = asyncio.get_running_loop().create_task(
+                self._retire(http, credential, old.request_timeout)
+            )
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+        if config.all_endpoints() != old.all_endpoints():
+            router, self._router = self._router, self._create_router(config)
+            self._endpoint_labels = frozenset(map(endpoint_label, config.all_endpoints()))
+            if router is not None:
+                task = asyncio.get_running_loop().create_task(router.stop())
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+        elif self._router is not None:
+            self._router.reconfigure(
+                config.endpoint_probe_interval,
+                config.endpoint_failure_threshold,
+                config.endpoint_recovery_successes,
+            )
+        if config.endpoint != old.endpoint:
+            self._missing_agents.clear()
+        if config.project_index_ttl <= 0:
+            self._project_index = None
+        elif self._project_index is None or config.endpoint != old.endpoint:
+            self._project_index = ProjectIndex(
+                self._list_project_names,
+                ttl=config.project_index_ttl,
+                refresh_interval=config.project_index_refresh_interval,
+                metrics=self._metrics,
+            )
+        else:
+            self._project_index.reconfigure(
+                config.project_index_ttl, config.project_index_refresh_interval
+            )
+        self._config = config
+
+    async def _retire(
+        self,
+        http: Optional[httpx.AsyncClient],
+        credential: Optional["DefaultAzureCredential | ClientSecretCredential"],
+        grace: float,
+    ) -> None:
+        try:
+            await asyncio.sleep(grace)
+        finally:
+            if http is not None:
+                await http.aclose()
+            if credential is not None:
+                credential.close()
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self._config.request_timeout,
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections,
+                    max_keepalive_connections=self._config.max_keepalive_connections,
+                ),
+                headers=(
+                    {"Accept-Encoding": self._config.accept_encoding}
+                    if self._config.accept_encoding
+                    else None
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._router is not None:
+            await self._router.stop()
+        for task in list(self._retiring):
+            task.cancel()
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+        if self._credential is not None:
+            self._credential.close()
 
     async def _get_auth_headers(self) -> dict[str, str]:
         if self._config.api_key:
             return {"api-key": self._config.api_key}
         elif self._credential:
-            token = self._credential.get_token("https://ai.azure.com/.default")
+            with self._tracer.start_span("AzureFoundryClient.get_token"):
+                token = self._credential.get_token("https://ai.azure.com/.default")
             return {"Authorization": f"Bearer {token.token}"}
         else:
             raise ValueError("No authentication method configured")
 
     def _build_project_url(self, project_name: str, path: str) -> str:
-        return (
-            f"{self._config.endpoint}/api/projects/{project_name}{path}"
-            f"?api-version={self._config.api_version}"
-        )
+        # A path: _send prefixes the endpoint each attempt is routed to
+        return f"/api/projects/{project_name}{path}?api-version={self._config.api_version}"
+
+    async def _send(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        project_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[dict[str, str]] = None,
+        decoded: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        # url is a path routed to the configured endpoints, or an absolute URL (e.g. a
+        # nextLink) sent as is. decoded: a successful response will be parsed with
+        # _decode, which completes its timing; otherwise the timing is recorded here
+        if project_name is not None and self._project_index is not None:
+            await self._project_index.validate(project_name)
+        attributes = {"foundry.operation": operation, "http.method": method}
+        if project_name:
+            attributes["foundry.project"] = project_name
+
+        with self._tracer.start_span(f"AzureFoundryClient.{operation}", attributes) as span:
+            # Built outside the timing: creating the first client is not a pool wait
+            http = self._http_client()
+            router = self._router
+            if router is None or not url.startswith("/"):
+                if url.startswith("/"):
+                    url = self._config.endpoint + url
+                return await self._attempt(
+                    http, span, operation, method, url, timeout, headers, decoded, kwargs
+                )
+
+            router.start()
+            endpoints = router.candidates()
+            for attempt, endpoint in enumerate(endpoints, 1):
+                label = endpoint_label(endpoint)
+                span.set_attributes({"foundry.endpoint": label, "foundry.attempts": attempt})
+                last = attempt == len(endpoints)
+                try:
+                    response = await self._attempt(
+                        http,
+                        span,
+                        operation,
+                        method,
+                        endpoint + url,
+                        timeout,
+                        headers,
+                        decoded,
+                        kwargs,
+                    )
+                except httpx.PoolTimeout:
+                    # Our own pool is full, which says nothing about the endpoint
+                    raise
+                except httpx.TransportError as e:
+                    router.record(endpoint, ok=False)
+                    self._metrics.endpoint_requests.inc(endpoint=label, outcome="failure")
+                    unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    if last or not (unsent or method in _IDEMPOTENT_METHODS):
+                        raise
+                    self._metrics.upstream_failovers.inc(
+                        operation=operation, reason=type(e).__name__
+                    )
+                    continue
+                ok = response.status_code < 500
+                router.record(endpoint, ok=ok)
+                self._metrics.endpoint_requests.inc(
+                    endpoint=label, outcome="success" if ok else "failure"
+                )
+                if ok or last or method not in _IDEMPOTENT_METHODS:
+                    return response
+                self._metrics.upstream_failovers.inc(
+                    operation=operation, reason=str(response.status_code)
+                )
+            raise AssertionError("unreachable")
+
+    async def _attempt(
+        self,
+        http: httpx.AsyncClient,
+        span: Any,
+        operation: str,
+        method: str,
+        url: str,
+        timeout: Optional[float],
+        headers: Optional[dict[str, str]],
+        decoded: bool,
+        kwargs: dict[str, Any],
+    ) -> httpx.Response:
+        # One request to one endpoint; failovers re-enter with what is left of the deadline
+        timeout = timeout_within_deadline(timeout or self._config.request_timeout)
+        status = "error"
+        timing = RequestTiming()
+        response: Optional[httpx.Response] = None
+        try:
+            headers = {**await self._get_auth_headers(), **(headers or {})}
+            timing.enter("pool")
+            response = await http.request(
+                method,
+                url,
+                timeout=timeout,
+                headers=headers,
+                extensions={"trace": timing.trace},
+                **kwargs,
+            )
+            status = str(response.status_code)
+            wire_bytes = response.num_bytes_downloaded
+            encoding = response.headers.get("content-encoding", "identity")
+            span.set_attributes(
+                {
+                    "http.status_code": response.status_code,
+                    "payload.request_bytes": len(response.request.content),
+                    "payload.response_bytes": len(response.content),
+                    "payload.response_wire_bytes": wire_bytes,
+                }
+            )
+            labels = {"operation": operation, "encoding": encoding}
+            self._metrics.upstream_response_bytes.inc(wire_bytes, stage="wire", **labels)
+            self._metrics.upstream_response_bytes.inc(
+                len(response.content), stage="decoded", **labels
+            )
+            if response.is_error:
+                span.set_status("error", f"HTTP {response.status_code}")
+            return response
+        finally:
+            timing.finish()
+            span.set_attributes(
+                {f"foundry.{phase}_ms": sec * 1000 for phase, sec in timing.phases.items()}
+            )
+            self._metrics.upstream_duration.observe(
+                time.perf_counter() - timing.started, operation=operation, status=status
+            )
+            endpoint = self._endpoint_metric_label(url)
+            for phase, seconds in timing.phases.items():
+                self._metrics.upstream_phase_duration.observe(
+                    seconds, operation=operation, endpoint=endpoint, phase=phase
+                )
+            if decoded and response is not None and response.is_success:
+                response.extensions[_TIMING] = timing
+            else:
+                self._log_if_slow(operation, status, timing)
+
+    def _decode(self, operation: str, response: httpx.Response, parse: Callable[[Any], T]) -> T:
+        started = time.perf_counter()
+        try:
+            return parse(response.json())
+        finally:
+            seconds = time.perf_counter() - started
+            self._metrics.upstream_phase_duration.observe(
+                seconds,
+                operation=operation,
+                endpoint=self._endpoint_metric_label(str(response.request.url)),
+                phase="decode",
+            )
+            timing = response.extensions.pop(_TIMING, None)
+            if timing is not None:
+                timing.add("decode", seconds)
+                self._log_if_slow(operation, str(response.status_code), timing)
+
+    def _endpoint_metric_label(self, url: str) -> str:
+        # Bounded by the configured endpoints: an absolute URL to any other host is "other"
+        label = endpoint_label(url)
+        return label if label in self._endpoint_labels else "other"
+
+    def _log_if_slow(self, operation: str, status: str, timing: RequestTiming) -> None:
+        threshold = self._config.slow_request_threshold
+        total = sum(timing.phases.values())
+        if threshold > 0 and total >= threshold:
+            print(
+                f"Slow Foundry request {operation} {total * 1000:.0f}ms ({status}): "
+                f"{timing.describe()}",
+                file=sys.stderr,
+            )
 
     async def create_agent(
-        self, project_name: str, request: AzureAgentRequest
+        self, project_name: str, request: AzureAgentRequest | dict[str, Any]
     ) -> AzureAgentResponse:
         url = self._build_project_url(project_name, "/assistants")
-        headers = await self._get_auth_headers()
-        headers["Content-Type"] = "application/json"
+        response = await self._send(
+            "create_agent",
+            "POST",
+            url,
+            project_name,
+            json=request if isinstance(request, dict) else request.model_dump(exclude_none=True),
+        )
+        response.raise_for_status()
+        agent = self._decode("create_agent", response, lambda data: AzureAgentResponse(**data))
+        self._missing_agents.pop((project_name, agent.id), None)
+        return agent
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url, json=request.model_dump(exclude_none=True), headers=headers, timeout=30.0
-            )
-            response.raise_for_status()
-            return AzureAgentResponse(**response.json())
+    def _is_known_missing(self, key: tuple[str, str]) -> bool:
+        expires_at = self._missing_agents.get(key)
+        if expires_at is None:
+            return False
+        if time.monotonic() < expires_at:
+            self._metrics.cache_requests.inc(cache="agent_not_found", result="hit")
+            return True
+        del self._missing_agents[key]
+        return False
+
+    def _remember_missing(self, key: tuple[str, str]) -> None:
+        if self._config.not_found_ttl <= 0:
+            return
+        self._missing_agents[key] = time.monotonic() + self._config.not_found_ttl
+        self._missing_agents.move_to_end(key)
+        while len(self._missing_agents) > self._config.not_found_max_entries:
+            self._missing_agents.popitem(last=False)
+        self._metrics.cache_entries.set(len(self._missing_agents), cache="agent_not_found")
 
     async def get_agent(self, project_name: str, agent_id: str) -> AzureAgentResponse | None:
-        url = self._build_project_url(project_name, f"/assistants/{agent_id}")
-        headers = await self._get_auth_headers()
+        key = (project_name, agent_id)
+        if self._is_known_missing(key):
+            return None
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return AzureAgentResponse(**response.json())
+        url = self._build_project_url(project_name, f"/assistants/{agent_id}")
+        response = await self._send("get_agent", "GET", url, project_name)
+        if response.status_code == 404:
+            self._remember_missing(key)
+            return None
+        response.raise_for_status()
+        return self._decode("get_agent", response, lambda data: AzureAgentResponse(**data))
 
     async def list_agents(self, project_name: str) -> list[AzureAgentResponse]:
-        url = self._build_project_url(project_name, "/assistants")
-        headers = await self._get_auth_headers()
+        agents: list[AzureAgentResponse] = []
+        async with contextlib.aclosing(self.iter_agent_pages(project_name)) as pages:
+            async for page in pages:
+                agents.extend(page)
+        return agents
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
+    async def iter_agent_pages(self, project_name: str) -> AsyncIterator[list[AzureAgentResponse]]:
+        # Follows the list cursor (limit/after/has_more) one page at a time, so only
+        # one page of the response body and its models is alive at once
+        base_url = self._build_project_url(project_name, "/assistants")
+        base_url += f"&limit={self._config.list_page_size}"
+        after: Optional[str] = None
+        while True:
+            url = base_url if after is None else f"{base_url}&after={quote(after, safe='')}"
+            response = await self._send("list_agents", "GET", url, project_name)
             response.raise_for_status()
-            data = response.json()
-            agents = data.get("data", [])
-            return [AzureAgentResponse(**agent) for agent in agents]
+            page, has_more, after = self._decode("list_agents", response, _parse_agent_page)
+            del response
+            yield page
+            if not has_more or not after:
+                return
 
     async def delete_agent(self, project_name: str, agent_id: str) -> None:
         url = self._build_project_url(project_name, f"/assistants/{agent_id}")
-        headers = await self._get_auth_headers()
+        response = await self._send("delete_agent", "DELETE", url, project_name, decoded=False)
+        response.raise_for_status()
+        self._remember_missing((project_name, agent_id))
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url, headers=headers, timeout=30.0)
+    async def list_deployments(
+        self, project_name: str, etag: Optional[str] = None
+    ) -> tuple[Optional[list[dict[str, Any]]], Optional[str]]:
+        # Returns (None, etag) when the deployments are unchanged since etag
+        url: Optional[str] = self._build_project_url(project_name, "/deployments")
+        headers = {"If-None-Match": etag} if etag else {}
+
+        deployments: list[dict[str, Any]] = []
+        new_etag: Optional[str] = None
+        while url:
+            response = await self._send(
+                "list_deployments", "GET", url, project_name, headers=headers
+            )
+            if response.status_code == 304:
+                return None, etag
             response.raise_for_status()
+            data = self._decode("list_deployments", response, lambda data: data)
+            deployments.extend(data.get("value", []))
+            new_etag = new_etag or response.headers.get("ETag")
+            url = data.get("nextLink")
+            headers.pop("If-None-Match", None)
+        return deployments, new_etag
+
+    def _build_projects_url(self) -> str:
+        return f"/api/projects?api-version={self._config.api_version}"
 
     async def list_projects(self) -> list[AzureProjectResponse]:
-        url = f"{self._config.endpoint}/api/projects?api-version={self._config.api_version}"
-        headers = await self._get_auth_headers()
+        response = await self._send("list_projects", "GET", self._build_projects_url())
+        response.raise_for_status()
+        projects = self._decode(
+            "list_projects",
+            response,
+            lambda data: [AzureProjectResponse(**project) for project in data.get("value", [])],
+        )
+        if self._project_index is not None:
+            self._project_index.update(project.name for project in projects)
+        return projects
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            projects = data.get("value", [])
-            return [AzureProjectResponse(**project) for project in projects]
+    async def _list_project_names(self) -> list[str]:
+        return [project.name for project in await self.list_projects()]
+
+    async def prewarm_token(self) -> str:
+        # get_token is synchronous; run it off the loop so the other prewarm steps
+        # proceed meanwhile. The credential caches the token for later calls
+        if self._credential is None:
+            return "api key"
+        await asyncio.to_thread(self._credential.get_token, "https://ai.azure.com/.default")
+        return type(self._credential).__name__
+
+    async def prewarm_connections(self, count: int) -> int:
+        # Concurrent requests each need their own connection, so this leaves up to
+        # `count` resolved, TLS-established connections in the keep-alive pool. With
+        # several endpoints the others get one each, so a failover skips the handshake
+        count = min(count, self._config.max_keepalive_connections)
+        endpoints = self._config.all_endpoints()
+        targets = [endpoints[0]] * max(count - len(endpoints) + 1, 1) + endpoints[1:]
+        http = self._http_client()
+        results = await asyncio.gather(
+            *(http.head(endpoint) for endpoint in targets[:count]), return_exceptions=True
+        )
+        return sum(1 for result in results if isinstance(result, httpx.Response))
+
+    async def _probe_endpoint(self, endpoint: str) -> None:
+        # The readiness request, sent to one endpoint; any answer below 500 is healthy
+        response = await self._http_client().get(
+            endpoint + self._build_projects_url(),
+            headers=await self._get_auth_headers(),
+            timeout=min(self._config.request_timeout, self._config.endpoint_probe_interval),
+        )
+        if response.status_code >= 500:
+            raise ConnectionError(f"{endpoint_label(endpoint)} returned {response.status_code}")
+
+    async def check_auth(self) -> None:
+        await self._get_auth_headers()
+
+    async def check_upstream(self, timeout: float = 5.0) -> None:
+        response = await self._send(
+            "health", "GET", self._build_projects_url(), timeout=timeout, decoded=False
+        )
+        if response.status_code in (401, 403):
+            raise PermissionError(f"Azure AI Foundry rejected credentials ({response.status_code})")
+        if response.status_code >= 500:
+            raise ConnectionError(f"Azure AI Foundry returned {response.status_code}")
@@ -0,0 +1,161 @@
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from ...observability import ServerMetrics
+
+# Another endpoint only takes over when it is this much faster than the preferred one,
+# so two regions with similar latency do not swap places on every probe
+_SWITCH_MARGIN = 0.2
+
+# Caps the error rate so a failing endpoint's score stays finite and comparable
+_MAX_ERROR_RATE = 0.95
+
+def endpoint_label(endpoint: str) -> str:
+    return urlsplit(endpoint).netloc or endpoint
+
+class _Endpoint:
+    __slots__ = ("url", "label", "latency", "error_rate", "failures", "successes", "healthy")
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.label = endpoint_label(url)
+        # EWMA of probe round trips; None until the first probe answers
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.successes = 0
+        self.healthy = True
+
+    def score(self) -> float:
+        # Expected time to a successful answer: each try takes `latency` and fails with
+        # probability error_rate. Unprobed endpoints go last among the healthy ones
+        if self.latency is None:
+            return float("inf")
+        return self.latency / (1 - min(self.error_rate, _MAX_ERROR_RATE))
+
+class EndpointRouter:
+    # Orders the regional endpoints of one Foundry resource for each request. Latency is
+    # an EWMA of background probes, which send the same cheap request everywhere and so
+    # compare regions fairly whatever mix of operations each one served; the error rate
+    # is an EWMA over requests and probes. An endpoint is ejected after
+    # failure_threshold consecutive failures and readmitted after recovery_successes
+    # consecutive successes, which the probes provide while it gets no traffic
+    def __init__(
+        self,
+        endpoints: Iterable[str],
+        probe: Callable[[str], Awaitable[None]],
+        probe_interval: float = 5.0,
+        failure_threshold: int = 3,
+        recovery_successes: int = 2,
+        alpha: float = 0.3,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._endpoints = {url: _Endpoint(url) for url in endpoints}
+        self._probe = probe
+        self._probe_interval = probe_interval
+        self._failure_threshold = failure_threshold
+        self._recovery_successes = recovery_successes
+        self._alpha = alpha
+        self._metrics = metrics or ServerMetrics()
+        self._preferred = next(iter(self._endpoints))
+        self._task: Optional[asyncio.Task[None]] = None
+        for endpoint in self._endpoints.values():
+            self._metrics.endpoint_healthy.set(1, endpoint=endpoint.label)
+
+    @property
+    def endpoints(self) -> list[str]:
+        return list(self._endpoints)
+
+    def reconfigure(
+        self, probe_interval: float, failure_threshold: int, recovery_successes: int
+    ) -> None:
+        self._probe_interval = probe_interval
+        self._failure_threshold = failure_threshold
+        self._recovery_successes = recovery_successes
+
+    def candidates(self) -> list[str]:
+        # Healthy endpoints fastest first, then ejected ones as a last resort, those
+        # with the fewest consecutive failures first
+        healthy = [endpoint for endpoint in self._endpoints.values() if endpoint.healthy]
+        if healthy:
+            best = min(healthy, key=_Endpoint.score)
+            preferred = self._endpoints[self._preferred]
+            if preferred.healthy and not best.score() < preferred.score() * (1 - _SWITCH_MARGIN):
+                best = preferred
+            if best.url != self._preferred:
+                self._preferred = best.url
+                self._metrics.endpoint_switches.inc(endpoint=best.label)
+            healthy.sort(key=lambda endpoint: (endpoint is not best, endpoint.score()))
+        ejected = sorted(
+            (endpoint for endpoint in self._endpoints.values() if not endpoint.healthy),
+            key=lambda endpoint: endpoint.failures,
+        )
+        return [endpoint.url for endpoint in healthy + ejected]
+
+    def record(self, url: str, ok: bool) -> None:
+        endpoint = self._endpoints.get(url)
+        if endpoint is None:
+            # Removed by a reconfigure while the request was in flight
+            return
+        endpoint.error_rate += self._alpha * ((0.0 if ok else 1.0) - endpoint.error_rate)
+        self._metrics.endpoint_error_rate.set(endpoint.error_rate, endpoint=endpoint.label)
+        if ok:
+            endpoint.failures = 0
+            endpoint.successes += 1
+            if not endpoint.healthy and endpoint.successes >= self._recovery_successes:
+                self._set_healthy(endpoint, True)
+        else:
+            endpoint.successes = 0
+            endpoint.failures += 1
+            if endpoint.healthy and endpoint.failures >= self._failure_threshold:
+                self._set_healthy(endpoint, False)
+
+    def _set_healthy(self, endpoint: _Endpoint, healthy: bool) -> None:
+        endpoint.healthy = healthy
+        self._metrics.endpoint_healthy.set(1 if healthy else 0, endpoint=endpoint.label)
+        if healthy:
+            print(f"Foundry endpoint {endpoint.label} readmitted", file=sys.stderr)
+        else:
+            print(
+                f"Foundry endpoint {endpoint.label} ejected after {endpoint.failures} "
+                "consecutive failures",
+                file=sys.stderr,
+            )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self._probe_interval)
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self._probe_one(endpoint) for endpoint in self._endpoints.values()))
+
+    async def _probe_one(self, endpoint: _Endpoint) -> None:
+        started = time.perf_counter()
+        try:
+            await self._probe(endpoint.url)
+        except Exception:
+            self._metrics.endpoint_probes.inc(endpoint=endpoint.label, result="failure")
+            self.record(endpoint.url, ok=False)
+            return
+        latency = time.perf_counter() - started
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += self._alpha * (latency - endpoint.latency)
+        self._metrics.endpoint_latency.set(endpoint.latency, endpoint=endpoint.label)
+        self._metrics.endpoint_probes.inc(endpoint=endpoint.label, result="success")
+        self.record(endpoint.url, ok=True)
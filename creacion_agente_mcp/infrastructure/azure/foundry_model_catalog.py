@@ -0,0 +1,222 @@
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+from ...domain.exceptions import ProjectNotFoundException
+from ...domain.repositories import IModelCatalogProvider
+from ...domain.value_objects import AIModel, AIModelInfo, AIModelProvider, ModelCatalog
+from ...observability import ServerMetrics
+from .azure_foundry_client import AzureFoundryClient
+
+_PUBLISHERS = {
+    "openai": AIModelProvider.AZURE_OPENAI,
+    "azure openai": AIModelProvider.AZURE_OPENAI,
+    "microsoft": AIModelProvider.AZURE_OPENAI,
+    "anthropic": AIModelProvider.ANTHROPIC,
+    "meta": AIModelProvider.META,
+    "mistral ai": AIModelProvider.MISTRAL,
+    "mistralai": AIModelProvider.MISTRAL,
+    "cohere": AIModelProvider.COHERE,
+    "google": AIModelProvider.GOOGLE,
+}
+
+def merge_deployments(deployments: list[dict[str, Any]]) -> ModelCatalog:
+    # Deployment names are what agents reference; static metadata fills in what
+    # the deployment listing does not say (context size, tools, vision)
+    models: list[AIModelInfo] = []
+    for deployment in deployments:
+        name = deployment.get("name")
+        if not name:
+            continue
+        model_name = deployment.get("modelName") or name
+        static = AIModel.get_model_info(name) or AIModel.get_model_info(model_name)
+        if static is not None:
+            models.append(static._replace(model=name))
+            continue
+
+        capabilities = deployment.get("capabilities") or {}
+        publisher = str(deployment.get("modelPublisher") or "").lower()
+        version = deployment.get("modelVersion")
+        models.append(
+            AIModelInfo(
+                provider=_PUBLISHERS.get(publisher, AIModelProvider.AZURE_OPENAI),
+                model=name,
+                display_name=model_name,
+                description=f"Despliegue de {model_name}" + (f" ({version})" if version else ""),
+                max_tokens=0,
+                supports_tools=str(capabilities.get("tool_calling", "")).lower() == "true",
+                supports_vision=str(capabilities.get("vision", "")).lower() == "true",
+            )
+        )
+    return ModelCatalog(models)
+
+class _ProjectCatalog:
+    __slots__ = ("catalog", "etag", "fetched_at")
+
+    def __init__(self, catalog: ModelCatalog, etag: Optional[str], fetched_at: float) -> None:
+        self.catalog = catalog
+        self.etag = etag
+        # Wall-clock time, so entries read back from disk age correctly
+        self.fetched_at = fetched_at
+
+class FoundryModelCatalogProvider(IModelCatalogProvider):
+    def __init__(
+        self,
+        azure_client: AzureFoundryClient,
+        ttl: float = 600.0,
+        cache_dir: Optional[str] = None,
+        error_backoff: float = 60.0,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._azure_client = azure_client
+        self._ttl = ttl
+        self._cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "creacion_agente_mcp")
+        self._error_backoff = error_backoff
+        self._metrics = metrics or ServerMetrics()
+        self._projects: dict[str, _ProjectCatalog] = {}
+        self._failed_at: dict[str, float] = {}
+        self._loading: dict[str, asyncio.Future[Optional[_ProjectCatalog]]] = {}
+        self._refreshing: set[asyncio.Task[Any]] = set()
+
+    def reconfigure(self, ttl: float) -> None:
+        # Applies on the next lookup; a shorter TTL turns cached catalogs stale
+        self._ttl = ttl
+
+    def _record(self, result: str) -> None:
+        self._metrics.cache_requests.inc(cache="model_catalog", result=result)
+
+    def _cache_path(self, project_name: str) -> str:
+        digest = hashlib.sha256(project_name.encode()).hexdigest()[:16]
+        return os.path.join(self._cache_dir, f"deployments-{digest}.json")
+
+    def _read_disk(self, project_name: str) -> Optional[_ProjectCatalog]:
+        try:
+            with open(self._cache_path(project_name), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("project") != project_name:
+                return None
+            return _ProjectCatalog(
+                merge_deployments(data["deployments"]), data.get("etag"), data["fetched_at"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(
+        self, project_name: str, deployments: list[dict[str, Any]], entry: _ProjectCatalog
+    ) -> None:
+        # Raw deployments are stored so static metadata changes apply on reload;
+        # write-then-rename keeps pre-fork workers from reading half a file
+        payload = {
+            "project": project_name,
+            "etag": entry.etag,
+            "fetched_at": entry.fetched_at,
+            "deployments": deployments,
+        }
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._cache_path(project_name))
+        except OSError:
+            self._record("disk_write_error")
+
+    def _touch_disk(self, project_name: str, fetched_at: float) -> None:
+        path = self._cache_path(project_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            data["fetched_at"] = fetched_at
+            tmp_path = path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            pass
+
+    async def _fetch(self, project_name: str) -> Optional[_ProjectCatalog]:
+        current = self._projects.get(project_name)
+        try:
+            deployments, etag = await self._azure_client.list_deployments(
+                project_name, current.etag if current else None
+            )
+        except ProjectNotFoundException:
+            raise
+        except Exception:
+            self._failed_at[project_name] = time.monotonic()
+            self._record("refresh_error")
+            return current
+
+        self._failed_at.pop(project_name, None)
+        now = time.time()
+        if deployments is None and current is not None:
+            # 304: same deployments, just push the expiry out
+            self._record("not_modified")
+            current.fetched_at = now
+            self._touch_disk(project_name, now)
+            return current
+
+        entry = _ProjectCatalog(merge_deployments(deployments or []), etag, now)
+        self._projects[project_name] = entry
+        self._write_disk(project_name, deployments or [], entry)
+        return entry
+
+    def _load(self, project_name: str) -> asyncio.Future[Optional[_ProjectCatalog]]:
+        future = self._loading.get(project_name)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(project_name))
+            self._loading[project_name] = future
+            future.add_done_callback(lambda _: self._loading.pop(project_name, None))
+        return asyncio.shield(future)
+
+    def _refresh_in_background(self, project_name: str) -> None:
+        if project_name in self._loading:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(project_name), context=contextvars.Context()
+        )
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def _refresh(self, project_name: str) -> None:
+        with contextlib.suppress(Exception):
+            await self._load(project_name)
+
+    def _backing_off(self, project_name: str) -> bool:
+        failed_at = self._failed_at.get(project_name)
+        return failed_at is not None and time.monotonic() - failed_at < self._error_backoff
+
+    async def get_catalog(self, project_name: str) -> ModelCatalog | None:
+        entry = self._projects.get(project_name)
+        result = "hit"
+        if entry is None:
+            entry = self._read_disk(project_name)
+            if entry is not None:
+                self._projects[project_name] = entry
+                result = "disk"
+
+        if entry is not None:
+            if time.time() - entry.fetched_at >= self._ttl and not self._backing_off(project_name):
+                # Stale while revalidate: answer now, refresh with If-None-Match
+                self._refresh_in_background(project_name)
+                result = "stale"
+            self._record(result)
+            return self._authoritative(entry)
+
+        if self._backing_off(project_name):
+            return None
+        self._record("miss")
+        return self._authoritative(await self._load(project_name))
+
+    @staticmethod
+    def _authoritative(entry: Optional[_ProjectCatalog]) -> ModelCatalog | None:
+        # An empty listing says more about the API than about the project
+        if entry is None or len(entry.catalog) == 0:
+            return None
+        return entry.catalog
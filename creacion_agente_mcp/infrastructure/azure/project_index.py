@@ -0,0 +1,101 @@
+import asyncio
+import difflib
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from ...domain.exceptions import ProjectNotFoundException
+from ...observability import ServerMetrics
+
+class ProjectIndex:
+    # Cached set of project names, so a mistyped projectName fails locally
+    # instead of costing a round trip to Azure AI Foundry
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[Iterable[str]]],
+        ttl: float = 300.0,
+        refresh_interval: float = 30.0,
+        error_backoff: float = 30.0,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._loader = loader
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+        self._error_backoff = error_backoff
+        self._metrics = metrics or ServerMetrics()
+        self._names: frozenset[str] = frozenset()
+        # Clients tend to repeat the same typo, so suggestions are memoized per index
+        self._suggestions: dict[str, list[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future[None]] = None
+
+    @property
+    def names(self) -> frozenset[str]:
+        return self._names
+
+    def update(self, names: Iterable[str]) -> None:
+        self._names = frozenset(names)
+        self._suggestions = {}
+        self._loaded_at = time.monotonic()
+        self._failed_at = None
+        self._metrics.cache_entries.set(len(self._names), cache="project_index")
+
+    def reconfigure(self, ttl: float, refresh_interval: float) -> None:
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _age(self) -> float:
+        return float("inf") if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    async def _refresh(self) -> None:
+        # Single flight: concurrent validations share one list_projects call
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._load())
+            self._refreshing.add_done_callback(lambda _: setattr(self, "_refreshing", None))
+        await asyncio.shield(self._refreshing)
+
+    async def _load(self) -> None:
+        try:
+            self.update(await self._loader())
+        except Exception:
+            self._failed_at = time.monotonic()
+            self._metrics.cache_requests.inc(cache="project_index", result="refresh_error")
+
+    def _backing_off(self) -> bool:
+        if self._failed_at is None:
+            return False
+        return time.monotonic() - self._failed_at < self._error_backoff
+
+    async def validate(self, project_name: str) -> None:
+        if project_name in self._names and self._age() < self._ttl:
+            self._metrics.cache_requests.inc(cache="project_index", result="hit")
+            return
+
+        # Unknown or expired: refresh at most once per refresh_interval so new
+        # projects show up quickly without a typo loop hammering list_projects
+        if self._age() >= min(self._ttl, self._refresh_interval) and not self._backing_off():
+            await self._refresh()
+
+        if self._loaded_at is None or not self._names:
+            # Listing projects is unavailable or empty; fail open and let Foundry decide
+            self._metrics.cache_requests.inc(cache="project_index", result="unavailable")
+            return
+        if project_name in self._names:
+            self._metrics.cache_requests.inc(cache="project_index", result="miss")
+            return
+
+        self._metrics.cache_requests.inc(cache="project_index", result="rejected")
+        raise ProjectNotFoundException(project_name, self.suggest(project_name))
+
+    def suggest(self, project_name: str, limit: int = 3) -> list[str]:
+        suggestions = self._suggestions.get(project_name)
+        if suggestions is None:
+            lowered = {name.lower(): name for name in self._names}
+            matches = difflib.get_close_matches(project_name.lower(), lowered, n=limit, cutoff=0.6)
+            suggestions = [lowered[match] for match in matches]
+            if len(self._suggestions) < 1024:
+                self._suggestions[project_name] = suggestions
+        return suggestions
@@ -0,0 +1,55 @@
+import time
+from typing import Any
+
+PHASES = ("auth", "pool", "connect", "tls", "send", "server", "download", "decode")
+
+# httpcore trace steps and the phase each one starts. Name resolution happens inside
+# connect_tcp, so DNS is part of "connect"; "retry" is the backoff between connect attempts
+_STEP_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "retry": "connect",
+    "start_tls": "tls",
+    "send_connection_init": "send",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "server",
+    "receive_response_body": "download",
+    "response_closed": "download",
+}
+
+class RequestTiming:
+    # Splits one upstream request into phases. Each httpcore step that starts closes
+    # the phase running until then; the gap before the first step (building the request
+    # and waiting for a pooled connection) is "pool"
+    __slots__ = ("phases", "started", "_phase", "_mark")
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._phase = "auth"
+        self._mark = self.started
+
+    def enter(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._mark
+        self._phase = phase
+        self._mark = now
+
+    def finish(self) -> None:
+        self.enter(self._phase)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    async def trace(self, event: str, info: dict[str, Any]) -> None:
+        # Passed to httpx as the "trace" request extension, e.g. "http11.send_request_body.started"
+        step, _, stage = event.rpartition(".")
+        phase = _STEP_PHASES.get(step.rpartition(".")[2])
+        if stage == "started" and phase is not None and phase != self._phase:
+            self.enter(phase)
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{phase} {self.phases[phase] * 1000:.0f}ms" for phase in PHASES if phase in self.phases
+        )
@@ -1,57 +1,501 @@
 import asyncio
+import functools
+import socket
 import sys
-import os
+from typing import Callable, Optional
 
-from .config import get_settings
-from .infrastructure.azure import AzureFoundryClient, AzureFoundryConfig, AzureAgentRepository
+from .config import Settings, get_settings
+from .infrastructure.azure import (
+    AzureFoundryClient,
+    AzureFoundryConfig,
+    AzureAgentRepository,
+    FoundryModelCatalogProvider,
+)
+from .application.deadline import DeadlinePolicy
+from .domain.value_objects import ModelCatalog
 from .application.use_cases import CreateAgentUseCase, GetAgentUseCase, ListAgentsUseCase
+from .observability import ServerMetrics, create_tracer
+from .presentation.admission import AdmissionController
+from .presentation.health import ReadinessProbe
+from .presentation.lifecycle import LifecycleManager
+from .presentation.loop_monitor import LoopMonitor
+from .presentation.rate_limit import RateLimiter
+from .presentation.agent_encoder import AgentEncoder
+from .presentation.audit import AuditLog
+from .presentation.response_cache import ResponseCache
 from .presentation.mcp_server import MCPServer
+from .presentation.prewarm import Prewarmer
+from .presentation.profiling import Profiler
+from .presentation.prefork import PreforkSupervisor, WorkerReporter
+from .presentation.settings_reload import SettingsManager
 
-async def main() -> None:
-    try:
-        settings = get_settings()
+def build_foundry_config(settings: Settings) -> AzureFoundryConfig:
+    return AzureFoundryConfig(
+        endpoint=settings.azure_ai_endpoint,
+        endpoints=settings.azure_ai_endpoints,
+        api_version=settings.azure_ai_api_version,
+        api_key=settings.azure_ai_api_key,
+        tenant_id=settings.azure_tenant_id,
+        client_id=settings.azure_client_id,
+        client_secret=settings.azure_client_secret,
+        use_managed_identity=settings.use_managed_identity,
+        request_timeout=settings.foundry_request_timeout,
+        max_connections=settings.foundry_max_connections,
+        max_keepalive_connections=settings.foundry_max_keepalive_connections,
+        slow_request_threshold=settings.foundry_slow_request_threshold,
+        list_page_size=settings.foundry_list_page_size,
+        accept_encoding=settings.foundry_accept_encoding,
+        not_found_ttl=settings.agent_not_found_ttl,
+        project_index_ttl=settings.project_index_ttl,
+        project_index_refresh_interval=settings.project_index_refresh_interval,
+        endpoint_probe_interval=settings.foundry_endpoint_probe_interval,
+        endpoint_failure_threshold=settings.foundry_endpoint_failure_threshold,
+        endpoint_recovery_successes=settings.foundry_endpoint_recovery_successes,
+    )
+
+def build_mcp_server(settings: Settings) -> MCPServer:
+    metrics = ServerMetrics()
+    tracer = create_tracer(settings.tracing_exporter, settings.tracing_file)
+    config = build_foundry_config(settings)
+    azure_client = AzureFoundryClient(config, metrics=metrics, tracer=tracer)
+    agent_repository = AzureAgentRepository(
+        azure_client, tracer=tracer, max_cached_agents=settings.agent_cache_max_entries
+    )
+
+    model_catalog = None
+    if settings.model_catalog_enabled:
+        model_catalog = FoundryModelCatalogProvider(
+            azure_client,
+            ttl=settings.model_catalog_ttl,
+            cache_dir=settings.model_catalog_cache_dir,
+            metrics=metrics,
+        )
+
+    create_agent_use_case = CreateAgentUseCase(
+        agent_repository, tracer=tracer, model_catalog=model_catalog
+    )
+    get_agent_use_case = GetAgentUseCase(agent_repository, tracer=tracer)
+    list_agents_use_case = ListAgentsUseCase(agent_repository, tracer=tracer)
+
+    readiness = ReadinessProbe(
+        cache_ttl=settings.readiness_cache_ttl, timeout=settings.readiness_timeout
+    )
+    readiness.add_check("auth", azure_client.check_auth)
+    readiness.add_check("upstream", azure_client.check_upstream)
+
+    admission = None
+    if settings.mcp_transport != "stdio" and settings.admission_max_in_flight > 0:
+        admission = AdmissionController(
+            max_in_flight=settings.admission_max_in_flight,
+            max_in_flight_per_session=settings.admission_max_in_flight_per_session,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout,
+            retry_after=settings.admission_retry_after,
+            priorities=settings.admission_priorities,
+            metrics=metrics,
+        )
+
+    rate_limiter = None
+    if settings.rate_limit_enabled:
+        rate_limiter = RateLimiter(
+            read_rate=settings.rate_limit_read_rate,
+            read_burst=settings.rate_limit_read_burst,
+            write_rate=settings.rate_limit_write_rate,
+            write_burst=settings.rate_limit_write_burst,
+            tool_costs=settings.rate_limit_tool_costs,
+            max_clients=settings.rate_limit_max_clients,
+            idle_ttl=settings.rate_limit_idle_ttl,
+            metrics=metrics,
+        )
+
+    response_cache = None
+    if settings.response_cache_ttls:
+        response_cache = ResponseCache(
+            ttls=settings.response_cache_ttls,
+            stale_ttl=settings.response_cache_stale_ttl,
+            max_entries=settings.response_cache_max_entries,
+            metrics=metrics,
+        )
+
+    lifecycle = LifecycleManager(
+        drain_timeout=settings.shutdown_drain_timeout,
+        abort_timeout=settings.shutdown_abort_timeout,
+        retry_after=settings.admission_retry_after,
+        readiness=readiness,
+        metrics=metrics,
+    )
+    if response_cache is not None:
+        lifecycle.add_cleanup("response_cache", response_cache.stop)
+    deadline_policy = DeadlinePolicy(settings.tool_default_deadline, settings.tool_deadlines)
+    prewarmer = None
+    if settings.prewarm_enabled:
+        prewarmer = build_prewarmer(settings, azure_client, model_catalog, readiness, metrics)
+        lifecycle.add_cleanup("prewarm", prewarmer.stop)
+    loop_monitor = None
+    if settings.loop_monitor_enabled:
+        loop_monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval,
+            threshold=settings.loop_monitor_threshold,
+            metrics=metrics,
+        )
+        lifecycle.add_cleanup("loop_monitor", loop_monitor.stop)
+    profiler = None
+    if settings.profiling_enabled:
+        profiler = Profiler(
+            output_dir=settings.profiling_dir,
+            sample_interval=settings.profiling_sample_interval,
+            max_duration=settings.profiling_max_duration,
+            signal_duration=settings.profiling_signal_duration,
+            slow_call_threshold=settings.profiling_slow_call_threshold,
+            admin_token=settings.profiling_admin_token,
+            metrics=metrics,
+        )
+        lifecycle.add_cleanup("profiler", profiler.stop)
+        if not settings.profiling_admin_token and settings.mcp_transport != "stdio":
+            print(
+                "PROFILING_ADMIN_TOKEN is not set: /debug/profile and /debug/tasks are "
+                "refused, only SIGUSR1/SIGUSR2 profile",
+                file=sys.stderr,
+            )
+    settings_manager = SettingsManager(
+        settings,
+        get_settings,
+        watch_path=settings.settings_file,
+        watch_interval=settings.settings_watch_interval,
+        metrics=metrics,
+    )
+    subscribe_components(
+        settings_manager,
+        azure_client=azure_client,
+        readiness=readiness,
+        lifecycle=lifecycle,
+        deadline_policy=deadline_policy,
+        admission=admission,
+        rate_limiter=rate_limiter,
+        response_cache=response_cache,
+        model_catalog=model_catalog,
+        profiler=profiler,
+        loop_monitor=loop_monitor,
+    )
+    lifecycle.add_cleanup("settings_reload", settings_manager.stop)
+    audit_log = None
+    if settings.audit_enabled:
+        audit_log = AuditLog(
+            path=settings.audit_file,
+            tools=settings.audit_tools,
+            max_queue=settings.audit_max_queue,
+            batch_size=settings.audit_batch_size,
+            max_bytes=settings.audit_max_bytes,
+            backups=settings.audit_backups,
+            fsync=settings.audit_fsync,
+            metrics=metrics,
+        )
+        # After the drain, so calls that finished during shutdown are written too
+        lifecycle.add_cleanup("audit_log", audit_log.stop)
+    lifecycle.add_cleanup("azure_client", azure_client.aclose)
+    lifecycle.add_cleanup("tracer", tracer.shutdown)
+
+    return MCPServer(
+        create_agent_use_case=create_agent_use_case,
+        get_agent_use_case=get_agent_use_case,
+        list_agents_use_case=list_agents_use_case,
+        azure_client=azure_client,
+        metrics=metrics,
+        readiness=readiness,
+        tracer=tracer,
+        deadline_policy=deadline_policy,
+        admission=admission,
+        rate_limiter=rate_limiter,
+        rate_limit_api_key_header=settings.rate_limit_api_key_header,
+        rate_limit_trust_forwarded_for=settings.rate_limit_trust_forwarded_for,
+        rate_limit_api_keys=settings.rate_limit_api_keys,
+        compression_encodings=(
+            settings.compression_encodings if settings.compression_enabled else ()
+        ),
+        compression_min_size=settings.compression_min_size,
+        compression_levels=settings.compression_levels,
+        lifecycle=lifecycle,
+        response_cache=response_cache,
+        model_catalog=model_catalog,
+        agent_encoder=AgentEncoder(max_entries=settings.agent_cache_max_entries, metrics=metrics),
+        prewarmer=prewarmer,
+        settings_manager=settings_manager,
+        profiler=profiler,
+        loop_monitor=loop_monitor,
+        audit_log=audit_log,
+    )
+
+_AUTH_FIELDS = (
+    "azure_ai_api_key",
+    "azure_tenant_id",
+    "azure_client_id",
+    "azure_client_secret",
+    "use_managed_identity",
+)
+
+def subscribe_components(
+    settings_manager: SettingsManager,
+    azure_client: AzureFoundryClient,
+    readiness: ReadinessProbe,
+    lifecycle: LifecycleManager,
+    deadline_policy: DeadlinePolicy,
+    admission: Optional[AdmissionController],
+    rate_limiter: Optional[RateLimiter],
+    response_cache: Optional[ResponseCache],
+    model_catalog: Optional[FoundryModelCatalogProvider],
+    profiler: Optional[Profiler] = None,
+    loop_monitor: Optional[LoopMonitor] = None,
+) -> None:
+    # Settings of components that were not built (e.g. RATE_LIMIT_ENABLED was false at
+    # startup) are left unsubscribed, so changing them is reported as needing a restart
+    def prepare_client(settings: Settings) -> Callable[[], None]:
+        config = build_foundry_config(settings)
+        config.validate_auth()
+        return lambda: azure_client.reconfigure(config)
 
-        config = AzureFoundryConfig(
-            endpoint=settings.azure_ai_endpoint,
-            api_version=settings.azure_ai_api_version,
-            api_key=settings.azure_ai_api_key,
-            tenant_id=settings.azure_tenant_id,
-            client_id=settings.azure_client_id,
-            client_secret=settings.azure_client_secret,
-            use_managed_identity=settings.use_managed_identity,
+    settings_manager.subscribe(
+        "azure_client",
+        (
+            "azure_ai_endpoint",
+            "azure_ai_endpoints",
+            "azure_ai_api_version",
+            *_AUTH_FIELDS,
+            "foundry_request_timeout",
+            "foundry_max_connections",
+            "foundry_max_keepalive_connections",
+            "foundry_slow_request_threshold",
+            "foundry_list_page_size",
+            "foundry_accept_encoding",
+            "agent_not_found_ttl",
+            "project_index_ttl",
+            "project_index_refresh_interval",
+            "foundry_endpoint_probe_interval",
+            "foundry_endpoint_failure_threshold",
+            "foundry_endpoint_recovery_successes",
+        ),
+        prepare_client,
+    )
+    # Rotated credentials are re-checked on the next probe instead of a cached result
+    settings_manager.subscribe(
+        "readiness",
+        (
+            "readiness_cache_ttl",
+            "readiness_timeout",
+            "azure_ai_endpoint",
+            "azure_ai_endpoints",
+            *_AUTH_FIELDS,
+        ),
+        lambda settings: functools.partial(
+            readiness.reconfigure, settings.readiness_cache_ttl, settings.readiness_timeout
+        ),
+    )
+    settings_manager.subscribe(
+        "lifecycle",
+        ("shutdown_drain_timeout", "shutdown_abort_timeout", "admission_retry_after"),
+        lambda settings: functools.partial(
+            lifecycle.reconfigure,
+            settings.shutdown_drain_timeout,
+            settings.shutdown_abort_timeout,
+            settings.admission_retry_after,
+        ),
+    )
+    settings_manager.subscribe(
+        "deadlines",
+        ("tool_default_deadline", "tool_deadlines"),
+        lambda settings: functools.partial(
+            deadline_policy.reconfigure, settings.tool_default_deadline, settings.tool_deadlines
+        ),
+    )
+    if admission is not None:
+        settings_manager.subscribe(
+            "admission",
+            (
+                "admission_max_in_flight",
+                "admission_max_in_flight_per_session",
+                "admission_max_queue",
+                "admission_queue_timeout",
+                "admission_retry_after",
+                "admission_priorities",
+            ),
+            lambda settings: functools.partial(
+                admission.reconfigure,
+                max_in_flight=settings.admission_max_in_flight,
+                max_in_flight_per_session=settings.admission_max_in_flight_per_session,
+                max_queue=settings.admission_max_queue,
+                queue_timeout=settings.admission_queue_timeout,
+                retry_after=settings.admission_retry_after,
+                priorities=settings.admission_priorities,
+            ),
+        )
+    if rate_limiter is not None:
+        settings_manager.subscribe(
+            "rate_limiter",
+            (
+                "rate_limit_read_rate",
+                "rate_limit_read_burst",
+                "rate_limit_write_rate",
+                "rate_limit_write_burst",
+                "rate_limit_tool_costs",
+                "rate_limit_max_clients",
+                "rate_limit_idle_ttl",
+            ),
+            lambda settings: functools.partial(
+                rate_limiter.reconfigure,
+                read_rate=settings.rate_limit_read_rate,
+                read_burst=settings.rate_limit_read_burst,
+                write_rate=settings.rate_limit_write_rate,
+                write_burst=settings.rate_limit_write_burst,
+                tool_costs=settings.rate_limit_tool_costs,
+                max_clients=settings.rate_limit_max_clients,
+                idle_ttl=settings.rate_limit_idle_ttl,
+            ),
+        )
+    if response_cache is not None:
+        settings_manager.subscribe(
+            "response_cache",
+            ("response_cache_ttls", "response_cache_stale_ttl", "response_cache_max_entries"),
+            lambda settings: functools.partial(
+                response_cache.reconfigure,
+                settings.response_cache_ttls,
+                settings.response_cache_stale_ttl,
+                settings.response_cache_max_entries,
+            ),
+        )
+    if model_catalog is not None:
+        settings_manager.subscribe(
+            "model_catalog",
+            ("model_catalog_ttl",),
+            lambda settings: functools.partial(
+                model_catalog.reconfigure, settings.model_catalog_ttl
+            ),
+        )
+    if profiler is not None:
+        settings_manager.subscribe(
+            "profiler",
+            ("profiling_sample_interval", "profiling_slow_call_threshold"),
+            lambda settings: functools.partial(
+                profiler.reconfigure,
+                settings.profiling_sample_interval,
+                settings.profiling_slow_call_threshold,
+            ),
+        )
+    if loop_monitor is not None:
+        settings_manager.subscribe(
+            "loop_monitor",
+            ("loop_monitor_interval", "loop_monitor_threshold"),
+            lambda settings: functools.partial(
+                loop_monitor.reconfigure,
+                settings.loop_monitor_interval,
+                settings.loop_monitor_threshold,
+            ),
         )
 
-        azure_client = AzureFoundryClient(config)
-        agent_repository = AzureAgentRepository(azure_client)
+def build_prewarmer(
+    settings: Settings,
+    azure_client: AzureFoundryClient,
+    model_catalog: Optional[FoundryModelCatalogProvider],
+    readiness: ReadinessProbe,
+    metrics: ServerMetrics,
+) -> Prewarmer:
+    prewarmer = Prewarmer(timeout=settings.prewarm_timeout, readiness=readiness, metrics=metrics)
+    project_names: list[str] = []
 
-        create_agent_use_case = CreateAgentUseCase(agent_repository)
-        get_agent_use_case = GetAgentUseCase(agent_repository)
-        list_agents_use_case = ListAgentsUseCase(agent_repository)
+    async def load_projects() -> str:
+        project_names.extend(project.name for project in await azure_client.list_projects())
+        return f"{len(project_names)} projects"
 
-        mcp_server = MCPServer(
-            create_agent_use_case=create_agent_use_case,
-            get_agent_use_case=get_agent_use_case,
-            list_agents_use_case=list_agents_use_case,
-            azure_client=azure_client,
+    async def load_catalogs(provider: FoundryModelCatalogProvider) -> str:
+        names = project_names[: settings.prewarm_catalog_projects]
+        catalogs = await asyncio.gather(
+            *(provider.get_catalog(name) for name in names), return_exceptions=True
         )
+        # A failed fetch comes back as None and is retried on first use
+        loaded = sum(1 for catalog in catalogs if isinstance(catalog, ModelCatalog))
+        return f"{loaded}/{len(names)} projects"
+
+    async def open_connections() -> str:
+        opened = await azure_client.prewarm_connections(settings.prewarm_connections)
+        return f"{opened} open"
+
+    # The project list waits for the token, so it is not counted twice
+    prewarmer.add_step("token", azure_client.prewarm_token)
+    if settings.prewarm_connections > 0:
+        prewarmer.add_step("connections", open_connections)
+    prewarmer.add_step("projects", load_projects, after="token")
+    if model_catalog is not None and settings.prewarm_catalog_projects > 0:
+        prewarmer.add_step(
+            "model_catalog", functools.partial(load_catalogs, model_catalog), after="projects"
+        )
+    return prewarmer
+
+async def main(settings: Optional[Settings] = None) -> None:
+    try:
+        settings = settings or get_settings()
+        mcp_server = build_mcp_server(settings)
 
-        transport = os.getenv("MCP_TRANSPORT", "stdio")
+        transport = settings.mcp_transport
 
-        if transport == "sse":
-            host = os.getenv("MCP_HOST", "0.0.0.0")
-            port = int(os.getenv("MCP_PORT", "8000"))
-            print(f"Starting MCP server on http://{host}:{port} (SSE)", file=sys.stderr)
-            await mcp_server.run_sse(host, port)
-        else:
-            print("Starting MCP server on stdio", file=sys.stderr)
-            await mcp_server.run_stdio()
+        try:
+            if transport == "sse":
+                host = settings.mcp_host
+                port = settings.mcp_port
+                print(f"Starting MCP server on http://{host}:{port} (SSE)", file=sys.stderr)
+                await mcp_server.run_sse(host, port)
+            elif transport == "streamable-http":
+                host = settings.mcp_host
+                port = settings.mcp_port
+                print(
+                    f"Starting MCP server on http://{host}:{port}/mcp (streamable HTTP)",
+                    file=sys.stderr,
+                )
+                await mcp_server.run_streamable_http(host, port)
+            else:
+                print("Starting MCP server on stdio", file=sys.stderr)
+                await mcp_server.run_stdio()
+        finally:
+            await mcp_server.lifecycle.cleanup()
 
     except Exception as e:
         print(f"Failed to start server: {e}", file=sys.stderr)
         sys.exit(1)
 
+async def worker_main(settings: Settings, sock: socket.socket, reporter: WorkerReporter) -> None:
+    mcp_server = build_mcp_server(settings)
+    app = reporter.instrument(mcp_server.build_http_app(settings.mcp_transport))
+    reporter.attach_metrics(mcp_server.metrics.registry)
+    # Last heartbeat carries the final counters, including the shutdown outcome
+    mcp_server.lifecycle.add_cleanup("worker_report", reporter.report)
+
+    heartbeat = asyncio.create_task(reporter.run())
+    try:
+        await mcp_server.serve_http(app, sock=sock)
+    finally:
+        heartbeat.cancel()
+        await mcp_server.lifecycle.cleanup()
+
 def run() -> None:
-    asyncio.run(main())
+    try:
+        settings = get_settings()
+    except Exception as e:
+        print(f"Failed to start server: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if settings.mcp_workers > 1:
+        # Fork before any event loop, credential or connection pool exists
+        supervisor = PreforkSupervisor(
+            worker_target=lambda sock, reporter: asyncio.run(worker_main(settings, sock, reporter)),
+            host=settings.mcp_host,
+            port=settings.mcp_port,
+            workers=settings.mcp_workers,
+            control_host=settings.mcp_control_host,
+            control_port=settings.mcp_control_port,
+            heartbeat_interval=settings.mcp_worker_heartbeat_interval,
+            heartbeat_timeout=settings.mcp_worker_heartbeat_timeout,
+            shutdown_timeout=settings.mcp_worker_shutdown_timeout,
+        )
+        supervisor.run()
+    else:
+        asyncio.run(main(settings))
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,39 @@
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    ServerMetrics,
+    merge_snapshots,
+    render_snapshots,
+)
+from .tracing import (
+    InMemorySpanExporter,
+    JsonlFileSpanExporter,
+    NoopTracer,
+    OpenTelemetryTracer,
+    RecordingTracer,
+    Span,
+    SpanExporter,
+    Tracer,
+    create_tracer,
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "InMemorySpanExporter",
+    "JsonlFileSpanExporter",
+    "MetricsRegistry",
+    "NoopTracer",
+    "OpenTelemetryTracer",
+    "RecordingTracer",
+    "ServerMetrics",
+    "Span",
+    "SpanExporter",
+    "Tracer",
+    "create_tracer",
+    "merge_snapshots",
+    "render_snapshots",
+]
@@ -0,0 +1,406 @@
+import math
+from typing import Any, Iterable, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[tuple[str, ...], Any]]:
+        return list(self._values.items())
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+# How a gauge's samples from several workers combine into one pod-wide value
+GAUGE_AGGREGATIONS = ("sum", "max", "min", "avg")
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        aggregation: str = "sum",
+    ) -> None:
+        if aggregation not in GAUGE_AGGREGATIONS:
+            raise ValueError(f"Unknown gauge aggregation: {aggregation}")
+        super().__init__(name, documentation, labelnames)
+        self.aggregation = aggregation
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state["counts"][index] += 1
+                break
+        state["sum"] += value
+        state["count"] += 1
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return state["count"] if state else 0
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        aggregation: str = "sum",
+    ) -> Gauge:
+        # aggregation: "sum" only for additive gauges (in flight, queued); per-process
+        # state that every worker holds a copy of is combined with max, min or avg
+        return self.register(Gauge(name, documentation, labelnames, aggregation))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict[str, Any]:
+        # Plain JSON-able form, used to ship worker metrics to the supervisor
+        snapshot: dict[str, Any] = {}
+        for metric in self._metrics.values():
+            entry: dict[str, Any] = {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "samples": [[list(key), value] for key, value in metric.samples()],
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            elif isinstance(metric, Gauge):
+                entry["aggregation"] = metric.aggregation
+            snapshot[metric.name] = entry
+        return snapshot
+
+    def render(self) -> str:
+        return render_snapshots([self.snapshot()])
+
+def _aggregate(aggregation: str, values: list[float]) -> float:
+    if aggregation == "max":
+        return max(values)
+    if aggregation == "min":
+        return min(values)
+    if aggregation == "avg":
+        return sum(values) / len(values)
+    return sum(values)
+
+def merge_snapshots(snapshots: Iterable[Optional[dict[str, Any]]]) -> dict[str, Any]:
+    # Counters and histograms add up across workers; gauges follow their aggregation,
+    # over the workers that reported each label set
+    merged: dict[str, Any] = {}
+    for snapshot in snapshots:
+        for name, entry in (snapshot or {}).items():
+            target = merged.setdefault(name, {**entry, "samples": {}})
+            for labelvalues, value in entry["samples"]:
+                key = tuple(labelvalues)
+                current = target["samples"].get(key)
+                if entry["type"] == "histogram":
+                    if current is None:
+                        current = {"counts": [0] * len(value["counts"]), "sum": 0.0, "count": 0}
+                    current = {
+                        "counts": [a + b for a, b in zip(current["counts"], value["counts"])],
+                        "sum": current["sum"] + value["sum"],
+                        "count": current["count"] + value["count"],
+                    }
+                else:
+                    current = [*(current or ()), value]
+                target["samples"][key] = current
+    for entry in merged.values():
+        if entry["type"] != "histogram":
+            aggregation = entry.get("aggregation", "sum")
+            for key, values in entry["samples"].items():
+                entry["samples"][key] = _aggregate(aggregation, values)
+        entry["samples"] = [[list(key), value] for key, value in entry["samples"].items()]
+    return merged
+
+def render_snapshots(snapshots: Iterable[Optional[dict[str, Any]]]) -> str:
+    lines: list[str] = []
+    for name, entry in merge_snapshots(snapshots).items():
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        labelnames = entry["labelnames"]
+        for labelvalues, value in entry["samples"]:
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(entry["buckets"], value["counts"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{name}_bucket{_format_labels(labelnames, labelvalues, le)} {cumulative}"
+                )
+            inf = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, labelvalues, inf)} {value['count']}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+class ServerMetrics:
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or MetricsRegistry()
+
+        # MCP tools
+        self.tool_calls = self.registry.counter(
+            "mcp_tool_calls_total", "MCP tool calls by tool and outcome", ("tool", "status")
+        )
+        self.tool_call_duration = self.registry.histogram(
+            "mcp_tool_call_duration_seconds", "MCP tool call latency", ("tool",)
+        )
+        self.tool_calls_in_flight = self.registry.gauge(
+            "mcp_tool_calls_in_flight", "MCP tool calls currently executing"
+        )
+        self.tool_deadline_exceeded = self.registry.counter(
+            "mcp_tool_deadline_exceeded_total", "MCP tool calls that ran out of budget", ("tool",)
+        )
+        self.tool_cancelled = self.registry.counter(
+            "mcp_tool_cancelled_total", "MCP tool calls cancelled by the client", ("tool",)
+        )
+
+        # Admission control
+        self.admission_rejected = self.registry.counter(
+            "mcp_admission_rejected_total",
+            "MCP tool calls shed by admission control by tool and reason",
+            ("tool", "reason"),
+        )
+        self.admission_queued = self.registry.counter(
+            "mcp_admission_queued_total", "MCP tool calls that had to wait for a slot", ("tool",)
+        )
+        self.admission_queue_depth = self.registry.gauge(
+            "mcp_admission_queue_depth", "MCP tool calls currently waiting for a slot"
+        )
+        self.admission_wait = self.registry.histogram(
+            "mcp_admission_wait_seconds", "Time queued MCP tool calls waited for a slot", ("tool",)
+        )
+
+        # Shutdown
+        self.shutdown_calls = self.registry.counter(
+            "mcp_shutdown_calls_total",
+            "Tool calls in flight at shutdown by outcome (drained or aborted)",
+            ("outcome",),
+        )
+
+        # Startup prewarm
+        self.prewarm_duration = self.registry.gauge(
+            "mcp_prewarm_step_seconds",
+            "Duration of each startup prewarm step by outcome (slowest worker)",
+            ("step", "outcome"),
+            aggregation="max",
+        )
+
+        # Settings reload
+        self.settings_reloads = self.registry.counter(
+            "mcp_settings_reloads_total",
+            "Settings reloads by outcome (applied, unchanged, invalid, failed)",
+            ("outcome",),
+        )
+        self.settings_reload_duration = self.registry.histogram(
+            "mcp_settings_reload_duration_seconds",
+            "Time to read, validate and apply reloaded settings",
+        )
+
+        # Audit log
+        self.audit_records = self.registry.counter(
+            "mcp_audit_records_total",
+            "Audit records by outcome (written, dropped when the queue is full, failed)",
+            ("outcome",),
+        )
+        self.audit_write_duration = self.registry.histogram(
+            "mcp_audit_write_duration_seconds",
+            "Time to encode and write one batch of audit records",
+        )
+
+        # Event loop health
+        self.loop_lag = self.registry.histogram(
+            "mcp_event_loop_lag_seconds",
+            "Delay between when an event loop tick was due and when it ran",
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+        )
+        self.loop_blocked = self.registry.counter(
+            "mcp_event_loop_blocked_total",
+            "Event loop ticks delayed by more than LOOP_MONITOR_THRESHOLD",
+        )
+
+        # On-demand profiling
+        self.profiles = self.registry.counter(
+            "mcp_profiles_total",
+            "Profiles written by kind (process, slow_call, tasks)",
+            ("kind",),
+        )
+
+        # Rate limiting
+        self.rate_limited = self.registry.counter(
+            "mcp_rate_limited_total", "Requests rejected by the per-client rate limiter", ("kind",)
+        )
+        self.rate_limit_buckets = self.registry.gauge(
+            "mcp_rate_limit_buckets", "Token buckets currently tracked by the rate limiter"
+        )
+
+        # Response compression (HTTP transports)
+        self.compression_bytes = self.registry.counter(
+            "mcp_http_compression_bytes_total",
+            "Response bytes before (input) and after (output) compression by encoding",
+            ("encoding", "stage"),
+        )
+        self.compression_seconds = self.registry.counter(
+            "mcp_http_compression_seconds_total",
+            "Time spent compressing responses by encoding",
+            ("encoding",),
+        )
+
+        # Azure AI Foundry
+        self.upstream_duration = self.registry.histogram(
+            "foundry_request_duration_seconds",
+            "Azure AI Foundry request latency by operation and HTTP status",
+            ("operation", "status"),
+        )
+        self.upstream_phase_duration = self.registry.histogram(
+            "foundry_request_phase_seconds",
+            "Azure AI Foundry request time by operation, endpoint and phase (auth, pool, connect, "
+            "tls, send, server, download, decode)",
+            ("operation", "endpoint", "phase"),
+            # Most phases of a warm request take well under the default 5ms first bucket
+            buckets=(0.0001, 0.0005, 0.001, 0.0025, *DEFAULT_BUCKETS),
+        )
+        self.upstream_response_bytes = self.registry.counter(
+            "foundry_response_bytes_total",
+            "Azure AI Foundry response body bytes by operation, content encoding and stage "
+            "(wire, decoded)",
+            ("operation", "encoding", "stage"),
+        )
+
+        # Azure AI Foundry endpoint routing (only with more than one endpoint)
+        self.endpoint_requests = self.registry.counter(
+            "foundry_endpoint_requests_total",
+            "Azure AI Foundry request attempts by endpoint and outcome (success, failure)",
+            ("endpoint", "outcome"),
+        )
+        self.upstream_failovers = self.registry.counter(
+            "foundry_failovers_total",
+            "Requests retried on the next Azure AI Foundry endpoint by operation and reason",
+            ("operation", "reason"),
+        )
+        self.endpoint_switches = self.registry.counter(
+            "foundry_endpoint_switches_total",
+            "Times an Azure AI Foundry endpoint became the preferred route",
+            ("endpoint",),
+        )
+        self.endpoint_probes = self.registry.counter(
+            "foundry_endpoint_probes_total",
+            "Background probes of Azure AI Foundry endpoints by result",
+            ("endpoint", "result"),
+        )
+        self.endpoint_latency = self.registry.gauge(
+            "foundry_endpoint_latency_seconds",
+            "EWMA of probe round trips per Azure AI Foundry endpoint (worker average)",
+            ("endpoint",),
+            aggregation="avg",
+        )
+        self.endpoint_error_rate = self.registry.gauge(
+            "foundry_endpoint_error_rate",
+            "EWMA of failed requests and probes per Azure AI Foundry endpoint (worker average)",
+            ("endpoint",),
+            aggregation="avg",
+        )
+        self.endpoint_healthy = self.registry.gauge(
+            "foundry_endpoint_healthy",
+            "Share of workers sending traffic to an Azure AI Foundry endpoint (1 all, 0 none)",
+            ("endpoint",),
+            aggregation="avg",
+        )
+
+        # Caches
+        self.cache_requests = self.registry.counter(
+            "mcp_cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+        )
+        self.cache_entries = self.registry.gauge(
+            "mcp_cache_entries",
+            "Entries currently held per cache (fullest worker)",
+            ("cache",),
+            aggregation="max",
+        )
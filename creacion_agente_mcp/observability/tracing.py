@@ -0,0 +1,237 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import TracebackType
+from typing import Any, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+class Span:
+    def __init__(
+        self,
+        tracer: "RecordingTracer",
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.status = "unset"
+        self.status_description: Optional[str] = None
+        self.events: list[dict[str, Any]] = []
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self._token: Optional[contextvars.Token[Optional[Span]]] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str, description: Optional[str] = None) -> None:
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.events.append(
+            {
+                "name": "exception",
+                "timeUnixNano": time.time_ns(),
+                "attributes": {
+                    "exception.type": type(exception).__name__,
+                    "exception.message": str(exception),
+                },
+            }
+        )
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc is not None:
+            self.record_exception(exc)
+            self.set_status("error", str(exc))
+        elif self.status == "unset":
+            self.status = "ok"
+        self.end_time_ns = time.time_ns()
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._tracer.export(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        end_time_ns = self.end_time_ns or time.time_ns()
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_time_ns,
+            "endTimeUnixNano": end_time_ns,
+            "durationMs": round((end_time_ns - self.start_time_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "description": self.status_description},
+            "events": self.events,
+        }
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+    def set_status(self, status: str, description: Optional[str] = None) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Tracer(ABC):
+    @abstractmethod
+    def start_span(self, name: str, attributes: Optional[dict[str, Any]] = None) -> Any:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+class NoopTracer(Tracer):
+    # Default: one shared span object, so disabled tracing costs a method call
+    def start_span(self, name: str, attributes: Optional[dict[str, Any]] = None) -> _NoopSpan:
+        return _NOOP_SPAN
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, span: dict[str, Any]) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+class InMemorySpanExporter(SpanExporter):
+    # Collector stand-in for benchmarks and local debugging
+    def __init__(self, max_spans: int = 10000) -> None:
+        self._max_spans = max_spans
+        self.spans: list[dict[str, Any]] = []
+
+    def export(self, span: dict[str, Any]) -> None:
+        self.spans.append(span)
+        if len(self.spans) > self._max_spans:
+            del self.spans[: len(self.spans) - self._max_spans]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+class JsonlFileSpanExporter(SpanExporter):
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        # Line buffered: each span is one append, so pre-fork workers can share the file
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: dict[str, Any]) -> None:
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.flush()
+            self._file.close()
+
+class RecordingTracer(Tracer):
+    def __init__(self, exporter: SpanExporter) -> None:
+        self._exporter = exporter
+
+    def start_span(self, name: str, attributes: Optional[dict[str, Any]] = None) -> Span:
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        return Span(self, name, trace_id, parent.span_id if parent else None, attributes)
+
+    def export(self, span: Span) -> None:
+        self._exporter.export(span.to_dict())
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+class _OpenTelemetrySpan:
+    def __init__(self, context_manager: Any) -> None:
+        self._context_manager = context_manager
+        self._span: Any = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self._span.set_attributes(attributes)
+
+    def set_status(self, status: str, description: Optional[str] = None) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        code = StatusCode.ERROR if status == "error" else StatusCode.OK
+        self._span.set_status(Status(code, description if code == StatusCode.ERROR else None))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self._span.record_exception(exception)
+
+    def __enter__(self) -> "_OpenTelemetrySpan":
+        self._span = self._context_manager.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        return self._context_manager.__exit__(*exc_info)
+
+class OpenTelemetryTracer(Tracer):
+    # Delegates to the OpenTelemetry API; exporters and collectors are set up
+    # through the OpenTelemetry SDK (e.g. OTEL_EXPORTER_OTLP_ENDPOINT)
+    def __init__(self, instrumentation_name: str = "creacion_agente_mcp") -> None:
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer(instrumentation_name)
+
+    def start_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> _OpenTelemetrySpan:
+        return _OpenTelemetrySpan(self._tracer.start_as_current_span(name, attributes=attributes))
+
+    def shutdown(self) -> None:
+        from opentelemetry import trace
+
+        provider = trace.get_tracer_provider()
+        if hasattr(provider, "shutdown"):
+            provider.shutdown()
+
+def create_tracer(exporter: str, file_path: str = "traces.jsonl") -> Tracer:
+    if exporter == "none":
+        return NoopTracer()
+    elif exporter == "file":
+        return RecordingTracer(JsonlFileSpanExporter(file_path))
+    elif exporter == "memory":
+        return RecordingTracer(InMemorySpanExporter())
+    elif exporter == "otel":
+        return OpenTelemetryTracer()
+    else:
+        raise ValueError(f"Unknown tracing exporter: {exporter}")
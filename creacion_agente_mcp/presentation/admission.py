@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from typing import AsyncIterator, Hashable, Optional
+
+from ..observability import ServerMetrics
+
+# Lower runs first: cheap catalog reads ahead of upstream reads ahead of writes
+DEFAULT_TOOL_PRIORITIES = {
+    "list_models": 0,
+    "list_projects": 1,
+    "get_agent": 1,
+    "list_agents": 2,
+    "create_agent": 3,
+}
+
+class ServerOverloadedException(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Server overloaded ({reason}), retry after {retry_after:g}s")
+
+class _Waiter:
+    __slots__ = ("tool", "priority", "sequence", "session", "future")
+
+    def __init__(
+        self,
+        tool: str,
+        priority: int,
+        sequence: int,
+        session: Hashable,
+        future: asyncio.Future[None],
+    ) -> None:
+        self.tool = tool
+        self.priority = priority
+        self.sequence = sequence
+        self.session = session
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_in_flight_per_session: int = 8,
+        max_queue: int = 128,
+        queue_timeout: float = 5.0,
+        retry_after: float = 1.0,
+        priorities: Optional[dict[str, int]] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._max_in_flight = max_in_flight
+        self._max_per_session = max_in_flight_per_session
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._priorities = {**DEFAULT_TOOL_PRIORITIES, **(priorities or {})}
+        self._metrics = metrics or ServerMetrics()
+        self._in_flight = 0
+        self._per_session: dict[Hashable, int] = {}
+        self._queue: list[_Waiter] = []
+        self._sequence = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def reconfigure(
+        self,
+        max_in_flight: int,
+        max_in_flight_per_session: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: float,
+        priorities: Optional[dict[str, int]] = None,
+    ) -> None:
+        # Admitted calls keep their slots; a lower limit takes effect as they finish
+        # and a higher one admits queued calls right away
+        self._max_in_flight = max_in_flight
+        self._max_per_session = max_in_flight_per_session
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._priorities = {**DEFAULT_TOOL_PRIORITIES, **(priorities or {})}
+        self._wake_waiters()
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def _has_capacity(self, session: Hashable) -> bool:
+        return (
+            self._in_flight < self._max_in_flight
+            and self._per_session.get(session, 0) < self._max_per_session
+        )
+
+    def _acquire(self, session: Hashable) -> None:
+        self._in_flight += 1
+        self._per_session[session] = self._per_session.get(session, 0) + 1
+
+    def _release(self, session: Hashable) -> None:
+        self._in_flight -= 1
+        remaining = self._per_session[session] - 1
+        if remaining:
+            self._per_session[session] = remaining
+        else:
+            del self._per_session[session]
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        # Hand freed slots to the best waiters whose session is under its cap.
+        # The queue is bounded by max_queue, so the scan stays cheap.
+        if not self._queue or self._in_flight >= self._max_in_flight:
+            return
+        kept: list[_Waiter] = []
+        while self._queue and self._in_flight < self._max_in_flight:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            if self._per_session.get(waiter.session, 0) < self._max_per_session:
+                self._acquire(waiter.session)
+                waiter.future.set_result(None)
+            else:
+                kept.append(waiter)
+        for waiter in kept:
+            heapq.heappush(self._queue, waiter)
+        self._metrics.admission_queue_depth.set(len(self._queue))
+
+    def _remove(self, waiter: _Waiter) -> None:
+        with contextlib.suppress(ValueError):
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+        self._metrics.admission_queue_depth.set(len(self._queue))
+
+    def _reject(self, tool: str, reason: str) -> ServerOverloadedException:
+        self._metrics.admission_rejected.inc(tool=tool, reason=reason)
+        return ServerOverloadedException(reason, self._retry_after)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, tool: str, session: Hashable) -> AsyncIterator[None]:
+        priority = self._priorities.get(tool, max(self._priorities.values()) + 1)
+
+        # Fast path only when nobody better is already waiting for the slot
+        if self._has_capacity(session) and not (
+            self._queue and self._queue[0].priority <= priority
+        ):
+            self._acquire(session)
+        else:
+            if len(self._queue) >= self._max_queue:
+                # Shed the least important waiter rather than a more important arrival
+                worst = max(self._queue, default=None)
+                if worst is None or worst.priority <= priority:
+                    raise self._reject(tool, "queue_full")
+                self._remove(worst)
+                worst.future.set_exception(self._reject(worst.tool, "queue_full"))
+
+            waiter = _Waiter(
+                tool,
+                priority,
+                next(self._sequence),
+                session,
+                asyncio.get_running_loop().create_future(),
+            )
+            heapq.heappush(self._queue, waiter)
+            self._metrics.admission_queued.inc(tool=tool)
+            self._metrics.admission_queue_depth.set(len(self._queue))
+            self._wake_waiters()
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self._queue_timeout)
+            except ServerOverloadedException:
+                raise
+            except TimeoutError:
+                self._remove(waiter)
+                if not waiter.future.done():
+                    waiter.future.cancel()
+                    raise self._reject(tool, "queue_timeout")
+            except BaseException:
+                # Cancelled while queued; give back the slot if it was granted meanwhile
+                self._remove(waiter)
+                granted = waiter.future.done() and not waiter.future.cancelled()
+                if granted and waiter.future.exception() is None:
+                    self._release(session)
+                else:
+                    waiter.future.cancel()
+                raise
+            finally:
+                self._metrics.admission_wait.observe(time.perf_counter() - started, tool=tool)
+
+        try:
+            yield
+        finally:
+            self._release(session)
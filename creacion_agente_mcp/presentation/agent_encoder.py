@@ -0,0 +1,113 @@
+import contextlib
+import json
+from collections import OrderedDict
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional, Sequence
+
+from ..domain.entities import Agent
+from ..observability import ServerMetrics
+
+def _stdlib_dumps(value: Any) -> bytes:
+    # ensure_ascii=False matches orjson, which never escapes non-ASCII characters
+    return json.dumps(value, indent=2, ensure_ascii=False).encode()
+
+def default_dumps() -> Callable[[Any], bytes]:
+    # orjson is optional (pip install .[fast]); both produce the same document
+    try:
+        import orjson
+    except ImportError:
+        return _stdlib_dumps
+    option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    return lambda value: orjson.dumps(value, option=option)
+
+class _EncodedAgent:
+    __slots__ = ("document", "element")
+
+    def __init__(self, document: bytes) -> None:
+        # Kept decoded: TextContent carries str, so decoding once here saves
+        # decoding every response
+        self.document = document.decode()
+        # Indented one level, as an element of a list response; built on first use
+        self.element: Optional[str] = None
+
+class AgentEncoder:
+    # Agents are immutable, so an entity's version identifies its encoding; each
+    # state is encoded once and list responses are joined from cached fragments
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        dumps: Optional[Callable[[Any], bytes]] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._dumps = dumps or default_dumps()
+        self._metrics = metrics or ServerMetrics()
+        self._entries: OrderedDict[int, _EncodedAgent] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, agent: Agent) -> tuple[_EncodedAgent, bool]:
+        entry = self._entries.get(agent.version)
+        if entry is not None:
+            self._entries.move_to_end(agent.version)
+            return entry, True
+        entry = self._entries[agent.version] = _EncodedAgent(self._dumps(agent.to_dict()))
+        return entry, False
+
+    def _evict(self, hits: int, misses: int) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        # One metric update per response, not per agent
+        if hits:
+            self._metrics.cache_requests.inc(hits, cache="agent_encoding", result="hit")
+        if misses:
+            self._metrics.cache_requests.inc(misses, cache="agent_encoding", result="miss")
+            self._metrics.cache_entries.set(len(self._entries), cache="agent_encoding")
+
+    def encode(self, agent: Agent) -> str:
+        entry, hit = self._lookup(agent)
+        self._evict(int(hit), int(not hit))
+        return entry.document
+
+    def encode_list(self, agents: Sequence[Agent]) -> str:
+        if not agents:
+            return "[]"
+        return "[\n" + self._encode_elements(agents) + "\n]"
+
+    async def iter_list(self, pages: AsyncIterable[Sequence[Agent]]) -> AsyncIterator[str]:
+        # Yields the list document a page at a time; the chunks concatenate to what
+        # encode_list returns for all the agents, without holding them all
+        empty = True
+        async for agents in pages:
+            if agents:
+                yield ("[\n" if empty else ",\n") + self._encode_elements(agents)
+                empty = False
+        yield "[]" if empty else "\n]"
+
+    async def encode_pages(self, pages: AsyncIterable[Sequence[Agent]]) -> str:
+        # TextContent needs the whole document. CPython grows a str with no other
+        # references in place, so appending avoids a second copy of the document
+        # that joining a list of chunks would make
+        text = ""
+        async with contextlib.aclosing(self.iter_list(pages)) as stream:
+            async for chunk in stream:
+                text += chunk
+        return text
+
+    def _encode_elements(self, agents: Sequence[Agent]) -> str:
+        entries = self._entries
+        misses = 0
+        fragments = []
+        for agent in agents:
+            entry = entries.get(agent.version)
+            if entry is None:
+                entry, _ = self._lookup(agent)
+                misses += 1
+            else:
+                entries.move_to_end(agent.version)
+            if entry.element is None:
+                # JSON strings cannot hold raw newlines, so every newline is layout
+                entry.element = "  " + entry.document.replace("\n", "\n  ")
+            fragments.append(entry.element)
+        self._evict(len(agents) - misses, misses)
+        return ",\n".join(fragments)
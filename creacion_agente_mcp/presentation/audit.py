@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import IO, Any, Iterable, Optional
+
+from ..observability import ServerMetrics
+
+# (wall clock, tool, arguments, outcome, latency); arguments are hashed by the writer
+_Record = tuple[float, str, Any, str, float]
+
+def _encode(record: _Record) -> str:
+    at, tool, arguments, outcome, latency = record
+    project = arguments.get("projectName") if isinstance(arguments, dict) else None
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    return json.dumps(
+        {
+            "time": datetime.fromtimestamp(at, timezone.utc).isoformat(timespec="milliseconds"),
+            "tool": tool,
+            "project": project,
+            "args_sha256": hashlib.sha256(canonical.encode()).hexdigest(),
+            "outcome": outcome,
+            "latency_ms": round(latency * 1000, 3),
+            "pid": os.getpid(),
+        },
+        separators=(",", ":"),
+    )
+
+class AuditLog:
+    # Tool calls are queued without blocking and written in batches by a background
+    # task; when the queue is full new records are dropped and counted, so a slow
+    # disk never adds latency to tool calls
+    def __init__(
+        self,
+        path: str = "audit.jsonl",
+        tools: Iterable[str] = ("create_agent",),
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        max_bytes: int = 100 * 1024 * 1024,
+        backups: int = 5,
+        fsync: bool = False,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._path_template = path
+        self._path = path
+        self._tools = frozenset(tools)
+        self._queue: asyncio.Queue[_Record] = asyncio.Queue(max_queue)
+        self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._fsync = fsync
+        self._metrics = metrics or ServerMetrics()
+        self._file: Optional[IO[str]] = None
+        self._size = 0
+        self._task: Optional[asyncio.Task[None]] = None
+        self._writing: Optional[asyncio.Future[None]] = None
+
+    def record(self, tool: str, arguments: Any, outcome: str, latency: float) -> None:
+        if tool not in self._tools:
+            return
+        try:
+            self._queue.put_nowait((time.time(), tool, arguments, outcome, latency))
+        except asyncio.QueueFull:
+            self._metrics.audit_records.inc(outcome="dropped")
+
+    def start(self) -> None:
+        if self._task is None:
+            # Resolved in the process that writes, so pre-fork workers can use {pid}
+            self._path = self._path_template.format(pid=os.getpid())
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+        # Whatever is still queued is written before exit
+        await self._flush()
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for one record, then take everything else already queued
+            batch = [await self._queue.get()]
+            batch.extend(self._take(self._batch_size - 1))
+            # Shielded: a batch already handed to the thread is finished, not abandoned
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+
+    def _take(self, limit: int) -> list[_Record]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self) -> None:
+        while not self._queue.empty():
+            await self._write(self._take(self._batch_size))
+
+    async def _write(self, batch: list[_Record]) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            self._metrics.audit_records.inc(len(batch), outcome="failed")
+            print(f"Audit log write failed ({len(batch)} records lost): {e}", file=sys.stderr)
+            return
+        self._metrics.audit_records.inc(len(batch), outcome="written")
+        self._metrics.audit_write_duration.observe(time.perf_counter() - started)
+
+    def _write_batch(self, batch: list[_Record]) -> None:
+        # Runs in a worker thread: encoding, hashing and disk I/O stay off the loop
+        data = "".join(_encode(record) + "\n" for record in batch)
+        if self._file is None:
+            self._open()
+        elif self._max_bytes and self._size + len(data) > self._max_bytes and self._size:
+            self._rotate()
+        assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        # audit.jsonl -> audit.jsonl.1 -> ... -> audit.jsonl.<backups>, oldest removed
+        assert self._file is not None
+        file, self._file = self._file, None
+        file.close()
+        if self._backups > 0:
+            for index in range(self._backups - 1, 0, -1):
+                source = f"{self._path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self._path}.{index + 1}")
+            os.replace(self._path, f"{self._path}.1")
+        else:
+            os.remove(self._path)
+        self._open()
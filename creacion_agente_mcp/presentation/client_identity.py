@@ -0,0 +1,86 @@
+import hashlib
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Where the identity is kept for the rest of the request: scope["state"] is what
+# starlette exposes as request.state, and MCP handlers see that request
+_STATE_KEY = "client_identity"
+_SESSION_KEY = "client_session"
+
+def _hash_key(api_key: bytes) -> str:
+    return hashlib.sha256(api_key).hexdigest()
+
+def client_identity(scope: "Scope") -> Optional[str]:
+    return (scope.get("state") or {}).get(_STATE_KEY)
+
+def client_session(scope: "Scope") -> Optional[str]:
+    return (scope.get("state") or {}).get(_SESSION_KEY)
+
+class ClientIdentity:
+    # Clients are told apart by IP. Headers a client can choose freely never pick the
+    # identity on their own, or sending a new value per request would make a new client
+    # every time: an API key only counts when it is in api_keys. Sessions never do, as
+    # opening more of them is free; an SSE session id that issued_session confirms is
+    # kept apart for attribution only
+    def __init__(
+        self,
+        api_key_header: str = "x-api-key",
+        trust_forwarded_for: bool = False,
+        api_keys: Iterable[str] = (),
+        issued_session: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        self._api_key_header = api_key_header.lower().encode("latin-1")
+        self._trust_forwarded_for = trust_forwarded_for
+        # Only hashes are kept in memory, never the raw keys
+        self._api_keys = frozenset(_hash_key(key.encode("latin-1")) for key in api_keys)
+        self._issued_session = issued_session
+
+    def __call__(self, scope: "Scope") -> str:
+        # Worked out once per request and stored in its scope
+        state = scope.setdefault("state", {})
+        identity = state.get(_STATE_KEY)
+        if identity is None:
+            identity = state[_STATE_KEY] = self._identify(scope)
+            session_id = self._session(scope)
+            if session_id is not None:
+                state[_SESSION_KEY] = session_id
+        return identity
+
+    def _identify(self, scope: "Scope") -> str:
+        headers = dict(scope.get("headers") or [])
+        api_key = headers.get(self._api_key_header)
+        if api_key and self._api_keys:
+            digest = _hash_key(api_key)
+            if digest in self._api_keys:
+                return "key:" + digest[:32]
+
+        if self._trust_forwarded_for and b"x-forwarded-for" in headers:
+            ip = headers[b"x-forwarded-for"].split(b",")[0].strip().decode("latin-1")
+        else:
+            client = scope.get("client")
+            ip = client[0] if client else "unknown"
+        return "ip:" + ip
+
+    def _session(self, scope: "Scope") -> Optional[str]:
+        if self._issued_session is None:
+            return None
+        # SSE posts carry the session in the query string
+        for part in scope.get("query_string", b"").split(b"&"):
+            if part.startswith(b"session_id="):
+                session_id = part[len(b"session_id=") :].decode("latin-1")
+                return session_id if self._issued_session(session_id) else None
+        return None
+
+class ClientIdentityMiddleware:
+    # Identifies every HTTP request up front, so admission control and the rate limiter
+    # key on the same client whatever session the transport creates for the request
+    def __init__(self, app: "ASGIApp", identity: ClientIdentity) -> None:
+        self._app = app
+        self._identity = identity
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] == "http":
+            self._identity(scope)
+        await self._app(scope, receive, send)
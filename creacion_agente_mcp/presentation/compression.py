@@ -0,0 +1,212 @@
+import asyncio
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
+
+from ..observability import ServerMetrics
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Fast levels: responses are dynamic, so every one is compressed on the fly
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Larger chunks are compressed in a worker thread; all three codecs release the GIL
+_THREAD_THRESHOLD = 256 * 1024
+
+class Compressor:
+    # One encoder per response: compress(data, flush=True) returns everything needed
+    # to decode data so far, which an event stream needs after every event
+    def __init__(self, encoding: str, level: Optional[int] = None) -> None:
+        level = DEFAULT_LEVELS[encoding] if level is None else level
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._encoder: Any = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            import brotli
+
+            self._encoder = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            import zstandard
+
+            self._encoder = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self.encoding == "gzip":
+            out = self._encoder.compress(data)
+            return out + self._encoder.flush(zlib.Z_SYNC_FLUSH) if flush else out
+        if self.encoding == "br":
+            out = self._encoder.process(data)
+            return out + self._encoder.flush() if flush else out
+        out = self._encoder.compress(data)
+        if flush:
+            import zstandard
+
+            out += self._encoder.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return out
+
+    def finish(self) -> bytes:
+        if self.encoding == "gzip":
+            return self._encoder.flush(zlib.Z_FINISH)
+        if self.encoding == "br":
+            return self._encoder.finish()
+        return self._encoder.flush()
+
+def available_encodings(preferred: Iterable[str] = ("zstd", "br", "gzip")) -> tuple[str, ...]:
+    # brotli and zstandard are optional (pip install .[compression]); gzip is always there
+    available = []
+    for encoding in preferred:
+        try:
+            Compressor(encoding)
+        except (ImportError, ValueError):
+            continue
+        available.append(encoding)
+    return tuple(available)
+
+def negotiate(accept_encoding: str, offered: Iterable[str]) -> Optional[str]:
+    # The server's preference wins among the encodings the client accepts (q > 0)
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in offered:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+class CompressionMiddleware:
+    # Compresses responses for clients that send Accept-Encoding. Responses smaller
+    # than min_size are sent as they are; event streams (SSE) are compressed as a
+    # whole and flushed after every event, so repeated keys across events compress
+    # too without delaying any of them
+    def __init__(
+        self,
+        app: "ASGIApp",
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        min_size: int = 1024,
+        levels: Optional[Mapping[str, int]] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._app = app
+        self._encodings = available_encodings(encodings)
+        self._min_size = min_size
+        self._levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self._metrics = metrics or ServerMetrics()
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+        accept = b""
+        for name, value in scope.get("headers") or ():
+            if name == b"accept-encoding":
+                accept = value
+                break
+        encoding = negotiate(accept.decode("latin-1"), self._encodings) if accept else None
+        if encoding is None:
+            await self._app(scope, receive, send)
+            return
+        responder = _CompressingResponder(
+            send, encoding, self._levels[encoding], self._min_size, self._metrics
+        )
+        await self._app(scope, receive, responder.send)
+
+class _CompressingResponder:
+    def __init__(
+        self, send: "Send", encoding: str, level: int, min_size: int, metrics: ServerMetrics
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._level = level
+        self._min_size = min_size
+        self._metrics = metrics
+        self._start: Optional["Message"] = None
+        self._buffered: list[bytes] = []
+        self._size = 0
+        self._compressor: Optional[Compressor] = None
+        self._stream = False
+        self._passthrough = False
+
+    async def send(self, message: "Message") -> None:
+        if self._passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            headers = message.get("headers") or []
+            content_type = b""
+            for name, value in headers:
+                if name.lower() == b"content-encoding":
+                    self._passthrough = True
+                elif name.lower() == b"content-type":
+                    content_type = value
+            if self._passthrough:
+                await self._send(message)
+                return
+            self._start = message
+            if content_type.startswith(b"text/event-stream"):
+                self._stream = True
+                await self._begin()
+        elif message["type"] != "http.response.body":
+            await self._send(message)
+        elif self._compressor is not None:
+            await self._body(message.get("body", b""), message.get("more_body", False))
+        else:
+            await self._buffer(message)
+
+    async def _buffer(self, message: "Message") -> None:
+        # Held until min_size is reached or the response ends, whichever comes first
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if body:
+            self._buffered.append(body)
+            self._size += len(body)
+        if self._size >= self._min_size:
+            await self._begin()
+            buffered, self._buffered = b"".join(self._buffered), []
+            await self._body(buffered, more_body)
+            return
+        if more_body:
+            return
+        assert self._start is not None
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": b"".join(self._buffered)})
+
+    async def _begin(self) -> None:
+        assert self._start is not None
+        headers = [
+            (name, value)
+            for name, value in self._start.get("headers") or []
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"content-encoding", self._encoding.encode()))
+        headers.append((b"vary", b"accept-encoding"))
+        self._compressor = Compressor(self._encoding, self._level)
+        await self._send({**self._start, "headers": headers})
+
+    async def _body(self, body: bytes, more_body: bool) -> None:
+        assert self._compressor is not None
+        compressor = self._compressor
+        started = time.perf_counter()
+        if len(body) >= _THREAD_THRESHOLD:
+            out = await asyncio.to_thread(compressor.compress, body, self._stream)
+        else:
+            out = compressor.compress(body, self._stream)
+        if not more_body:
+            out += compressor.finish()
+        labels = {"encoding": self._encoding}
+        self._metrics.compression_seconds.inc(time.perf_counter() - started, **labels)
+        self._metrics.compression_bytes.inc(len(body), stage="input", **labels)
+        self._metrics.compression_bytes.inc(len(out), stage="output", **labels)
+        if out or not more_body:
+            await self._send({"type": "http.response.body", "body": out, "more_body": more_body})
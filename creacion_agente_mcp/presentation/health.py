@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from ..observability import MetricsRegistry
+
+if TYPE_CHECKING:
+    from starlette.routing import Route
+
+class ReadinessProbe:
+    def __init__(self, cache_ttl: float = 10.0, timeout: float = 5.0) -> None:
+        self._checks: dict[str, Callable[[], Awaitable[None]]] = {}
+        self._cache_ttl = cache_ttl
+        self._timeout = timeout
+        self._lock = asyncio.Lock()
+        self._last_result: tuple[bool, dict[str, str]] | None = None
+        self._checked_at = 0.0
+        self._draining = False
+        self._warming = False
+
+    def add_check(self, name: str, check: Callable[[], Awaitable[None]]) -> None:
+        self._checks[name] = check
+
+    def reconfigure(self, cache_ttl: float, timeout: float) -> None:
+        self._cache_ttl = cache_ttl
+        self._timeout = timeout
+        # Re-check with the new settings, e.g. after rotating credentials
+        self._last_result = None
+
+    def set_draining(self) -> None:
+        # Bypasses the cache so the pod leaves the load balancer right away
+        self._draining = True
+
+    def set_warming(self, warming: bool) -> None:
+        # Held not-ready while startup prewarm runs, so traffic arrives to a warm pod
+        self._warming = warming
+
+    async def _run_check(self, check: Callable[[], Awaitable[None]]) -> str:
+        try:
+            await asyncio.wait_for(check(), timeout=self._timeout)
+            return "ok"
+        except asyncio.TimeoutError:
+            return f"timeout after {self._timeout}s"
+        except Exception as e:
+            return f"error: {e}"
+
+    async def check(self) -> tuple[bool, dict[str, str]]:
+        if self._draining:
+            return False, {"lifecycle": "draining"}
+        if self._warming:
+            return False, {"lifecycle": "prewarming"}
+        # Probes arrive every few seconds per pod; cache so they don't hammer Foundry
+        async with self._lock:
+            if self._last_result and time.monotonic() - self._checked_at < self._cache_ttl:
+                return self._last_result
+
+            names = list(self._checks)
+            outcomes = await asyncio.gather(*(self._run_check(self._checks[n]) for n in names))
+            results = dict(zip(names, outcomes))
+            self._last_result = (all(r == "ok" for r in outcomes), results)
+            self._checked_at = time.monotonic()
+            return self._last_result
+
+def build_health_routes(registry: MetricsRegistry, readiness: ReadinessProbe) -> list["Route"]:
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse, Response
+    from starlette.routing import Route
+
+    async def healthz(request: Request) -> Response:
+        return JSONResponse({"status": "ok"})
+
+    async def readyz(request: Request) -> Response:
+        ready, checks = await readiness.check()
+        return JSONResponse(
+            {"status": "ready" if ready else "not_ready", "checks": checks},
+            status_code=200 if ready else 503,
+        )
+
+    async def metrics(request: Request) -> Response:
+        return PlainTextResponse(
+            registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    return [
+        Route("/healthz", endpoint=healthz),
+        Route("/readyz", endpoint=readyz),
+        Route("/metrics", endpoint=metrics),
+    ]
@@ -0,0 +1,182 @@
+import asyncio
+import contextlib
+import inspect
+import signal
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+from ..observability import ServerMetrics
+from .admission import ServerOverloadedException
+from .health import ReadinessProbe
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+class ShutdownReport:
+    def __init__(
+        self,
+        drained: int = 0,
+        aborted: int = 0,
+        rejected: int = 0,
+        duration: float = 0.0,
+        cleanup_errors: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.drained = drained
+        self.aborted = aborted
+        self.rejected = rejected
+        self.duration = duration
+        self.cleanup_errors = cleanup_errors or {}
+
+    def __str__(self) -> str:
+        summary = (
+            f"{self.drained} drained, {self.aborted} aborted, {self.rejected} rejected "
+            f"in {self.duration:.2f}s"
+        )
+        if self.cleanup_errors:
+            failures = ", ".join(f"{name}: {error}" for name, error in self.cleanup_errors.items())
+            summary += f" (cleanup failed: {failures})"
+        return summary
+
+class LifecycleManager:
+    def __init__(
+        self,
+        drain_timeout: float = 20.0,
+        abort_timeout: float = 5.0,
+        retry_after: float = 1.0,
+        readiness: Optional[ReadinessProbe] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self.drain_timeout = drain_timeout
+        self.abort_timeout = abort_timeout
+        self._retry_after = retry_after
+        self._readiness = readiness
+        self._metrics = metrics or ServerMetrics()
+        self._calls: set[asyncio.Task[Any]] = set()
+        self._aborting: set[asyncio.Task[Any]] = set()
+        self._cleanups: list[tuple[str, Callable[[], Any]]] = []
+        self._draining = False
+        self._shutdown_task: Optional[asyncio.Task[None]] = None
+        self._report = ShutdownReport()
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @property
+    def report(self) -> ShutdownReport:
+        return self._report
+
+    def reconfigure(self, drain_timeout: float, abort_timeout: float, retry_after: float) -> None:
+        # Read when the drain starts, so a reload during shutdown no longer applies
+        self.drain_timeout = drain_timeout
+        self.abort_timeout = abort_timeout
+        self._retry_after = retry_after
+
+    def add_cleanup(self, name: str, cleanup: Callable[[], Any]) -> None:
+        # Run once, in registration order, after the server has stopped
+        self._cleanups.append((name, cleanup))
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator[None]:
+        if self._draining:
+            self._report.rejected += 1
+            raise ServerOverloadedException("shutting_down", self._retry_after)
+        task = asyncio.current_task()
+        if task is None:
+            yield
+            return
+        self._calls.add(task)
+        try:
+            yield
+        finally:
+            self._calls.discard(task)
+
+    def was_aborted(self, task: Optional[asyncio.Task[Any]] = None) -> bool:
+        return (task or asyncio.current_task()) in self._aborting
+
+    def install_signal_handlers(self, stop: Callable[[], None]) -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                loop.add_signal_handler(signum, self.begin_shutdown, stop)
+
+    def begin_shutdown(self, stop: Callable[[], None]) -> None:
+        if self._shutdown_task is None:
+            print("Shutdown requested, draining in-flight tool calls", file=sys.stderr)
+            self._shutdown_task = asyncio.get_running_loop().create_task(self.drain(stop))
+
+    async def drain(self, stop: Callable[[], None]) -> ShutdownReport:
+        started = time.monotonic()
+        self._draining = True
+        if self._readiness is not None:
+            self._readiness.set_draining()
+
+        in_flight = set(self._calls)
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=self.drain_timeout)
+
+        pending = set(self._calls)
+        self._aborting.update(pending)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending, timeout=self.abort_timeout)
+
+        self._report.aborted = len(pending)
+        self._report.drained = len(in_flight - pending)
+        self._report.duration = time.monotonic() - started
+        self._metrics.shutdown_calls.inc(self._report.drained, outcome="drained")
+        self._metrics.shutdown_calls.inc(self._report.aborted, outcome="aborted")
+        stop()
+        return self._report
+
+    async def cleanup(self) -> ShutdownReport:
+        cleanups, self._cleanups = self._cleanups, []
+        for name, cleanup in cleanups:
+            try:
+                result = cleanup()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, timeout=self.abort_timeout)
+            except Exception as e:
+                self._report.cleanup_errors[name] = str(e) or type(e).__name__
+        if self._shutdown_task is not None:
+            print(f"Shutdown complete: {self._report}", file=sys.stderr)
+        return self._report
+
+class LifecycleMiddleware:
+    # Refuses requests that would open new sessions once draining has started;
+    # existing SSE sessions keep their message endpoint until the server stops
+    def __init__(
+        self, app: "ASGIApp", lifecycle: LifecycleManager, session_paths: tuple[str, ...]
+    ) -> None:
+        self._app = app
+        self._lifecycle = lifecycle
+        self._session_paths = session_paths
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if (
+            scope["type"] == "http"
+            and self._lifecycle.draining
+            and scope["path"] in self._session_paths
+        ):
+            body = b'{"error": "server is shutting down"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", b"1"),
+                        (b"connection", b"close"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self._app(scope, receive, send)
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Optional
+
+from ..observability import ServerMetrics
+
+# A loop blocked on every tick would otherwise log a stack every interval
+_LOG_COOLDOWN = 1.0
+
+def _blocking_stack(frame: FrameType) -> str:
+    # Frames above the handle the loop is running are the same for every block
+    stack = traceback.extract_stack(frame)
+    for index in range(len(stack) - 1, -1, -1):
+        if stack[index].name == "_run" and stack[index].filename.endswith("events.py"):
+            stack = traceback.StackSummary.from_list(stack[index + 1 :])
+            break
+    return "".join(stack.format()).rstrip("\n")
+
+class LoopMonitor:
+    # Measures event-loop lag with a periodic tick and, from a watchdog thread, grabs
+    # the loop thread's stack while a tick is overdue: the code that blocks the loop
+    # is still on that stack, which it no longer is once the loop can run again
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._interval = interval
+        self._threshold = threshold
+        self._metrics = metrics or ServerMetrics()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Monotonic time the next tick is due; the watchdog only reads it
+        self._due = 0.0
+        self._reported_due = 0.0
+        self._logged_at = -_LOG_COOLDOWN
+
+    def reconfigure(self, interval: float, threshold: float) -> None:
+        self._interval = interval
+        self._threshold = threshold
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._due = time.monotonic() + self._interval
+        self._task = loop.create_task(self._tick())
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(loop, threading.get_ident()),
+            name="loop-monitor",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _tick(self) -> None:
+        while True:
+            interval = self._interval
+            self._due = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.monotonic() - self._due)
+            self._metrics.loop_lag.observe(lag)
+            if lag >= self._threshold:
+                self._metrics.loop_blocked.inc()
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        while not self._stopped.wait(self._threshold / 2):
+            due = self._due
+            overdue = time.monotonic() - due
+            if overdue < self._threshold or due == self._reported_due:
+                continue
+            # One report per blocked tick, taken while the loop is still stuck
+            self._reported_due = due
+            frame = sys._current_frames().get(loop_thread)
+            now = time.monotonic()
+            if frame is None or now - self._logged_at < _LOG_COOLDOWN:
+                continue
+            self._logged_at = now
+            task = asyncio.current_task(loop)
+            where = f" in task {task.get_name()}" if task is not None else ""
+            print(
+                f"Event loop blocked for at least {overdue * 1000:.0f}ms{where}:\n"
+                f"{_blocking_stack(frame)}",
+                file=sys.stderr,
+            )
@@ -1,13 +1,30 @@
+import asyncio
+import contextlib
+import functools
 import json
-from typing import Any
+import os
+import socket
+import stat
+import sys
+import time
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Hashable,
+    Iterable,
+    Optional,
+    Sequence,
+)
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import CallToolResult, Tool, TextContent
 from pydantic import ValidationError
-import uvicorn
-from starlette.applications import Starlette
-from starlette.routing import Route
 
 from ..application.use_cases import (
     CreateAgentUseCase,
@@ -15,27 +32,154 @@ from ..application.use_cases import (
     GetAgentUseCase,
     ListAgentsUseCase,
 )
-from ..domain.value_objects import AIModel, AIModelProvider
-from ..domain.exceptions import DomainException
+from ..domain.value_objects import AIModel, AIModelInfo, AIModelProvider
+from ..application.deadline import DeadlinePolicy, deadline_scope
+from ..domain.exceptions import DomainException, DeadlineExceededException
+from ..domain.repositories import IModelCatalogProvider
 from ..infrastructure.azure import AzureFoundryClient
+from ..observability import NoopTracer, ServerMetrics, Tracer
+from .agent_encoder import AgentEncoder
+from .audit import AuditLog
+from .client_identity import (
+    ClientIdentity,
+    ClientIdentityMiddleware,
+    client_identity,
+    client_session,
+)
+from .compression import CompressionMiddleware
+from .admission import AdmissionController, ServerOverloadedException
+from .health import ReadinessProbe, build_health_routes
+from .lifecycle import LifecycleManager, LifecycleMiddleware
+from .loop_monitor import LoopMonitor
+from .prewarm import Prewarmer
+from .profiling import Profiler, build_profiling_routes
+from .settings_reload import SettingsManager
+from .rate_limit import WRITE_TOOLS, RateLimiter, RateLimitMiddleware
+from .response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.routing import Route
+    from starlette.types import ASGIApp, Receive, Scope, Send
 
 class MCPServer:
+    _TOOL_NAMES = frozenset(
+        {"create_agent", "get_agent", "list_agents", "list_models", "list_projects"}
+    )
+
     def __init__(
         self,
         create_agent_use_case: CreateAgentUseCase,
         get_agent_use_case: GetAgentUseCase,
         list_agents_use_case: ListAgentsUseCase,
         azure_client: AzureFoundryClient,
+        metrics: Optional[ServerMetrics] = None,
+        readiness: Optional[ReadinessProbe] = None,
+        tracer: Optional[Tracer] = None,
+        deadline_policy: Optional[DeadlinePolicy] = None,
+        admission: Optional[AdmissionController] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_api_key_header: str = "x-api-key",
+        rate_limit_trust_forwarded_for: bool = False,
+        rate_limit_api_keys: Iterable[str] = (),
+        compression_encodings: Sequence[str] = ("zstd", "br", "gzip"),
+        compression_min_size: int = 1024,
+        compression_levels: Optional[dict[str, int]] = None,
+        lifecycle: Optional[LifecycleManager] = None,
+        response_cache: Optional[ResponseCache] = None,
+        model_catalog: Optional[IModelCatalogProvider] = None,
+        agent_encoder: Optional[AgentEncoder] = None,
+        prewarmer: Optional[Prewarmer] = None,
+        settings_manager: Optional[SettingsManager] = None,
+        profiler: Optional[Profiler] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
+        audit_log: Optional[AuditLog] = None,
     ) -> None:
         self._create_agent_use_case = create_agent_use_case
         self._get_agent_use_case = get_agent_use_case
         self._list_agents_use_case = list_agents_use_case
         self._azure_client = azure_client
+        self._metrics = metrics or ServerMetrics()
+        self._readiness = readiness or ReadinessProbe()
+        self._tracer = tracer or NoopTracer()
+        self._deadline_policy = deadline_policy or DeadlinePolicy()
+        # None disables admission control (stdio has a single client)
+        self._admission = admission
+        self._rate_limiter = rate_limiter
+        self._rate_limit_api_key_header = rate_limit_api_key_header
+        self._rate_limit_trust_forwarded_for = rate_limit_trust_forwarded_for
+        self._rate_limit_api_keys = tuple(rate_limit_api_keys)
+        # An empty sequence disables response compression
+        self._compression_encodings = tuple(compression_encodings)
+        self._compression_min_size = compression_min_size
+        self._compression_levels = compression_levels
+        self._lifecycle = lifecycle or LifecycleManager(
+            readiness=self._readiness, metrics=self._metrics
+        )
+        self._response_cache = response_cache
+        self._model_catalog = model_catalog
+        self._agent_encoder = agent_encoder or AgentEncoder(metrics=self._metrics)
+        self._prewarmer = prewarmer
+        self._settings_manager = settings_manager
+        self._profiler = profiler
+        self._loop_monitor = loop_monitor
+        self._audit_log = audit_log
         self._server = Server("creacion-agente-mcp")
 
         self._server.list_tools()(self._list_tools)
         self._server.call_tool()(self._call_tool)
 
+    @property
+    def metrics(self) -> ServerMetrics:
+        return self._metrics
+
+    @property
+    def tracer(self) -> Tracer:
+        return self._tracer
+
+    @property
+    def lifecycle(self) -> LifecycleManager:
+        return self._lifecycle
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        return self._response_cache
+
+    @property
+    def prewarmer(self) -> Optional[Prewarmer]:
+        return self._prewarmer
+
+    @property
+    def settings_manager(self) -> Optional[SettingsManager]:
+        return self._settings_manager
+
+    @property
+    def profiler(self) -> Optional[Profiler]:
+        return self._profiler
+
+    @property
+    def loop_monitor(self) -> Optional[LoopMonitor]:
+        return self._loop_monitor
+
+    @property
+    def audit_log(self) -> Optional[AuditLog]:
+        return self._audit_log
+
+    def _start_background(self) -> None:
+        if self._loop_monitor is not None:
+            self._loop_monitor.start()
+        if self._prewarmer is not None:
+            self._prewarmer.start()
+        if self._settings_manager is not None:
+            self._settings_manager.start()
+        if self._profiler is not None:
+            self._profiler.start()
+        if self._response_cache is not None:
+            self._response_cache.start()
+        if self._audit_log is not None:
+            self._audit_log.start()
+
     async def _list_tools(self) -> list[Tool]:
         return [
             Tool(
@@ -143,6 +287,10 @@ class MCPServer:
                 inputSchema={
                     "type": "object",
                     "properties": {
+                        "projectName": {
+                            "type": "string",
+                            "description": "Si se indica, lista solo los modelos desplegados en ese proyecto",
+                        },
                         "provider": {
                             "type": "string",
                             "description": "Filtrar por proveedor específico (opcional)",
@@ -155,6 +303,28 @@ class MCPServer:
                                 "google",
                             ],
                         },
+                        "supportsTools": {
+                            "type": "boolean",
+                            "description": "Solo modelos con (true) o sin (false) soporte de herramientas",
+                        },
+                        "supportsVision": {
+                            "type": "boolean",
+                            "description": "Solo modelos con (true) o sin (false) soporte de visión",
+                        },
+                        "minMaxTokens": {
+                            "type": "integer",
+                            "description": "Contexto mínimo en tokens, p. ej. 128000",
+                        },
+                        "sortBy": {
+                            "type": "string",
+                            "description": "Orden de los resultados (default: catalog)",
+                            "enum": ["catalog", "name", "maxTokens"],
+                        },
+                        "order": {
+                            "type": "string",
+                            "description": "Dirección del orden (default: asc)",
+                            "enum": ["asc", "desc"],
+                        },
                     },
                 },
             ),
@@ -168,28 +338,160 @@ class MCPServer:
             ),
         ]
 
-    async def _call_tool(self, name: str, arguments: Any) -> list[TextContent]:
+    async def _call_tool(self, name: str, arguments: Any) -> list[TextContent] | CallToolResult:
+        tool = name if name in self._TOOL_NAMES else "unknown"
+        status = "error"
+        retry_after: Optional[float] = None
+        started = time.perf_counter()
+        budget = self._deadline_policy.budget_for(name, self._requested_deadline())
+        self._metrics.tool_calls_in_flight.inc()
+
+        with self._tracer.start_span(
+            "MCPServer.call_tool", {"mcp.tool": tool, "mcp.deadline_seconds": budget}
+        ) as span:
+            if isinstance(arguments, dict) and arguments.get("projectName"):
+                span.set_attribute("foundry.project", str(arguments["projectName"]))
+            scope = self._request_scope()
+            if scope is not None:
+                # Attribution only: the SSE session never feeds rate limits or admission
+                for key, value in (
+                    ("mcp.client", client_identity(scope)),
+                    ("mcp.session", client_session(scope)),
+                ):
+                    if value:
+                        span.set_attribute(key, value)
+            try:
+                # The scope hands the remaining budget to every upstream request;
+                # the timeout cancels whatever is still running when it runs out
+                with deadline_scope(budget), self._watch_call(tool):
+                    async with asyncio.timeout(budget):
+                        with self._lifecycle.track():
+                            async with self._admit(tool):
+                                result = await self._dispatch_tool(name, arguments)
+                status = "ok" if tool != "unknown" else "error"
+
+            except ServerOverloadedException as e:
+                status = "rejected"
+                retry_after = e.retry_after
+                result = [TextContent(type="text", text=f"Error: {str(e)}")]
+            except (TimeoutError, DeadlineExceededException):
+                status = "deadline_exceeded"
+                self._metrics.tool_deadline_exceeded.inc(tool=tool)
+                result = [
+                    TextContent(type="text", text=f"Error: {DeadlineExceededException(budget)}")
+                ]
+            except asyncio.CancelledError:
+                if not self._lifecycle.was_aborted():
+                    # notifications/cancelled from the client cancels the request task
+                    status = "cancelled"
+                    self._metrics.tool_cancelled.inc(tool=tool)
+                    span.set_attribute("mcp.status", status)
+                    raise
+                # Still running when the shutdown drain ran out; the client may retry elsewhere
+                asyncio.current_task().uncancel()  # type: ignore[union-attr]
+                status = "aborted"
+                retry_after = 0.0
+                result = [TextContent(type="text", text="Error: Server shutting down, retry")]
+            except ValidationError as e:
+                status = "invalid"
+                errors = ", ".join([f"{err['loc'][0]}: {err['msg']}" for err in e.errors()])
+                result = [TextContent(type="text", text=f"Validation error: {errors}")]
+            except DomainException as e:
+                result = [TextContent(type="text", text=f"Error: {str(e)}")]
+            except Exception as e:
+                result = [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                elapsed = time.perf_counter() - started
+                self._metrics.tool_calls_in_flight.dec()
+                self._metrics.tool_calls.inc(tool=tool, status=status)
+                self._metrics.tool_call_duration.observe(elapsed, tool=tool)
+                if self._audit_log is not None:
+                    self._audit_log.record(tool, arguments, status, elapsed)
+
+            span.set_attributes(
+                {
+                    "mcp.status": status,
+                    "payload.response_bytes": sum(len(content.text) for content in result),
+                }
+            )
+            if status != "ok":
+                span.set_status("error", result[0].text)
+            if retry_after is not None:
+                # A tool result with isError, not a JSON-RPC error, carrying retry hints
+                # in _meta so clients can back off and retry
+                return CallToolResult(
+                    content=result,
+                    isError=True,
+                    _meta={"retryable": True, "retryAfterMs": int(retry_after * 1000)},
+                )
+            return result
+
+    def _watch_call(self, tool: str) -> ContextManager[None]:
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.watch_call(tool)
+
+    def _admit(self, tool: str) -> AsyncContextManager[None]:
+        if self._admission is None:
+            return contextlib.nullcontext()
         try:
-            if name == "create_agent":
-                return await self._handle_create_agent(arguments)
-            elif name == "get_agent":
-                return await self._handle_get_agent(arguments)
-            elif name == "list_agents":
-                return await self._handle_list_agents(arguments)
-            elif name == "list_models":
-                return await self._handle_list_models(arguments)
-            elif name == "list_projects":
-                return await self._handle_list_projects(arguments)
-            else:
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
-
-        except ValidationError as e:
-            errors = ", ".join([f"{err['loc'][0]}: {err['msg']}" for err in e.errors()])
-            return [TextContent(type="text", text=f"Validation error: {errors}")]
-        except DomainException as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
+            context = self._server.request_context
+        except LookupError:
+            return self._admission.admit(tool, None)
+        # Over HTTP the client identity stored on the request: stateless streamable-http
+        # creates a ServerSession per request, so sessions cannot tell clients apart
+        scope = self._request_scope()
+        client: Optional[Hashable] = None
+        if scope is not None:
+            client = client_identity(scope)
+        return self._admission.admit(tool, client or context.session)
+
+    def _request_scope(self) -> Optional[dict[str, Any]]:
+        # The ASGI scope of the HTTP request behind the call; None on stdio
+        try:
+            request = self._server.request_context.request
+        except LookupError:
+            return None
+        return getattr(request, "scope", None)
+
+    def _requested_deadline(self) -> Optional[float]:
+        # Clients may send {"_meta": {"deadlineMs": ...}} with tools/call
+        try:
+            meta = self._server.request_context.meta
+        except LookupError:
+            return None
+        deadline_ms = getattr(meta, "deadlineMs", None) if meta else None
+        if isinstance(deadline_ms, (int, float)) and not isinstance(deadline_ms, bool):
+            return deadline_ms / 1000.0
+        return None
+
+    async def _dispatch_tool(self, name: str, arguments: Any) -> list[TextContent]:
+        cache = self._response_cache
+        if cache is not None and cache.caches(name) and name not in WRITE_TOOLS:
+
+            async def load() -> str:
+                return (await self._dispatch_uncached(name, arguments))[0].text
+
+            return await cache.get_or_load(name, arguments, load)
+        result = await self._dispatch_uncached(name, arguments)
+        if cache is not None and name in WRITE_TOOLS:
+            # The new agent must show up in the next listing of its project
+            cache.invalidate("list_agents", project=arguments.get("projectName"))
+        return result
+
+    async def _dispatch_uncached(self, name: str, arguments: Any) -> list[TextContent]:
+        if name == "create_agent":
+            return await self._handle_create_agent(arguments)
+        elif name == "get_agent":
+            return await self._handle_get_agent(arguments)
+        elif name == "list_agents":
+            return await self._handle_list_agents(arguments)
+        elif name == "list_models":
+            return await self._handle_list_models(arguments)
+        elif name == "list_projects":
+            return await self._handle_list_projects(arguments)
+        else:
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
     async def _handle_create_agent(self, arguments: dict[str, Any]) -> list[TextContent]:
         dto_data = {
@@ -209,10 +511,11 @@ class MCPServer:
 
         dto_data = {k: v for k, v in dto_data.items() if v is not None}
 
-        dto = CreateAgentDTO(**dto_data)
+        with self._tracer.start_span("MCPServer.validate_arguments", {"mcp.tool": "create_agent"}):
+            dto = CreateAgentDTO(**dto_data)
         agent = await self._create_agent_use_case.execute(dto)
 
-        return [TextContent(type="text", text=json.dumps(agent.to_dict(), indent=2))]
+        return [TextContent(type="text", text=self._agent_encoder.encode(agent))]
 
     async def _handle_get_agent(self, arguments: dict[str, Any]) -> list[TextContent]:
         project_name = arguments.get("projectName")
@@ -223,7 +526,7 @@ class MCPServer:
 
         agent = await self._get_agent_use_case.execute(project_name, agent_id)
 
-        return [TextContent(type="text", text=json.dumps(agent.to_dict(), indent=2))]
+        return [TextContent(type="text", text=self._agent_encoder.encode(agent))]
 
     async def _handle_list_agents(self, arguments: dict[str, Any]) -> list[TextContent]:
         project_name = arguments.get("projectName")
@@ -231,37 +534,34 @@ class MCPServer:
         if not project_name:
             raise ValueError("projectName is required")
 
-        agents = await self._list_agents_use_case.execute(project_name)
-        agents_dict = [agent.to_dict() for agent in agents]
+        # Encoded page by page: agents are dropped as soon as their page is encoded
+        pages = self._list_agents_use_case.stream(project_name)
+        async with contextlib.aclosing(pages):
+            text = await self._agent_encoder.encode_pages(pages)
 
-        return [TextContent(type="text", text=json.dumps(agents_dict, indent=2))]
+        return [TextContent(type="text", text=text)]
 
     async def _handle_list_models(self, arguments: dict[str, Any]) -> list[TextContent]:
         provider_str = arguments.get("provider")
+        min_max_tokens = arguments.get("minMaxTokens")
+        if min_max_tokens is not None and not isinstance(min_max_tokens, (int, float)):
+            raise ValueError("minMaxTokens must be a number")
 
-        if provider_str:
-            provider = AIModelProvider(provider_str)
-            models = AIModel.get_models_by_provider(provider)
-        else:
-            models = AIModel.get_all_models()
-
-        result = {
-            "total": len(models),
-            "models": [
-                {
-                    "model": model_name,
-                    "displayName": info.display_name,
-                    "provider": info.provider.value,
-                    "description": info.description,
-                    "maxTokens": info.max_tokens,
-                    "supportsTools": info.supports_tools,
-                    "supportsVision": info.supports_vision,
-                }
-                for model_name, info in models.items()
-            ],
-        }
+        catalog = AIModel.catalog()
+        project_name = arguments.get("projectName")
+        if project_name and self._model_catalog is not None:
+            catalog = await self._model_catalog.get_catalog(project_name) or catalog
+
+        models = catalog.query(
+            provider=AIModelProvider(provider_str) if provider_str else None,
+            supports_tools=_optional_bool(arguments.get("supportsTools"), "supportsTools"),
+            supports_vision=_optional_bool(arguments.get("supportsVision"), "supportsVision"),
+            min_max_tokens=int(min_max_tokens) if min_max_tokens is not None else None,
+            sort=arguments.get("sortBy") or "catalog",
+            descending=arguments.get("order") == "desc",
+        )
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_encode_model_list(models))]
 
     async def _handle_list_projects(self, arguments: dict[str, Any]) -> list[TextContent]:
         projects = await self._azure_client.list_projects()
@@ -280,31 +580,242 @@ class MCPServer:
             ],
         }
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
 
     async def run_stdio(self) -> None:
-        async with stdio_server() as (read_stream, write_stream):
-            await self._server.run(read_stream, write_stream, self._server.create_initialization_options())
+        task = asyncio.current_task()
+        assert task is not None
+        self._lifecycle.install_signal_handlers(task.cancel)
+        self._start_background()
+        stdin = await _PipeLines.open_stdin()
+        try:
+            async with stdio_server(stdin=stdin) as (read_stream, write_stream):  # type: ignore[arg-type]
+                await self._server.run(read_stream, write_stream, self._server.create_initialization_options())
+        except asyncio.CancelledError:
+            if not self._lifecycle.draining:
+                raise
+        finally:
+            if stdin is not None:
+                stdin.close()
+
+    # HTTP transports import starlette and uvicorn on demand, so stdio sessions
+    # launched by desktop clients start without them
+    def build_http_app(self, transport: str) -> "Starlette":
+        if transport == "sse":
+            return self._build_sse_app()
+        elif transport == "streamable-http":
+            return self._build_streamable_http_app()
+        else:
+            raise ValueError(f"Unsupported HTTP transport: {transport}")
 
-    async def run_sse(self, host: str = "0.0.0.0", port: int = 8000) -> None:
+    def _health_routes(self) -> list["Route"]:
+        routes = build_health_routes(self._metrics.registry, self._readiness)
+        if self._profiler is not None:
+            routes.extend(build_profiling_routes(self._profiler))
+        return routes
+
+    def _middleware(
+        self,
+        session_paths: tuple[str, ...],
+        issued_session: Optional[Callable[[str], bool]] = None,
+    ) -> list["Middleware"]:
+        from starlette.middleware import Middleware
+
+        middleware = []
+        if self._compression_encodings:
+            # Outermost, so error responses from the other middleware are covered too
+            middleware.append(
+                Middleware(
+                    CompressionMiddleware,
+                    encodings=self._compression_encodings,
+                    min_size=self._compression_min_size,
+                    levels=self._compression_levels,
+                    metrics=self._metrics,
+                )
+            )
+        middleware.append(
+            Middleware(LifecycleMiddleware, lifecycle=self._lifecycle, session_paths=session_paths)
+        )
+        identity = ClientIdentity(
+            api_key_header=self._rate_limit_api_key_header,
+            trust_forwarded_for=self._rate_limit_trust_forwarded_for,
+            api_keys=self._rate_limit_api_keys,
+            issued_session=issued_session,
+        )
+        middleware.append(Middleware(ClientIdentityMiddleware, identity=identity))
+        if self._rate_limiter is not None:
+            middleware.append(
+                Middleware(RateLimitMiddleware, limiter=self._rate_limiter, identity=identity)
+            )
+        return middleware
+
+    def _build_sse_app(self) -> "Starlette":
         from mcp.server.sse import SseServerTransport
+        from starlette.applications import Starlette
+        from starlette.requests import Request
+        from starlette.responses import Response
+        from starlette.routing import Mount, Route
 
-        sse = SseServerTransport("/messages")
+        sse = SseServerTransport("/messages/")
 
-        async def handle_sse(request):
+        def issued_session(session_id: str) -> bool:
+            # Sessions the transport has open; it keeps no public registry of them
+            try:
+                return uuid.UUID(hex=session_id) in getattr(sse, "_read_stream_writers", {})
+            except ValueError:
+                return False
+
+        async def handle_sse(request: Request) -> Response:
             async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
                 await self._server.run(read_stream, write_stream, self._server.create_initialization_options())
+            return Response()
 
-        async def handle_messages(request):
-            await sse.handle_post_message(request.scope, request.receive, request._send)
-
-        app = Starlette(
+        return Starlette(
             routes=[
                 Route("/sse", endpoint=handle_sse),
-                Route("/messages", endpoint=handle_messages, methods=["POST"]),
-            ]
+                Mount("/messages/", app=sse.handle_post_message),
+                *self._health_routes(),
+            ],
+            middleware=self._middleware(("/sse",), issued_session),
         )
 
-        config = uvicorn.Config(app, host=host, port=port, log_level="info")
-        server = uvicorn.Server(config)
-        await server.serve()
+    def _build_streamable_http_app(self) -> "Starlette":
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        # Stateless: every POST is self-contained, so any worker process can serve it
+        session_manager = StreamableHTTPSessionManager(
+            app=self._server, json_response=True, stateless=True
+        )
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            async with session_manager.run():
+                yield
+
+        return Starlette(
+            routes=[
+                Route("/mcp", endpoint=_ASGIEndpoint(session_manager.handle_request)),
+                *self._health_routes(),
+            ],
+            middleware=self._middleware(("/mcp",)),
+            lifespan=lifespan,
+        )
+
+    async def serve_http(
+        self,
+        app: "ASGIApp",
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        sock: Optional[socket.socket] = None,
+    ) -> None:
+        import uvicorn
+
+        config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level="info",
+            timeout_graceful_shutdown=int(self._lifecycle.abort_timeout) or 1,
+        )
+        server = _managed_server_class()(config)
+
+        def stop() -> None:
+            server.should_exit = True
+
+        self._lifecycle.install_signal_handlers(stop)
+        self._start_background()
+        await server.serve(sockets=[sock] if sock is not None else None)
+
+    async def run_sse(self, host: str = "0.0.0.0", port: int = 8000) -> None:
+        await self.serve_http(self.build_http_app("sse"), host, port)
+
+    async def run_streamable_http(self, host: str = "0.0.0.0", port: int = 8000) -> None:
+        await self.serve_http(self.build_http_app("streamable-http"), host, port)
+
+def _optional_bool(value: Any, name: str) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    raise ValueError(f"{name} must be a boolean")
+
+@functools.lru_cache(maxsize=None)
+def _encode_model(info: AIModelInfo) -> str:
+    # Catalog entries never change, so each one is encoded once, already
+    # indented as an element of the "models" array
+    entry = {
+        "model": info.model,
+        "displayName": info.display_name,
+        "provider": info.provider.value,
+        "description": info.description,
+        "maxTokens": info.max_tokens,
+        "supportsTools": info.supports_tools,
+        "supportsVision": info.supports_vision,
+    }
+    text = json.dumps(entry, indent=2, ensure_ascii=False)
+    return "\n".join("    " + line for line in text.splitlines())
+
+@functools.lru_cache(maxsize=512)
+def _encode_model_list(models: tuple[AIModelInfo, ...]) -> str:
+    # Same output as json.dumps({"total": ..., "models": [...]}, indent=2, ensure_ascii=False)
+    if not models:
+        return json.dumps({"total": 0, "models": []}, indent=2)
+    body = ",\n".join(_encode_model(info) for info in models)
+    return f'{{\n  "total": {len(models)},\n  "models": [\n{body}\n  ]\n}}'
+
+class _PipeLines:
+    # Reads a piped stdin on the event loop. anyio's default reader blocks a worker
+    # thread that cannot be cancelled, so SIGTERM would wait for the client to close stdin
+    LINE_LIMIT = 16 * 1024 * 1024
+
+    def __init__(self, reader: asyncio.StreamReader, transport: asyncio.BaseTransport) -> None:
+        self._reader = reader
+        self._transport = transport
+
+    @classmethod
+    async def open_stdin(cls) -> Optional["_PipeLines"]:
+        try:
+            mode = os.fstat(sys.stdin.fileno()).st_mode
+        except (OSError, ValueError, AttributeError):
+            return None
+        # Terminals and files keep the default reader; switching a shared tty to
+        # non-blocking mode would leak into the parent shell
+        if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)):
+            return None
+        reader = asyncio.StreamReader(limit=cls.LINE_LIMIT)
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer
+        )
+        return cls(reader, transport)
+
+    def __aiter__(self) -> "_PipeLines":
+        return self
+
+    async def __anext__(self) -> str:
+        line = await self._reader.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        self._transport.close()
+
+@functools.cache
+def _managed_server_class() -> type:
+    import uvicorn
+
+    class _ManagedServer(uvicorn.Server):
+        # Signals go to the LifecycleManager, which drains tool calls before stopping uvicorn
+        def capture_signals(self) -> contextlib.AbstractContextManager[None]:
+            return contextlib.nullcontext()
+
+    return _ManagedServer
+
+class _ASGIEndpoint:
+    # Starlette wraps plain functions as request/response endpoints; a callable
+    # instance is mounted as a raw ASGI app instead.
+    def __init__(self, handler: "ASGIApp") -> None:
+        self._handler = handler
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        await self._handler(scope, receive, send)
@@ -0,0 +1,531 @@
+import asyncio
+import json
+import os
+import resource
+import selectors
+import signal
+import socket
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..observability import MetricsRegistry, render_snapshots
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class WorkerStats:
+    def __init__(self) -> None:
+        self.requests_total = 0
+        self.requests_failed = 0
+        self.in_flight = 0
+        self.started_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requestsTotal": self.requests_total,
+            "requestsFailed": self.requests_failed,
+            "inFlight": self.in_flight,
+            "uptimeSeconds": round(time.time() - self.started_at, 3),
+            "maxRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+class WorkerStatsMiddleware:
+    def __init__(self, app: "ASGIApp", stats: WorkerStats) -> None:
+        self._app = app
+        self._stats = stats
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: "Message") -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._stats.in_flight += 1
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            self._stats.in_flight -= 1
+            self._stats.requests_total += 1
+            if status >= 500:
+                self._stats.requests_failed += 1
+
+class WorkerReporter:
+    def __init__(self, slot: int, fd: int, interval: float) -> None:
+        self.slot = slot
+        self.stats = WorkerStats()
+        self._fd = fd
+        self._interval = interval
+        self._registry: Optional[MetricsRegistry] = None
+        # Unwritten end of the last beat; metrics snapshots outgrow PIPE_BUF, so the
+        # pipe may take only part of a line
+        self._pending = b""
+        os.set_blocking(fd, False)
+
+    def attach_metrics(self, registry: MetricsRegistry) -> None:
+        self._registry = registry
+
+    def instrument(self, app: "ASGIApp") -> "ASGIApp":
+        return WorkerStatsMiddleware(app, self.stats)
+
+    def report(self) -> None:
+        # A partly written beat is finished before a new one starts, so the supervisor
+        # never reads two beats spliced into one line
+        if not self._pending:
+            payload = {"slot": self.slot, "pid": os.getpid(), **self.stats.snapshot()}
+            if self._registry is not None:
+                payload["metrics"] = self._registry.snapshot()
+            self._pending = (json.dumps(payload) + "\n").encode()
+        try:
+            written = os.write(self._fd, self._pending)
+        except (BlockingIOError, BrokenPipeError):
+            # A full pipe means the supervisor is busy; the next tick continues
+            return
+        self._pending = self._pending[written:]
+
+    async def run(self) -> None:
+        # Beats come from the event loop, so a blocked loop stops them too
+        while True:
+            self.report()
+            await asyncio.sleep(self._interval)
+
+class _WorkerProcess:
+    def __init__(self, slot: int, pid: int, fd: int) -> None:
+        self.slot = slot
+        self.pid = pid
+        self.fd = fd
+        self.started_at = time.monotonic()
+        self.last_heartbeat = self.started_at
+        self.snapshot: dict[str, Any] = {}
+        self.buffer = b""
+
+class _ControlConnection:
+    # One request on the control port, read and answered without blocking the
+    # supervisor loop
+    def __init__(self, conn: socket.socket) -> None:
+        self.conn = conn
+        self.accepted_at = time.monotonic()
+        self.request = b""
+        self.response = b""
+
+# Binds the listen socket once and forks workers that all accept on it; the
+# kernel spreads connections between them. Workers that exit or stop sending
+# heartbeats are restarted, and their stats are served on the control port.
+class PreforkSupervisor:
+    _MAX_RESPAWN_DELAY = 30.0
+    # Control clients that have not sent a request line or read the answer by then
+    # are dropped
+    _CONTROL_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        worker_target: Callable[[socket.socket, WorkerReporter], None],
+        host: str,
+        port: int,
+        workers: int,
+        control_host: str = "127.0.0.1",
+        control_port: int = 8001,
+        heartbeat_interval: float = 2.0,
+        heartbeat_timeout: float = 15.0,
+        shutdown_timeout: float = 30.0,
+    ) -> None:
+        self._worker_target = worker_target
+        self._host = host
+        self._port = port
+        self._workers = workers
+        self._control_host = control_host
+        self._control_port = control_port
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._shutdown_timeout = shutdown_timeout
+
+        self._processes: dict[int, _WorkerProcess] = {}
+        self._registry = MetricsRegistry()
+        self._workers_alive = self._registry.gauge(
+            "mcp_workers_alive", "Worker processes currently running"
+        )
+        self._worker_restarts = self._registry.counter(
+            "mcp_worker_restarts_total", "Worker restarts by slot", ("slot",)
+        )
+        self._restarts = [0] * workers
+        self._failures = [0] * workers
+        self._respawn_at: dict[int, float] = {}
+        self._stopping = False
+        self._selector = selectors.DefaultSelector()
+        self._listen_socket: Optional[socket.socket] = None
+        self._control_socket: Optional[socket.socket] = None
+        self._control_connections: set[_ControlConnection] = set()
+        self._wakeup_r = -1
+        self._wakeup_w = -1
+
+    def run(self) -> None:
+        if not hasattr(os, "fork"):
+            raise RuntimeError("MCP_WORKERS > 1 requires a platform with os.fork")
+
+        self._listen_socket = socket.create_server((self._host, self._port), backlog=2048)
+        self._control_socket = socket.create_server((self._control_host, self._control_port))
+        self._control_socket.setblocking(False)
+        self._selector.register(self._control_socket, selectors.EVENT_READ, "control")
+
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, "wakeup")
+        signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        for signum in (signal.SIGUSR1, signal.SIGUSR2):
+            signal.signal(signum, self._handle_reload)
+
+        for slot in range(self._workers):
+            self._spawn(slot)
+
+        print(
+            f"Supervisor {os.getpid()} running {self._workers} workers on "
+            f"http://{self._host}:{self._port} (control on "
+            f"http://{self._control_host}:{self._control_port})",
+            file=sys.stderr,
+        )
+
+        try:
+            while not self._stopping:
+                for key, mask in self._selector.select(timeout=self._select_timeout()):
+                    if key.data == "control":
+                        self._accept_control()
+                    elif isinstance(key.data, _ControlConnection):
+                        self._handle_control(key.data, mask)
+                    elif key.data == "wakeup":
+                        self._drain_wakeup()
+                    else:
+                        self._read_heartbeat(key.data)
+                self._reap()
+                self._check_heartbeats()
+                self._respawn_due()
+                self._expire_control()
+        finally:
+            self._shutdown()
+
+    def _select_timeout(self) -> float:
+        if not self._respawn_at:
+            return self._heartbeat_interval
+        next_due = min(self._respawn_at.values()) - time.monotonic()
+        return max(0.0, min(next_due, self._heartbeat_interval))
+
+    def _handle_stop(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def _handle_reload(self, signum: int, frame: Any) -> None:
+        # Each worker reloads its own settings and applies them to its own components;
+        # SIGUSR1/SIGUSR2 likewise make every worker write its own profile or task dump
+        self._signal_workers(signum)
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in self._processes:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, slot: int) -> None:
+        read_fd, write_fd = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+
+        if pid == 0:
+            os.close(read_fd)
+            self._become_worker(slot, write_fd)
+
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        process = _WorkerProcess(slot, pid, read_fd)
+        self._processes[pid] = process
+        self._selector.register(read_fd, selectors.EVENT_READ, process)
+
+    def _become_worker(self, slot: int, write_fd: int) -> None:
+        exit_code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                signal.signal(signum, signal.SIG_DFL)
+            # Until the worker's event loop takes them over (or for good, with profiling
+            # disabled), a reload or profiling signal must not kill it
+            for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGUSR2):
+                signal.signal(signum, signal.SIG_IGN)
+            for process in self._processes.values():
+                os.close(process.fd)
+            self._selector.close()
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            assert self._control_socket is not None and self._listen_socket is not None
+            self._control_socket.close()
+            for connection in self._control_connections:
+                connection.conn.close()
+
+            reporter = WorkerReporter(slot, write_fd, self._heartbeat_interval)
+            self._worker_target(self._listen_socket, reporter)
+        except BaseException as e:
+            print(f"Worker {slot} (pid {os.getpid()}) failed: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while os.read(self._wakeup_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read_heartbeat(self, process: _WorkerProcess) -> None:
+        try:
+            data = os.read(process.fd, 65536)
+        except BlockingIOError:
+            return
+        if not data:
+            # Worker closed its end; _reap picks up the exit status
+            self._selector.unregister(process.fd)
+            return
+
+        *lines, process.buffer = (process.buffer + data).split(b"\n")
+        for line in lines:
+            try:
+                process.snapshot = json.loads(line)
+            except ValueError:
+                continue
+            process.last_heartbeat = time.monotonic()
+            self._failures[process.slot] = 0
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            process = self._processes.pop(pid, None)
+            if process is None:
+                continue
+            try:
+                self._selector.unregister(process.fd)
+            except KeyError:
+                pass
+            os.close(process.fd)
+
+            if self._stopping:
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            print(
+                f"Worker {process.slot} (pid {pid}) exited with code {exit_code}, restarting",
+                file=sys.stderr,
+            )
+            # Back off when a worker keeps dying before its first heartbeat
+            # instead of fork-looping on a broken configuration
+            if not process.snapshot:
+                self._failures[process.slot] += 1
+            delay = min(2.0 ** self._failures[process.slot] - 1, self._MAX_RESPAWN_DELAY)
+            self._respawn_at[process.slot] = time.monotonic() + delay
+
+    def _check_heartbeats(self) -> None:
+        now = time.monotonic()
+        for process in list(self._processes.values()):
+            if now - process.last_heartbeat > self._heartbeat_timeout:
+                print(
+                    f"Worker {process.slot} (pid {process.pid}) missed heartbeats for "
+                    f"{now - process.last_heartbeat:.1f}s, killing",
+                    file=sys.stderr,
+                )
+                # A stuck event loop cannot run a graceful SIGTERM handler
+                try:
+                    os.kill(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                process.last_heartbeat = now
+
+    def _respawn_due(self) -> None:
+        now = time.monotonic()
+        for slot, due in list(self._respawn_at.items()):
+            if due <= now:
+                del self._respawn_at[slot]
+                self._restarts[slot] += 1
+                self._worker_restarts.inc(slot=slot)
+                self._spawn(slot)
+
+    def _shutdown(self) -> None:
+        for process in self._processes.values():
+            try:
+                os.kill(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        while self._processes and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+
+        for process in self._processes.values():
+            print(f"Worker {process.slot} (pid {process.pid}) did not stop, killing", file=sys.stderr)
+            try:
+                os.kill(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self._reap()
+
+        for connection in list(self._control_connections):
+            self._close_control(connection)
+        self._selector.close()
+        if self._listen_socket is not None:
+            self._listen_socket.close()
+        if self._control_socket is not None:
+            self._control_socket.close()
+        signal.set_wakeup_fd(-1)
+
+    def workers_status(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        by_slot = {process.slot: process for process in self._processes.values()}
+        status = []
+        for slot in range(self._workers):
+            process = by_slot.get(slot)
+            entry: dict[str, Any] = {"slot": slot, "restarts": self._restarts[slot]}
+            if process is None:
+                entry["alive"] = False
+            else:
+                stats = {k: v for k, v in process.snapshot.items() if k != "metrics"}
+                entry.update(
+                    {
+                        "alive": True,
+                        "pid": process.pid,
+                        "heartbeatAgeSeconds": round(now - process.last_heartbeat, 3),
+                        "stats": stats,
+                    }
+                )
+            status.append(entry)
+        return status
+
+    def aggregate_stats(self) -> dict[str, Any]:
+        totals = {"requestsTotal": 0, "requestsFailed": 0, "inFlight": 0, "maxRssKb": 0}
+        alive = 0
+        for process in self._processes.values():
+            alive += 1
+            for key in totals:
+                totals[key] += process.snapshot.get(key, 0)
+        return {"workers": self._workers, "alive": alive, **totals}
+
+    def render_metrics(self) -> str:
+        # Merge the supervisor's and every worker's registry so one scrape covers the pod:
+        # counters and histograms are summed, gauges combined by their declared
+        # aggregation (sum, max, min or avg)
+        self._workers_alive.set(len(self._processes))
+        snapshots = [process.snapshot.get("metrics") for process in self._processes.values()]
+        return render_snapshots([self._registry.snapshot(), *snapshots])
+
+    def _is_healthy(self) -> bool:
+        now = time.monotonic()
+        healthy = [
+            process
+            for process in self._processes.values()
+            if process.snapshot and now - process.last_heartbeat <= self._heartbeat_timeout
+        ]
+        return len(healthy) == self._workers
+
+    def _accept_control(self) -> None:
+        assert self._control_socket is not None
+        try:
+            conn, _ = self._control_socket.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        connection = _ControlConnection(conn)
+        self._control_connections.add(connection)
+        self._selector.register(conn, selectors.EVENT_READ, connection)
+
+    def _close_control(self, connection: _ControlConnection) -> None:
+        self._control_connections.discard(connection)
+        try:
+            self._selector.unregister(connection.conn)
+        except (KeyError, ValueError):
+            pass
+        connection.conn.close()
+
+    def _expire_control(self) -> None:
+        now = time.monotonic()
+        for connection in list(self._control_connections):
+            if now - connection.accepted_at > self._CONTROL_TIMEOUT:
+                self._close_control(connection)
+
+    def _handle_control(self, connection: _ControlConnection, mask: int) -> None:
+        try:
+            if mask & selectors.EVENT_READ and not connection.response:
+                data = connection.conn.recv(4096)
+                connection.request += data
+                if data and b"\r\n" not in connection.request and len(connection.request) < 4096:
+                    return
+                connection.response = self._control_response(connection.request)
+                self._selector.modify(connection.conn, selectors.EVENT_WRITE, connection)
+            if mask & selectors.EVENT_WRITE or connection.response:
+                sent = connection.conn.send(connection.response)
+                connection.response = connection.response[sent:]
+                if connection.response:
+                    return
+        except BlockingIOError:
+            return
+        except OSError:
+            pass
+        self._close_control(connection)
+
+    def _control_response(self, request: bytes) -> bytes:
+        try:
+            request_line = request.split(b"\r\n", 1)[0].decode("latin-1")
+        except UnicodeDecodeError:
+            request_line = ""
+        parts = request_line.split()
+        method = parts[0] if parts else ""
+        path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+
+        content_type = "application/json"
+        if path == "/workers":
+            status, body = 200, {"workers": self.workers_status()}
+        elif path == "/metrics":
+            status, body = 200, self.render_metrics()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/stats":
+            status, body = 200, self.aggregate_stats()
+        elif path == "/healthz":
+            healthy = self._is_healthy()
+            status, body = (200 if healthy else 503), {"healthy": healthy}
+        elif path == "/cache/invalidate":
+            # Every worker empties its own response cache on SIGWINCH
+            if method == "POST":
+                self._signal_workers(signal.SIGWINCH)
+                status, body = 200, {"workers": len(self._processes)}
+            else:
+                status, body = 405, {"error": "Use POST"}
+        else:
+            status, body = 404, {"error": f"Unknown path: {path}"}
+
+        payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        reason = {
+            200: "OK",
+            404: "Not Found",
+            405: "Method Not Allowed",
+            503: "Service Unavailable",
+        }[status]
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+        )
+        return head.encode() + payload
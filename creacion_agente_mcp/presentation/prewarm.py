@@ -0,0 +1,116 @@
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from ..observability import ServerMetrics
+from .health import ReadinessProbe
+
+class PrewarmReport:
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.details: dict[str, str] = {}
+        self.errors: dict[str, str] = {}
+        self.duration = 0.0
+        self.timed_out = False
+
+    def __str__(self) -> str:
+        steps = []
+        for name, seconds in self.durations.items():
+            step = f"{name} {seconds * 1000:.0f}ms"
+            if name in self.errors:
+                step += f" (failed: {self.errors[name]})"
+            elif name in self.details:
+                step += f" ({self.details[name]})"
+            steps.append(step)
+        summary = f"{self.duration:.2f}s: " + ", ".join(steps)
+        if self.timed_out:
+            summary += " (timed out)"
+        return summary
+
+class Prewarmer:
+    # Runs startup steps concurrently and holds the readiness probe until they
+    # finish. Failures are reported but never block startup
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        readiness: Optional[ReadinessProbe] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._timeout = timeout
+        self._readiness = readiness
+        self._metrics = metrics or ServerMetrics()
+        self._steps: dict[str, tuple[Callable[[], Awaitable[Any]], Optional[str]]] = {}
+        self._task: Optional[asyncio.Task[PrewarmReport]] = None
+        self._report = PrewarmReport()
+
+    @property
+    def report(self) -> PrewarmReport:
+        return self._report
+
+    def add_step(
+        self, name: str, step: Callable[[], Awaitable[Any]], after: Optional[str] = None
+    ) -> None:
+        # The step's result, if any, is shown next to its timing
+        self._steps[name] = (step, after)
+
+    def start(self) -> asyncio.Task[PrewarmReport]:
+        if self._task is None:
+            # Gate readiness before the server starts accepting connections
+            if self._readiness is not None:
+                self._readiness.set_warming(True)
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run_step(
+        self, name: str, step: Callable[[], Awaitable[Any]], after: Optional[asyncio.Task[None]]
+    ) -> None:
+        if after is not None:
+            await asyncio.wait([after])
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            result = await step()
+            if result is not None:
+                self._report.details[name] = str(result)
+        except Exception as e:
+            outcome = "error"
+            self._report.errors[name] = str(e) or type(e).__name__
+        except asyncio.CancelledError:
+            outcome = "timeout"
+            self._report.errors[name] = "timed out"
+            raise
+        finally:
+            self._report.durations[name] = time.perf_counter() - started
+            self._metrics.prewarm_duration.set(
+                self._report.durations[name], step=name, outcome=outcome
+            )
+
+    async def run(self) -> PrewarmReport:
+        started = time.perf_counter()
+        tasks: dict[str, asyncio.Task[None]] = {}
+        try:
+            for name, (step, after) in self._steps.items():
+                tasks[name] = asyncio.create_task(
+                    self._run_step(name, step, tasks.get(after) if after else None)
+                )
+            if tasks:
+                _, pending = await asyncio.wait(tasks.values(), timeout=self._timeout)
+                if pending:
+                    self._report.timed_out = True
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.wait(pending)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            self._report.duration = time.perf_counter() - started
+            if self._readiness is not None:
+                self._readiness.set_warming(False)
+        print(f"Prewarm complete in {self._report}", file=sys.stderr)
+        return self._report
@@ -0,0 +1,306 @@
+import asyncio
+import contextlib
+import contextvars
+import hmac
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+from ..observability import ServerMetrics
+
+if TYPE_CHECKING:
+    from starlette.routing import Route
+
+# A latency spike makes every call slow: profile a few at a time, and at most one
+# per tool every cooldown, instead of a file per request
+_MAX_SLOW_CALLS = 4
+_SLOW_CALL_COOLDOWN = 10.0
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+
+def _thread_stack(frame: Optional[FrameType]) -> list[str]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+def _await_frames(coro: Any) -> tuple[list[FrameType], Any]:
+    # A suspended task has no thread stack; where it waits is the chain of awaited
+    # coroutines, ending at the future it is blocked on
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames, coro
+
+def _await_stack(task: "asyncio.Task[Any]") -> str:
+    frames, awaited = _await_frames(task.get_coro())
+    labels = [_frame_label(frame) for frame in frames]
+    if awaited is not None:
+        labels.append(f"<{type(awaited).__name__}>")
+    return ";".join(labels)
+
+def _fold(samples: Counter[str]) -> str:
+    # One "root;...;leaf count" line per stack: speedscope and flamegraph.pl read it as is
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+class ProfilerBusyException(Exception):
+    pass
+
+class Profiler:
+    # Profiles on request only: a sampling thread for the whole process, the await
+    # chain of tool calls slower than the threshold, and dumps of asyncio tasks.
+    # When disabled nothing is installed and tool calls are not wrapped
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        sample_interval: float = 0.005,
+        max_duration: float = 300.0,
+        signal_duration: float = 30.0,
+        slow_call_threshold: float = 0.0,
+        admin_token: Optional[str] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._output_dir = Path(output_dir)
+        self._sample_interval = sample_interval
+        self._max_duration = max_duration
+        self._signal_duration = signal_duration
+        self._slow_call_threshold = slow_call_threshold
+        self._admin_token = admin_token
+        self._metrics = metrics or ServerMetrics()
+        self._stop_sampling: Optional[threading.Event] = None
+        self._slow_calls = 0
+        self._slow_call_profiled: dict[str, float] = {}
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    @property
+    def max_duration(self) -> float:
+        return self._max_duration
+
+    def reconfigure(self, sample_interval: float, slow_call_threshold: float) -> None:
+        # A profile already running keeps its interval
+        self._sample_interval = sample_interval
+        self._slow_call_threshold = slow_call_threshold
+
+    @property
+    def admin_token_set(self) -> bool:
+        return bool(self._admin_token)
+
+    def authorized(self, authorization: Optional[str]) -> bool:
+        # Fails closed: without a token the HTTP routes are refused to everyone and only
+        # the signals, which need access to the pod, can start a profile
+        if not self._admin_token:
+            return False
+        expected = f"Bearer {self._admin_token}"
+        return hmac.compare_digest((authorization or "").encode(), expected.encode())
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        for signum, handler in (
+            (signal.SIGUSR1, self._profile_on_signal),
+            (signal.SIGUSR2, self._dump_on_signal),
+        ):
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+                loop.add_signal_handler(signum, self._spawn, handler)
+
+    async def stop(self) -> None:
+        loop = asyncio.get_running_loop()
+        for name in ("SIGUSR1", "SIGUSR2"):
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+                loop.remove_signal_handler(getattr(signal, name))
+        if self._stop_sampling is not None:
+            self._stop_sampling.set()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coroutine: Callable[[], Any]) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine(), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _profile_on_signal(self) -> None:
+        try:
+            await self.profile(self._signal_duration)
+        except ProfilerBusyException as e:
+            print(f"Profile not started: {e}", file=sys.stderr)
+
+    async def _dump_on_signal(self) -> None:
+        await self.dump_tasks()
+
+    async def profile(self, duration: float) -> str:
+        if self._stop_sampling is not None:
+            raise ProfilerBusyException("a profile is already running")
+        duration = min(duration, self._max_duration)
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future[Counter[str]] = loop.create_future()
+        stop = self._stop_sampling = threading.Event()
+
+        def sample() -> None:
+            samples = self._sample_threads(duration, stop)
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(lambda: done.done() or done.set_result(samples))
+
+        # A daemon thread, so a profile in progress never holds up shutdown
+        threading.Thread(target=sample, name="profiler", daemon=True).start()
+        try:
+            samples = await done
+        finally:
+            stop.set()
+            self._stop_sampling = None
+        folded = _fold(samples)
+        path = await self._write("profile", ".folded", folded)
+        self._metrics.profiles.inc(kind="process")
+        print(
+            f"Profile of {duration:g}s ({sum(samples.values())} samples) written to {path}",
+            file=sys.stderr,
+        )
+        return folded
+
+    def _sample_threads(self, duration: float, stop: threading.Event) -> Counter[str]:
+        samples: Counter[str] = Counter()
+        interval = self._sample_interval
+        me = threading.get_ident()
+        deadline = time.monotonic() + duration
+        while not stop.wait(interval) and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    stack = [names.get(ident, str(ident)), *_thread_stack(frame)]
+                    samples[";".join(stack)] += 1
+        return samples
+
+    @contextlib.contextmanager
+    def watch_call(self, tool: str) -> Iterator[None]:
+        # Costs one timer per call; sampling starts only once the call crosses the threshold
+        task = asyncio.current_task()
+        threshold = self._slow_call_threshold
+        if threshold <= 0 or task is None:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        samples: Counter[str] = Counter()
+        sampling = False
+
+        def sample() -> None:
+            nonlocal handle, sampling
+            if not sampling:
+                now = time.monotonic()
+                if (
+                    self._slow_calls >= _MAX_SLOW_CALLS
+                    or now - self._slow_call_profiled.get(tool, -_SLOW_CALL_COOLDOWN)
+                    < _SLOW_CALL_COOLDOWN
+                ):
+                    return
+                sampling = True
+                self._slow_calls += 1
+                self._slow_call_profiled[tool] = now
+            samples[_await_stack(task)] += 1
+            handle = loop.call_later(self._sample_interval, sample)
+
+        handle = loop.call_later(threshold, sample)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            handle.cancel()
+            if sampling:
+                self._slow_calls -= 1
+                elapsed = time.perf_counter() - started
+                self._metrics.profiles.inc(kind="slow_call")
+                self._spawn(lambda: self._save_slow_call(tool, elapsed, samples))
+
+    async def _save_slow_call(self, tool: str, elapsed: float, samples: Counter[str]) -> None:
+        path = await self._write(f"slow-{tool}", ".folded", _fold(samples))
+        print(f"Slow {tool} call ({elapsed:.2f}s) profiled to {path}", file=sys.stderr)
+
+    async def dump_tasks(self) -> str:
+        lines = []
+        for task in sorted(asyncio.all_tasks(), key=lambda task: task.get_name()):
+            state = "cancelling" if task.cancelling() else "pending"
+            frames, awaited = _await_frames(task.get_coro())
+            lines.append(f"{task.get_name()} ({state})")
+            for frame in frames:
+                code = frame.f_code
+                lines.append(
+                    f'  File "{code.co_filename}", line {frame.f_lineno}, in {code.co_qualname}'
+                )
+            if awaited is not None:
+                lines.append(f"  awaiting {type(awaited).__name__}")
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            lines.append(f"Thread {names.get(ident, ident)}")
+            lines.extend(line.rstrip("\n") for line in traceback.format_stack(frame))
+        text = "\n".join(lines) + "\n"
+        path = await self._write("tasks", ".txt", text)
+        self._metrics.profiles.inc(kind="tasks")
+        print(f"Task dump written to {path}", file=sys.stderr)
+        return text
+
+    async def _write(self, kind: str, suffix: str, text: str) -> Path:
+        now = time.time()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now % 1 * 1000):03d}"
+        path = self._output_dir / f"{kind}-{os.getpid()}-{stamp}{suffix}"
+
+        def write() -> None:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+        await asyncio.to_thread(write)
+        return path
+
+def build_profiling_routes(profiler: Profiler) -> list["Route"]:
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse, Response
+    from starlette.routing import Route
+
+    def denied(request: Request) -> Optional[Response]:
+        if not profiler.admin_token_set:
+            return JSONResponse(
+                {"error": "PROFILING_ADMIN_TOKEN is not set; use SIGUSR1/SIGUSR2"},
+                status_code=403,
+            )
+        if profiler.authorized(request.headers.get("authorization")):
+            return None
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    async def profile(request: Request) -> Response:
+        if (response := denied(request)) is not None:
+            return response
+        try:
+            seconds = float(request.query_params.get("seconds", "10"))
+        except ValueError:
+            seconds = 0.0
+        if not 0 < seconds <= profiler.max_duration:
+            return JSONResponse(
+                {"error": f"seconds must be in (0, {profiler.max_duration:g}]"}, status_code=400
+            )
+        try:
+            folded = await profiler.profile(seconds)
+        except ProfilerBusyException as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+        return PlainTextResponse(folded)
+
+    async def tasks(request: Request) -> Response:
+        if (response := denied(request)) is not None:
+            return response
+        return PlainTextResponse(await profiler.dump_tasks())
+
+    return [
+        Route("/debug/profile", endpoint=profile),
+        Route("/debug/tasks", endpoint=tasks),
+    ]
@@ -0,0 +1,299 @@
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+from ..observability import ServerMetrics
+from .client_identity import ClientIdentity
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Tools that change state in Foundry; every other tool draws from the read budget
+WRITE_TOOLS = frozenset({"create_agent"})
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float) -> float:
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def reset_time(self) -> float:
+        return (self.capacity - self.tokens) / self.rate
+
+class RateLimitDecision:
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after")
+
+    def __init__(
+        self, allowed: bool, limit: float, remaining: float, reset: float, retry_after: float
+    ) -> None:
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.retry_after = retry_after
+
+    def headers(self) -> list[tuple[bytes, bytes]]:
+        headers = [
+            (b"ratelimit-limit", str(int(self.limit)).encode()),
+            (b"ratelimit-remaining", str(max(0, math.floor(self.remaining))).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+class RateLimiter:
+    def __init__(
+        self,
+        read_rate: float = 10.0,
+        read_burst: float = 50.0,
+        write_rate: float = 1.0,
+        write_burst: float = 5.0,
+        tool_costs: Optional[dict[str, float]] = None,
+        max_clients: int = 10000,
+        idle_ttl: float = 600.0,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._budgets = {"read": (read_burst, read_rate), "write": (write_burst, write_rate)}
+        self._tool_costs = dict(tool_costs or {})
+        self._max_clients = max_clients
+        self._idle_ttl = idle_ttl
+        self._metrics = metrics or ServerMetrics()
+        # Least recently used first, so idle buckets are evicted from the front in O(1)
+        self._buckets: OrderedDict[tuple[Hashable, str], TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def reconfigure(
+        self,
+        read_rate: float,
+        read_burst: float,
+        write_rate: float,
+        write_burst: float,
+        tool_costs: Optional[dict[str, float]] = None,
+        max_clients: int = 10000,
+        idle_ttl: float = 600.0,
+    ) -> None:
+        # Existing clients keep their balance, capped at the new burst, and refill
+        # at the new rate from now on
+        now = time.monotonic()
+        self._budgets = {"read": (read_burst, read_rate), "write": (write_burst, write_rate)}
+        self._tool_costs = dict(tool_costs or {})
+        self._max_clients = max_clients
+        self._idle_ttl = idle_ttl
+        for (_, kind), bucket in self._buckets.items():
+            bucket.refill(now)
+            bucket.capacity, bucket.rate = self._budgets[kind]
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+        self._evict(now)
+
+    def kind_of(self, tool: str) -> str:
+        return "write" if tool in WRITE_TOOLS else "read"
+
+    def cost_of(self, tool: str) -> float:
+        return self._tool_costs.get(tool, 1.0)
+
+    def _bucket(self, identity: Hashable, kind: str, now: float) -> TokenBucket:
+        key = (identity, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, rate = self._budgets[kind]
+            bucket = self._buckets[key] = TokenBucket(capacity, rate, now)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.refill(now)
+        return bucket
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self._max_clients and now - bucket.updated < self._idle_ttl:
+                break
+            del self._buckets[key]
+        self._metrics.rate_limit_buckets.set(len(self._buckets))
+
+    def acquire(self, identity: Hashable, costs: dict[str, float]) -> RateLimitDecision:
+        # All-or-nothing across kinds, so a batch never half-spends its budget
+        now = time.monotonic()
+        buckets = {kind: self._bucket(identity, kind, now) for kind in costs}
+        self._evict(now)
+
+        waits = {
+            kind: bucket.wait_time(min(costs[kind], bucket.capacity))
+            for kind, bucket in buckets.items()
+        }
+        allowed = all(wait == 0.0 for wait in waits.values())
+        if allowed:
+            for kind, bucket in buckets.items():
+                bucket.tokens -= min(costs[kind], bucket.capacity)
+        else:
+            for kind, wait in waits.items():
+                if wait > 0:
+                    self._metrics.rate_limited.inc(kind=kind)
+
+        # Report on the most constrained bucket
+        bucket = min(buckets.values(), key=lambda b: b.tokens / b.capacity)
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=bucket.capacity,
+            remaining=bucket.tokens,
+            reset=bucket.reset_time(),
+            retry_after=max(waits.values()),
+        )
+
+# The body is read before the bucket can be charged (the cost depends on the tools it
+# calls), so it is capped; MCP requests are far smaller than this
+MAX_BODY_BYTES = 1024 * 1024
+
+class RateLimitMiddleware:
+    # One bucket per client, as identified by ClientIdentity
+    def __init__(
+        self,
+        app: "ASGIApp",
+        limiter: RateLimiter,
+        identity: Optional[ClientIdentity] = None,
+        max_body_bytes: int = MAX_BODY_BYTES,
+    ) -> None:
+        self._app = app
+        self._limiter = limiter
+        self._identity = identity or ClientIdentity()
+        self._max_body_bytes = max_body_bytes
+
+    def _costs(self, body: bytes) -> tuple[dict[str, float], Any]:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return {}, None
+        messages = payload if isinstance(payload, list) else [payload]
+        costs: dict[str, float] = {}
+        request_id = None
+        for message in messages:
+            if not isinstance(message, dict) or message.get("method") != "tools/call":
+                continue
+            params = message.get("params") or {}
+            tool = str(params.get("name", "")) if isinstance(params, dict) else ""
+            kind = self._limiter.kind_of(tool)
+            costs[kind] = costs.get(kind, 0.0) + self._limiter.cost_of(tool)
+            request_id = message.get("id", request_id)
+        return costs, request_id
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self._app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > self._max_body_bytes:
+            await self._too_large(send)
+            return
+
+        # Content-Length may be missing (chunked) or wrong, so the running size is checked too
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self._max_body_bytes:
+                await self._too_large(send)
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        costs, request_id = self._costs(body)
+        if not costs:
+            await self._app(scope, _replay(body, receive), send)
+            return
+
+        decision = self._limiter.acquire(self._identity(scope), costs)
+        if not decision.allowed:
+            await self._reject(send, decision, request_id)
+            return
+
+        async def send_with_headers(message: "Message") -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *decision.headers()]}
+            await send(message)
+
+        await self._app(scope, _replay(body, receive), send_with_headers)
+
+    async def _reject(self, send: "Send", decision: RateLimitDecision, request_id: Any) -> None:
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {
+                    "code": -32000,
+                    "message": "Rate limit exceeded",
+                    "data": {"retryable": True, "retryAfterMs": int(decision.retry_after * 1000)},
+                },
+            }
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *decision.headers(),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _too_large(self, send: "Send") -> None:
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32600,
+                    "message": f"Request body exceeds {self._max_body_bytes} bytes",
+                },
+            }
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+def _replay(body: bytes, receive: "Receive") -> "Receive":
+    sent = False
+
+    async def replay() -> "Message":
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
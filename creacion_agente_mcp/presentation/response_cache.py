@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import signal
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from mcp.types import TextContent
+
+from ..observability import ServerMetrics
+
+DEFAULT_TOOL_TTLS = {"list_models": 3600.0, "list_projects": 300.0}
+
+class _CacheEntry:
+    __slots__ = ("content", "expires_at", "stale_until")
+
+    def __init__(self, content: TextContent, expires_at: float, stale_until: float) -> None:
+        # The encoded text lives in a ready-made TextContent shared by every hit
+        self.content = content
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        stale_ttl: float = 600.0,
+        max_entries: int = 256,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._ttls = dict(DEFAULT_TOOL_TTLS if ttls is None else ttls)
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        self._metrics = metrics or ServerMetrics()
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._loading: dict[tuple[str, str], asyncio.Future[_CacheEntry]] = {}
+        self._refreshing: set[asyncio.Task[Any]] = set()
+        self._generation = 0
+
+    def caches(self, tool: str) -> bool:
+        return tool in self._ttls
+
+    def start(self) -> None:
+        # SIGWINCH empties the cache; the prefork supervisor's POST /cache/invalidate
+        # sends it to every worker
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGWINCH, self.invalidate)
+
+    def stop(self) -> None:
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGWINCH)
+
+    def reconfigure(self, ttls: dict[str, float], stale_ttl: float, max_entries: int) -> None:
+        # Cached entries keep the expiry they were stored with; tools that no longer
+        # have a TTL are dropped, and loads already running are not stored
+        self._generation += 1
+        self._ttls = dict(ttls)
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        for key in [key for key in self._entries if key[0] not in self._ttls]:
+            del self._entries[key]
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._metrics.cache_entries.set(len(self._entries), cache="tool_response")
+
+    @staticmethod
+    def _key(tool: str, arguments: Any) -> tuple[str, str]:
+        if isinstance(arguments, dict):
+            arguments = {k: v for k, v in arguments.items() if v is not None}
+        return tool, json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+    def _record(self, result: str) -> None:
+        self._metrics.cache_requests.inc(cache="tool_response", result=result)
+
+    async def get_or_load(
+        self, tool: str, arguments: Any, loader: Callable[[], Awaitable[str]]
+    ) -> list[TextContent]:
+        key = self._key(tool, arguments)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires_at:
+            self._entries.move_to_end(key)
+            self._record("hit")
+            return [entry.content]
+
+        if entry is not None and now < entry.stale_until:
+            # Serve the stale payload and refresh once in the background
+            self._record("stale")
+            if key not in self._loading:
+                self._start_refresh(key, loader)
+            return [entry.content]
+
+        self._record("miss")
+        return [(await self._load(key, loader)).content]
+
+    def _load(
+        self, key: tuple[str, str], loader: Callable[[], Awaitable[str]]
+    ) -> asyncio.Future[_CacheEntry]:
+        # Single flight: concurrent misses for the same key share one upstream call
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fill(key, loader))
+            self._loading[key] = future
+            future.add_done_callback(lambda _: self._loading.pop(key, None))
+        return asyncio.shield(future)
+
+    async def _fill(
+        self, key: tuple[str, str], loader: Callable[[], Awaitable[str]]
+    ) -> _CacheEntry:
+        generation = self._generation
+        text = await loader()
+        now = time.monotonic()
+        ttl = self._ttls.get(key[0], 0.0)
+        entry = _CacheEntry(
+            TextContent(type="text", text=text), now + ttl, now + ttl + self._stale_ttl
+        )
+        # Invalidation while loading wins; the caller still gets this result
+        if generation == self._generation:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._metrics.cache_entries.set(len(self._entries), cache="tool_response")
+        return entry
+
+    def _start_refresh(self, key: tuple[str, str], loader: Callable[[], Awaitable[str]]) -> None:
+        # Fresh context: the refresh must not inherit the caller's deadline or span
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(key, loader), context=contextvars.Context()
+        )
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def _refresh(self, key: tuple[str, str], loader: Callable[[], Awaitable[str]]) -> None:
+        try:
+            await self._load(key, loader)
+        except Exception:
+            # Keep serving the stale entry until it ages out
+            self._record("refresh_error")
+
+    def invalidate(self, tool: Optional[str] = None, project: Optional[str] = None) -> int:
+        # With a project, only calls whose projectName matches are dropped
+        self._generation += 1
+        keys = [
+            key
+            for key in self._entries
+            if (tool is None or key[0] == tool)
+            and (project is None or _project_of(key[1]) == project)
+        ]
+        for key in keys:
+            del self._entries[key]
+        self._metrics.cache_entries.set(len(self._entries), cache="tool_response")
+        return len(keys)
+
+def _project_of(arguments: str) -> Optional[str]:
+    decoded = json.loads(arguments)
+    return decoded.get("projectName") if isinstance(decoded, dict) else None
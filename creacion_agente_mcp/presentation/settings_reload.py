@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import contextvars
+import os
+import signal
+import sys
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import ValidationError
+
+from ..config import Settings
+from ..observability import ServerMetrics
+
+# A component's prepare step validates the new settings and returns the commit that
+# applies them; commits only swap state and never await
+Prepare = Callable[[Settings], Callable[[], Any]]
+
+def _describe(error: Exception) -> str:
+    # Field and message only: pydantic echoes input values, which may be secrets
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error) or type(error).__name__
+
+class ReloadReport:
+    def __init__(self) -> None:
+        self.outcome = "unchanged"
+        self.changed: list[str] = []
+        self.applied: list[str] = []
+        self.restart_required: list[str] = []
+        self.errors: dict[str, str] = {}
+        self.duration = 0.0
+
+    def __str__(self) -> str:
+        summary = f"{self.outcome} in {self.duration * 1000:.0f}ms"
+        if self.changed:
+            summary += f": {len(self.changed)} changed ({', '.join(self.changed)})"
+        if self.applied:
+            summary += f", applied to {', '.join(self.applied)}"
+        if self.restart_required:
+            summary += f", restart required for {', '.join(self.restart_required)}"
+        if self.errors:
+            failures = ", ".join(f"{name}: {error}" for name, error in self.errors.items())
+            summary += f" ({failures})"
+        return summary
+
+class SettingsManager:
+    # Reloads settings on SIGHUP or when the settings file changes. Every component
+    # prepares its change before any is applied, then all commits run without
+    # yielding to the event loop, so no request sees half-applied settings
+    def __init__(
+        self,
+        settings: Settings,
+        loader: Callable[[], Settings],
+        watch_path: Optional[str] = None,
+        watch_interval: float = 0.0,
+        metrics: Optional[ServerMetrics] = None,
+    ) -> None:
+        self._settings = settings
+        self._loader = loader
+        self._watch_path = watch_path
+        self._watch_interval = watch_interval
+        self._metrics = metrics or ServerMetrics()
+        self._subscribers: list[tuple[str, frozenset[str], Prepare]] = []
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._report: Optional[ReloadReport] = None
+
+    @property
+    def settings(self) -> Settings:
+        return self._settings
+
+    @property
+    def report(self) -> Optional[ReloadReport]:
+        return self._report
+
+    def subscribe(self, name: str, fields: Iterable[str], prepare: Prepare) -> None:
+        # Changed fields no component subscribes to are reported as needing a restart
+        self._subscribers.append((name, frozenset(fields), prepare))
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+            loop.add_signal_handler(signal.SIGHUP, self._spawn, self.reload)
+        if self._watch_path and self._watch_interval > 0:
+            self._spawn(self._watch)
+
+    async def stop(self) -> None:
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError, AttributeError):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coroutine: Callable[[], Any]) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine(), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _signature(self) -> Optional[tuple[int, int, int]]:
+        # stat follows symlinks, so a ConfigMap update (an atomic symlink swap) shows
+        # up as a new inode even when mtime and size match
+        assert self._watch_path is not None
+        try:
+            stat = os.stat(self._watch_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    async def _watch(self) -> None:
+        signature = self._signature()
+        while True:
+            await asyncio.sleep(self._watch_interval)
+            current = self._signature()
+            if current != signature:
+                signature = current
+                await self.reload()
+
+    async def reload(self) -> ReloadReport:
+        # Serialized, so a SIGHUP during a file-triggered reload waits its turn
+        async with self._lock:
+            started = time.perf_counter()
+            report = await self._reload()
+            report.duration = time.perf_counter() - started
+        self._report = report
+        self._metrics.settings_reloads.inc(outcome=report.outcome)
+        self._metrics.settings_reload_duration.observe(report.duration)
+        print(f"Settings reload {report}", file=sys.stderr)
+        return report
+
+    async def _reload(self) -> ReloadReport:
+        report = ReloadReport()
+        try:
+            settings = await asyncio.to_thread(self._loader)
+        except Exception as e:
+            report.outcome = "invalid"
+            report.errors["settings"] = _describe(e)
+            return report
+
+        current = self._settings
+        report.changed = [
+            name
+            for name in type(current).model_fields
+            if getattr(settings, name) != getattr(current, name)
+        ]
+        subscribed = frozenset().union(*(fields for _, fields, _ in self._subscribers))
+        report.restart_required = [name for name in report.changed if name not in subscribed]
+        live = {name: getattr(settings, name) for name in report.changed if name in subscribed}
+        if not live:
+            return report
+        # Settings that need a restart keep their running value
+        settings = current.model_copy(update=live)
+
+        commits = []
+        for name, fields, prepare in self._subscribers:
+            if fields.isdisjoint(live):
+                continue
+            try:
+                commits.append((name, prepare(settings)))
+            except Exception as e:
+                report.outcome = "invalid"
+                report.errors[name] = _describe(e)
+                return report
+
+        for name, commit in commits:
+            try:
+                commit()
+                report.applied.append(name)
+            except Exception as e:
+                report.errors[name] = _describe(e)
+        self._settings = settings
+        report.outcome = "failed" if report.errors else "applied"
+        return report
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from creacion_agente_mcp.observability import ServerMetrics
+from creacion_agente_mcp.presentation.admission import (
+    AdmissionController,
+    ServerOverloadedException,
+)
+
+async def hold(
+    controller: AdmissionController,
+    tool: str,
+    session: str,
+    release: asyncio.Event,
+    order: list[str],
+) -> None:
+    async with controller.admit(tool, session):
+        order.append(tool)
+        await release.wait()
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+async def test_queued_calls_are_admitted_by_priority_then_arrival() -> None:
+    controller = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout=5)
+    release = asyncio.Event()
+    order: list[str] = []
+    blocker = asyncio.create_task(hold(controller, "list_agents", "a", release, order))
+    await settle()
+
+    done = asyncio.Event()
+    done.set()
+    waiters = [
+        asyncio.create_task(hold(controller, tool, f"s{index}", done, order))
+        for index, tool in enumerate(["create_agent", "list_agents", "list_models", "get_agent"])
+    ]
+    await settle()
+    assert controller.queued == 4
+
+    release.set()
+    await asyncio.gather(blocker, *waiters)
+    assert order == ["list_agents", "list_models", "get_agent", "list_agents", "create_agent"]
+    assert controller.in_flight == 0
+
+async def test_per_session_cap_lets_other_sessions_through() -> None:
+    controller = AdmissionController(max_in_flight=10, max_in_flight_per_session=1, queue_timeout=5)
+    release = asyncio.Event()
+    order: list[str] = []
+    first = asyncio.create_task(hold(controller, "get_agent", "busy", release, order))
+    await settle()
+    second = asyncio.create_task(hold(controller, "list_models", "busy", release, order))
+    other = asyncio.create_task(hold(controller, "create_agent", "idle", release, order))
+    await settle()
+
+    # The busy session's second call waits even though global slots are free
+    assert order == ["get_agent", "create_agent"]
+    assert controller.queued == 1
+    release.set()
+    await asyncio.gather(first, second, other)
+    assert order[-1] == "list_models"
+
+async def test_full_queue_sheds_the_worst_waiter_for_a_better_arrival() -> None:
+    metrics = ServerMetrics()
+    controller = AdmissionController(max_in_flight=1, max_queue=2, queue_timeout=5, metrics=metrics)
+    release = asyncio.Event()
+    order: list[str] = []
+    blocker = asyncio.create_task(hold(controller, "get_agent", "a", release, order))
+    await settle()
+    write = asyncio.create_task(hold(controller, "create_agent", "b", release, order))
+    listing = asyncio.create_task(hold(controller, "list_agents", "c", release, order))
+    await settle()
+
+    models = asyncio.create_task(hold(controller, "list_models", "d", release, order))
+    await settle()
+    with pytest.raises(ServerOverloadedException) as shed:
+        await write
+    assert shed.value.reason == "queue_full"
+    assert metrics.admission_rejected.value(tool="create_agent", reason="queue_full") == 1
+
+    # A worse arrival than everything queued is rejected itself
+    with pytest.raises(ServerOverloadedException):
+        async with controller.admit("create_agent", "e"):
+            pass
+
+    release.set()
+    await asyncio.gather(blocker, listing, models)
+    assert order == ["get_agent", "list_models", "list_agents"]
+
+async def test_queue_timeout_rejects_and_leaves_no_waiter_behind() -> None:
+    metrics = ServerMetrics()
+    controller = AdmissionController(
+        max_in_flight=1, queue_timeout=0.05, retry_after=2.5, metrics=metrics
+    )
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(controller, "get_agent", "a", release, []))
+    await settle()
+
+    with pytest.raises(ServerOverloadedException) as timed_out:
+        async with controller.admit("get_agent", "b"):
+            pass
+    assert timed_out.value.reason == "queue_timeout"
+    assert timed_out.value.retry_after == 2.5
+    assert controller.queued == 0
+    assert metrics.admission_rejected.value(tool="get_agent", reason="queue_timeout") == 1
+
+    release.set()
+    await blocker
+    assert controller.in_flight == 0
+
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    controller = AdmissionController(max_in_flight=1, queue_timeout=5)
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(controller, "get_agent", "a", release, []))
+    await settle()
+    waiter = asyncio.create_task(hold(controller, "get_agent", "b", release, []))
+    await settle()
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    release.set()
+    await blocker
+    assert controller.in_flight == 0
+    assert controller.queued == 0
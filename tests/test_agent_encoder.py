@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+import pytest
+
+from creacion_agente_mcp.domain.entities import Agent, AgentProps
+from creacion_agente_mcp.domain.value_objects import (
+    AgentDescription,
+    AgentId,
+    AgentName,
+    AIModelInfo,
+    AIModelProvider,
+    ModelConfiguration,
+)
+from creacion_agente_mcp.presentation.agent_encoder import (
+    AgentEncoder,
+    _stdlib_dumps,
+    default_dumps,
+)
+from creacion_agente_mcp.presentation.mcp_server import _encode_model_list
+
+def make_agent(index: int) -> Agent:
+    return Agent(
+        AgentProps(
+            id=AgentId(value=f"asst_{index}"),
+            name=AgentName(value=f"Asistente de facturación {index}"),
+            description=AgentDescription(value="Responde en español — «sin» escapes ✓"),
+            model_configuration=ModelConfiguration(model_name="gpt-4o", max_tokens=4096),
+            instructions="Línea uno\nLínea dos",
+            tools=["code_interpreter"],
+            metadata={"región": "España", "priority": 1},
+            created_at=datetime(2024, 5, 1, 12, 30),
+            updated_at=datetime(2024, 5, 2, 8, 0),
+        )
+    )
+
+def test_stdlib_and_orjson_encode_agents_identically() -> None:
+    pytest.importorskip("orjson")
+    agents = [make_agent(index) for index in range(3)]
+    stdlib = AgentEncoder(dumps=_stdlib_dumps)
+    fast = AgentEncoder(dumps=default_dumps())
+
+    assert stdlib.encode(agents[0]) == fast.encode(agents[0])
+    assert stdlib.encode_list(agents) == fast.encode_list(agents)
+    assert "español" in stdlib.encode(agents[0])
+
+def test_list_matches_a_single_json_document() -> None:
+    agents = [make_agent(index) for index in range(3)]
+    expected = json.dumps([agent.to_dict() for agent in agents], indent=2, ensure_ascii=False)
+    encoder = AgentEncoder(dumps=_stdlib_dumps)
+
+    assert encoder.encode_list(agents) == expected
+    assert encoder.encode_list([]) == "[]"
+
+async def test_paged_list_matches_encode_list() -> None:
+    agents = [make_agent(index) for index in range(5)]
+    encoder = AgentEncoder(dumps=_stdlib_dumps)
+
+    async def pages() -> AsyncIterator[list[Agent]]:
+        yield agents[:2]
+        yield []
+        yield agents[2:]
+
+    assert await encoder.encode_pages(pages()) == encoder.encode_list(agents)
+
+def test_model_list_leaves_non_ascii_unescaped_like_agents() -> None:
+    models = (
+        AIModelInfo(
+            provider=AIModelProvider.AZURE_OPENAI,
+            model="gpt-4o",
+            display_name="GPT-4o",
+            description="Modelo multimodal — visión",
+            max_tokens=128000,
+            supports_tools=True,
+            supports_vision=True,
+        ),
+    )
+    expected = {
+        "total": 1,
+        "models": [
+            {
+                "model": "gpt-4o",
+                "displayName": "GPT-4o",
+                "provider": AIModelProvider.AZURE_OPENAI.value,
+                "description": "Modelo multimodal — visión",
+                "maxTokens": 128000,
+                "supportsTools": True,
+                "supportsVision": True,
+            }
+        ],
+    }
+    assert _encode_model_list(models) == json.dumps(expected, indent=2, ensure_ascii=False)
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Iterable
+
+import httpx
+
+from creacion_agente_mcp.application.use_cases import (
+    CreateAgentUseCase,
+    GetAgentUseCase,
+    ListAgentsUseCase,
+)
+from creacion_agente_mcp.domain.entities import Agent, AgentProps
+from creacion_agente_mcp.domain.repositories import IAgentRepository
+from creacion_agente_mcp.domain.value_objects import (
+    AgentDescription,
+    AgentId,
+    AgentName,
+    ModelConfiguration,
+)
+from creacion_agente_mcp.infrastructure.azure import AzureFoundryClient, AzureFoundryConfig
+from creacion_agente_mcp.presentation.admission import AdmissionController
+from creacion_agente_mcp.presentation.client_identity import (
+    ClientIdentity,
+    client_identity,
+    client_session,
+)
+from creacion_agente_mcp.presentation.mcp_server import MCPServer
+
+def scope(headers: Iterable[tuple[bytes, bytes]] = (), query: bytes = b"") -> dict[str, Any]:
+    return {"headers": list(headers), "query_string": query, "client": ("10.0.0.1", 5000)}
+
+def test_identity_ignores_client_chosen_keys_and_sessions() -> None:
+    identity = ClientIdentity(api_keys=["known"], issued_session=lambda sid: sid == "issued")
+    assert identity(scope([(b"x-api-key", b"made-up")])) == "ip:10.0.0.1"
+    assert identity(scope([(b"mcp-session-id", b"made-up")])) == "ip:10.0.0.1"
+    assert identity(scope(query=b"session_id=made-up")) == "ip:10.0.0.1"
+    assert identity(scope([(b"x-api-key", b"known")])).startswith("key:")
+
+def test_sse_sessions_share_the_client_identity() -> None:
+    # Opening more sessions must not buy more budget; the session is kept for attribution
+    identity = ClientIdentity(issued_session=lambda sid: sid in {"first", "second"})
+    requests = [scope(query=b"session_id=first"), scope(query=b"session_id=second")]
+    assert [identity(request) for request in requests] == ["ip:10.0.0.1", "ip:10.0.0.1"]
+    assert [client_session(request) for request in requests] == ["first", "second"]
+
+    made_up = scope(query=b"session_id=made-up")
+    identity(made_up)
+    assert client_session(made_up) is None
+
+def test_forwarded_for_is_only_used_when_trusted() -> None:
+    headers = [(b"x-forwarded-for", b"203.0.113.7, 10.0.0.2")]
+    assert ClientIdentity()(scope(headers)) == "ip:10.0.0.1"
+    assert ClientIdentity(trust_forwarded_for=True)(scope(headers)) == "ip:203.0.113.7"
+
+def test_identity_is_stored_in_the_request_scope() -> None:
+    request = scope()
+    assert client_identity(request) is None
+    assert ClientIdentity()(request) == "ip:10.0.0.1"
+    assert client_identity(request) == "ip:10.0.0.1"
+    assert request["state"]["client_identity"] == "ip:10.0.0.1"
+
+class SlowRepository(IAgentRepository):
+    # find_by_id blocks until released and records how many calls overlap
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, project_name: str, agent: Agent) -> Agent:
+        return agent
+
+    async def find_by_id(self, project_name: str, agent_id: AgentId) -> Agent | None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        return Agent(
+            AgentProps(
+                id=agent_id,
+                name=AgentName(value="agente"),
+                description=AgentDescription(value="agente"),
+                model_configuration=ModelConfiguration(model_name="gpt-4o"),
+            )
+        )
+
+    async def find_all(self, project_name: str) -> list[Agent]:
+        return []
+
+    async def delete(self, project_name: str, agent_id: AgentId) -> None:
+        pass
+
+def get_agent(index: int) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": index,
+        "method": "tools/call",
+        "params": {
+            "name": "get_agent",
+            "arguments": {"projectName": "proyecto", "agentId": f"asst_{index}"},
+        },
+    }
+
+@contextlib.asynccontextmanager
+async def stateless_app(repository: IAgentRepository) -> AsyncIterator[Any]:
+    server = MCPServer(
+        create_agent_use_case=CreateAgentUseCase(repository),
+        get_agent_use_case=GetAgentUseCase(repository),
+        list_agents_use_case=ListAgentsUseCase(repository),
+        azure_client=AzureFoundryClient(
+            AzureFoundryConfig(endpoint="https://foundry.invalid", api_key="key")
+        ),
+        admission=AdmissionController(max_in_flight=64, max_in_flight_per_session=1),
+        compression_encodings=(),
+    )
+    app = server.build_http_app("streamable-http")
+    async with app.router.lifespan_context(app):
+        yield app
+
+async def post_from(app: Any, ip: str, payload: dict[str, Any]) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app, client=(ip, 40000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+        return await http.post(
+            "/mcp",
+            json=payload,
+            headers={"Accept": "application/json, text/event-stream"},
+        )
+
+async def test_stateless_requests_from_one_client_share_its_admission_cap() -> None:
+    repository = SlowRepository()
+    async with stateless_app(repository) as app:
+        calls = [
+            asyncio.create_task(post_from(app, "10.0.0.1", get_agent(index)))
+            for index in range(3)
+        ]
+        other = asyncio.create_task(post_from(app, "10.0.0.2", get_agent(9)))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if repository.active == 2:
+                break
+        # One call of each client runs; the first client's others wait in the queue
+        assert repository.active == 2
+        repository.release.set()
+        responses = await asyncio.gather(*calls, other)
+
+    assert repository.peak == 2
+    for response in responses:
+        assert response.status_code == 200
+        assert not response.json()["result"].get("isError")
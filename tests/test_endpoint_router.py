@@ -0,0 +1,205 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from creacion_agente_mcp.infrastructure.azure import AzureFoundryClient, AzureFoundryConfig
+from creacion_agente_mcp.infrastructure.azure.endpoint_router import EndpointRouter
+from creacion_agente_mcp.observability import ServerMetrics
+
+A, B, C = "https://a.example", "https://b.example", "https://c.example"
+
+class Probe:
+    # Probe outcome and simulated round trip per endpoint
+    def __init__(self) -> None:
+        self.latency: dict[str, float] = {}
+        self.down: set[str] = set()
+
+    async def __call__(self, endpoint: str) -> None:
+        if endpoint in self.down:
+            raise ConnectionError(endpoint)
+
+def router_with_latencies(
+    latencies: dict[str, float], **kwargs: Any
+) -> tuple[EndpointRouter, Probe]:
+    probe = Probe()
+    router = EndpointRouter(list(latencies), probe, **kwargs)
+    for url, latency in latencies.items():
+        router._endpoints[url].latency = latency
+    return router, probe
+
+def test_unprobed_endpoints_keep_configured_order() -> None:
+    router = EndpointRouter([A, B, C], Probe())
+    assert router.candidates() == [A, B, C]
+
+def test_fastest_endpoint_first_with_switch_margin() -> None:
+    metrics = ServerMetrics()
+    router, _ = router_with_latencies({A: 0.100, B: 0.090, C: 0.300}, metrics=metrics)
+    # B is only 10% faster than the preferred A: no switch
+    assert router.candidates() == [A, B, C]
+    router._endpoints[B].latency = 0.050
+    assert router.candidates() == [B, A, C]
+    assert metrics.endpoint_switches.value(endpoint="b.example") == 1
+
+def test_error_rate_raises_the_score() -> None:
+    router, _ = router_with_latencies({A: 0.050, B: 0.060})
+    for _ in range(5):
+        router.record(A, ok=False)
+        router.record(A, ok=False)
+        router.record(A, ok=True)
+    # Two of three tries fail (below the ejection threshold), so A's expected time to
+    # a good answer is about twice its latency, well above B's
+    assert router.candidates()[0] == B
+
+def test_ejection_after_consecutive_failures_and_readmission() -> None:
+    metrics = ServerMetrics()
+    router, _ = router_with_latencies(
+        {A: 0.010, B: 0.050}, failure_threshold=3, recovery_successes=2, metrics=metrics
+    )
+    router.record(A, ok=False)
+    router.record(A, ok=False)
+    router.record(A, ok=True)
+    router.record(A, ok=False)
+    router.record(A, ok=False)
+    assert router.candidates()[0] == A
+    router.record(A, ok=False)
+    assert router.candidates() == [B, A]
+    assert metrics.endpoint_healthy.value(endpoint="a.example") == 0
+
+    router.record(A, ok=True)
+    assert router.candidates() == [B, A]
+    router.record(A, ok=True)
+    assert metrics.endpoint_healthy.value(endpoint="a.example") == 1
+    # Still far faster than B despite its error rate, so traffic moves back
+    assert router.candidates() == [A, B]
+
+def test_all_ejected_are_still_tried_fewest_failures_first() -> None:
+    router, _ = router_with_latencies({A: 0.010, B: 0.050}, failure_threshold=1)
+    router.record(A, ok=False)
+    router.record(A, ok=False)
+    router.record(B, ok=False)
+    assert router.candidates() == [B, A]
+
+async def test_probes_measure_latency_and_readmit() -> None:
+    metrics = ServerMetrics()
+    probe = Probe()
+    router = EndpointRouter(
+        [A, B], probe, failure_threshold=1, recovery_successes=2, metrics=metrics
+    )
+    probe.down.add(A)
+    await router.probe_all()
+    assert router.candidates() == [B, A]
+    assert metrics.endpoint_probes.value(endpoint="a.example", result="failure") == 1
+    assert metrics.endpoint_latency.value(endpoint="b.example") > 0
+
+    probe.down.clear()
+    await router.probe_all()
+    await router.probe_all()
+    assert metrics.endpoint_healthy.value(endpoint="a.example") == 1
+
+async def test_background_probes_start_and_stop() -> None:
+    calls: list[str] = []
+
+    async def probe(endpoint: str) -> None:
+        calls.append(endpoint)
+
+    router = EndpointRouter([A, B], probe, probe_interval=0.01)
+    router.start()
+    await asyncio.sleep(0.05)
+    await router.stop()
+    count = len(calls)
+    assert count >= 4
+    await asyncio.sleep(0.03)
+    assert len(calls) == count
+
+def client_with(handler: Any, **config: Any) -> tuple[AzureFoundryClient, ServerMetrics]:
+    metrics = ServerMetrics()
+    client = AzureFoundryClient(
+        AzureFoundryConfig(
+            endpoint=A,
+            endpoints=[B],
+            api_key="key",
+            project_index_ttl=0,
+            endpoint_probe_interval=3600,
+            **config,
+        ),
+        metrics=metrics,
+    )
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, metrics
+
+AGENT = {"id": "asst_1", "name": "agente", "model": "gpt-4o", "created_at": 1}
+
+async def test_reads_fail_over_on_5xx() -> None:
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/projects":
+            # Background probe
+            return httpx.Response(200, json={"value": []})
+        hosts.append(request.url.host)
+        if request.url.host == "a.example":
+            return httpx.Response(503)
+        return httpx.Response(200, json=AGENT)
+
+    client, metrics = client_with(handler)
+    agent = await client.get_agent("proyecto", "asst_1")
+    assert agent is not None and agent.id == "asst_1"
+    assert hosts == ["a.example", "b.example"]
+    assert metrics.upstream_failovers.value(operation="get_agent", reason="503") == 1
+    await client.aclose()
+
+async def test_writes_only_fail_over_when_the_request_was_not_sent() -> None:
+    posts: list[str] = []
+    refuse = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method != "POST":
+            return httpx.Response(200, json={"value": []})
+        posts.append(request.url.host)
+        if request.url.host == "a.example":
+            if refuse:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(503)
+        return httpx.Response(200, json=AGENT)
+
+    client, metrics = client_with(handler)
+    await client.create_agent("proyecto", {"model": "gpt-4o", "name": "agente"})
+    assert posts == ["a.example", "b.example"]
+    assert metrics.upstream_failovers.value(operation="create_agent", reason="ConnectError") == 1
+
+    # A 5xx may come after the agent was created: never sent again
+    refuse = False
+    posts.clear()
+    client._router._endpoints[B].healthy = False
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.create_agent("proyecto", {"model": "gpt-4o", "name": "agente"})
+    assert posts == ["a.example"]
+    await client.aclose()
+
+async def test_single_endpoint_has_no_router() -> None:
+    client = AzureFoundryClient(AzureFoundryConfig(endpoint=A, api_key="key"))
+    assert client._router is None
+    await client.aclose()
+
+async def test_phase_metrics_are_labelled_by_configured_endpoint() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/projects":
+            return httpx.Response(200, json={"value": []})
+        if request.url.host == "a.example":
+            return httpx.Response(
+                200, json={"value": [{"name": "d1"}], "nextLink": "https://c.example/next"}
+            )
+        return httpx.Response(200, json={"value": [{"name": "d2"}]})
+
+    client, metrics = client_with(handler)
+    deployments, _ = await client.list_deployments("proyecto")
+    assert [deployment["name"] for deployment in deployments] == ["d1", "d2"]
+
+    samples = metrics.upstream_phase_duration.samples()
+    endpoints = {labels[1] for labels, _ in samples if labels[0] == "list_deployments"}
+    assert endpoints == {"a.example", "other"}
+    decoded = {labels[1] for labels, _ in samples if labels[2] == "decode"}
+    assert decoded == {"a.example", "other"}
+    await client.aclose()
@@ -0,0 +1,87 @@
+import json
+import os
+
+from creacion_agente_mcp.observability import ServerMetrics, merge_snapshots
+from creacion_agente_mcp.presentation.prefork import (
+    PreforkSupervisor,
+    WorkerReporter,
+    _WorkerProcess,
+)
+
+def samples(merged: dict, name: str) -> dict[tuple[str, ...], object]:
+    return {tuple(labels): value for labels, value in merged[name]["samples"]}
+
+def two_workers() -> tuple[ServerMetrics, ServerMetrics]:
+    first, second = ServerMetrics(), ServerMetrics()
+    for metrics, in_flight, healthy, latency, entries in (
+        (first, 2, 1, 0.1, 10),
+        (second, 3, 0, 0.3, 40),
+    ):
+        metrics.tool_calls.inc(tool="get_agent", status="ok")
+        metrics.tool_call_duration.observe(0.02, tool="get_agent")
+        metrics.tool_calls_in_flight.inc(in_flight)
+        metrics.endpoint_healthy.set(healthy, endpoint="a.example")
+        metrics.endpoint_latency.set(latency, endpoint="a.example")
+        metrics.cache_entries.set(entries, cache="agent")
+    return first, second
+
+def test_counters_histograms_and_additive_gauges_are_summed() -> None:
+    first, second = two_workers()
+    merged = merge_snapshots([first.registry.snapshot(), second.registry.snapshot()])
+    assert samples(merged, "mcp_tool_calls_total")[("get_agent", "ok")] == 2
+    histogram = samples(merged, "mcp_tool_call_duration_seconds")[("get_agent",)]
+    assert histogram["count"] == 2
+    assert samples(merged, "mcp_tool_calls_in_flight")[()] == 5
+
+def test_per_process_gauges_are_not_summed() -> None:
+    first, second = two_workers()
+    merged = merge_snapshots([first.registry.snapshot(), None, second.registry.snapshot()])
+    assert samples(merged, "foundry_endpoint_healthy")[("a.example",)] == 0.5
+    assert samples(merged, "foundry_endpoint_latency_seconds")[("a.example",)] == 0.2
+    assert samples(merged, "mcp_cache_entries")[("agent",)] == 40
+
+def test_gauges_average_over_workers_that_report_them() -> None:
+    first, second = two_workers()
+    third = ServerMetrics()
+    merged = merge_snapshots([s.registry.snapshot() for s in (first, second, third)])
+    assert samples(merged, "foundry_endpoint_latency_seconds")[("a.example",)] == 0.2
+
+def test_supervisor_renders_merged_worker_metrics() -> None:
+    supervisor = PreforkSupervisor(lambda sock, reporter: None, "127.0.0.1", 0, workers=2)
+    for pid, metrics in zip((101, 102), two_workers()):
+        process = _WorkerProcess(slot=pid - 101, pid=pid, fd=-1)
+        process.snapshot = {"metrics": metrics.registry.snapshot()}
+        supervisor._processes[pid] = process
+
+    text = supervisor.render_metrics()
+    assert "mcp_workers_alive 2" in text
+    assert 'foundry_endpoint_healthy{endpoint="a.example"} 0.5' in text
+    assert "mcp_tool_calls_in_flight 5" in text
+    assert 'mcp_cache_entries{cache="agent"} 40' in text
+
+def test_heartbeat_lines_survive_partial_writes() -> None:
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    reporter = WorkerReporter(slot=3, fd=write_fd, interval=1.0)
+    metrics = ServerMetrics()
+    for index in range(2000):
+        metrics.cache_requests.inc(cache=f"cache-{index}", result="hit")
+    reporter.attach_metrics(metrics.registry)
+
+    buffer = b""
+    lines: list[bytes] = []
+    try:
+        for _ in range(50):
+            reporter.report()
+            try:
+                # A reader slower than the writer forces short writes
+                buffer += os.read(read_fd, 16384)
+            except BlockingIOError:
+                pass
+            *complete, buffer = buffer.split(b"\n")
+            lines.extend(complete)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    assert len(lines) >= 2
+    assert all(json.loads(line)["slot"] == 3 for line in lines)
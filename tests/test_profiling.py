@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from creacion_agente_mcp.presentation.profiling import Profiler, build_profiling_routes
+
+def client_for(profiler: Profiler) -> TestClient:
+    return TestClient(Starlette(routes=build_profiling_routes(profiler)))
+
+@pytest.mark.parametrize("path", ["/debug/profile?seconds=1", "/debug/tasks"])
+def test_routes_are_refused_without_an_admin_token(path: str) -> None:
+    client = client_for(Profiler(admin_token=None))
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={"Authorization": "Bearer "}).status_code == 403
+    assert not Profiler(admin_token="").authorized("Bearer ")
+
+@pytest.mark.parametrize("path", ["/debug/profile?seconds=1", "/debug/tasks"])
+def test_routes_require_the_admin_token(path: str) -> None:
+    client = client_for(Profiler(admin_token="secret"))
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+def test_admin_token_grants_access(tmp_path: Path) -> None:
+    client = client_for(Profiler(output_dir=str(tmp_path), admin_token="secret"))
+    response = client.get("/debug/tasks", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    response = client.get("/debug/profile?seconds=0", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 400
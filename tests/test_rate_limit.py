@@ -0,0 +1,116 @@
+from typing import Any
+
+import pytest
+
+from creacion_agente_mcp.presentation import rate_limit
+from creacion_agente_mcp.presentation.rate_limit import (
+    RateLimiter,
+    RateLimitMiddleware,
+    TokenBucket,
+)
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+def test_bucket_refills_at_rate_up_to_capacity() -> None:
+    bucket = TokenBucket(capacity=10, rate=2, now=0)
+    bucket.tokens = 0
+    bucket.refill(now=3)
+    assert bucket.tokens == 6
+    bucket.refill(now=100)
+    assert bucket.tokens == 10
+    bucket.tokens = 1
+    assert bucket.wait_time(5) == 2
+    assert bucket.reset_time() == 4.5
+
+def test_burst_is_spent_then_refilled(clock: Clock) -> None:
+    limiter = RateLimiter(read_rate=1, read_burst=3)
+    for remaining in (2, 1, 0):
+        decision = limiter.acquire("ip:a", {"read": 1})
+        assert decision.allowed and decision.remaining == remaining
+    denied = limiter.acquire("ip:a", {"read": 1})
+    assert not denied.allowed
+    assert denied.retry_after == 1
+
+    clock.now += 1
+    assert limiter.acquire("ip:a", {"read": 1}).allowed
+    # Other clients have their own bucket
+    assert limiter.acquire("ip:b", {"read": 3}).allowed
+
+def test_tool_costs_and_write_budget(clock: Clock) -> None:
+    limiter = RateLimiter(
+        read_rate=1, read_burst=10, write_rate=1, write_burst=2, tool_costs={"list_agents": 4}
+    )
+    assert limiter.cost_of("list_agents") == 4
+    assert limiter.cost_of("get_agent") == 1
+    assert limiter.kind_of("create_agent") == "write"
+    assert limiter.kind_of("list_agents") == "read"
+
+    assert limiter.acquire("ip:a", {"read": 8}).allowed
+    # All or nothing: a denied write spends no read tokens either
+    assert limiter.acquire("ip:a", {"read": 1, "write": 2}).allowed
+    denied = limiter.acquire("ip:a", {"read": 1, "write": 1})
+    assert not denied.allowed
+    assert limiter.acquire("ip:a", {"read": 1}).allowed
+
+def test_cost_above_burst_is_capped_instead_of_never_allowed(clock: Clock) -> None:
+    limiter = RateLimiter(read_rate=1, read_burst=2)
+    assert limiter.acquire("ip:a", {"read": 5}).allowed
+    assert not limiter.acquire("ip:a", {"read": 5}).allowed
+
+def test_reconfigure_caps_balances_and_evicts(clock: Clock) -> None:
+    limiter = RateLimiter(read_rate=1, read_burst=50, idle_ttl=60)
+    limiter.acquire("ip:a", {"read": 1})
+    limiter.acquire("ip:b", {"read": 1})
+    limiter.reconfigure(read_rate=1, read_burst=5, write_rate=1, write_burst=5, max_clients=1)
+    assert len(limiter) == 1
+    decision = limiter.acquire("ip:b", {"read": 1})
+    assert decision.limit == 5 and decision.remaining == 4
+
+    clock.now += 61
+    limiter.acquire("ip:c", {"read": 1})
+    assert len(limiter) == 1
+
+async def test_middleware_refuses_oversized_bodies_before_buffering_them() -> None:
+    reached = []
+
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        reached.append(scope)
+
+    async def run(headers: list[tuple[bytes, bytes]], chunks: list[bytes]) -> list[Any]:
+        pending = [
+            {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+            for i, chunk in enumerate(chunks)
+        ]
+        sent: list[Any] = []
+
+        async def receive() -> Any:
+            return pending.pop(0)
+
+        async def send(message: Any) -> None:
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "headers": headers, "client": ("10.0.0.1", 1)}
+        await middleware(scope, receive, send)
+        return sent
+
+    middleware = RateLimitMiddleware(app, RateLimiter(), max_body_bytes=16)
+    declared = await run([(b"content-length", b"17")], [b"x" * 17])
+    assert declared[0]["status"] == 413
+    # Chunked bodies carry no Content-Length and are counted as they arrive
+    streamed = await run([], [b"x" * 10, b"x" * 10])
+    assert streamed[0]["status"] == 413
+    assert reached == []
+
+    assert await run([], [b"{}"]) == []
+    assert len(reached) == 1
@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from creacion_agente_mcp.infrastructure.azure import request_timing
+from creacion_agente_mcp.infrastructure.azure.request_timing import PHASES, RequestTiming
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(request_timing.time, "perf_counter", clock)
+    return clock
+
+async def step(timing: RequestTiming, clock: Clock, event: str, seconds: float) -> None:
+    await timing.trace(event, {})
+    clock.now += seconds
+
+async def test_trace_steps_split_the_request_into_phases(clock: Clock) -> None:
+    timing = RequestTiming()
+    clock.now += 0.001
+    timing.enter("pool")
+    clock.now += 0.002
+    await step(timing, clock, "connection.connect_tcp.started", 0.010)
+    await step(timing, clock, "connection.connect_tcp.complete", 0.0)
+    await step(timing, clock, "connection.start_tls.started", 0.020)
+    await step(timing, clock, "connection.start_tls.complete", 0.0)
+    await step(timing, clock, "http11.send_request_headers.started", 0.001)
+    await step(timing, clock, "http11.send_request_body.started", 0.001)
+    await step(timing, clock, "http11.receive_response_headers.started", 0.050)
+    await step(timing, clock, "http11.receive_response_body.started", 0.005)
+    await step(timing, clock, "http11.response_closed.started", 0.001)
+    timing.finish()
+    timing.add("decode", 0.003)
+
+    assert list(timing.phases) == list(PHASES)
+    assert timing.phases == pytest.approx(
+        {
+            "auth": 0.001,
+            "pool": 0.002,
+            "connect": 0.010,
+            "tls": 0.020,
+            "send": 0.002,
+            "server": 0.050,
+            "download": 0.006,
+            "decode": 0.003,
+        }
+    )
+    assert timing.describe() == (
+        "auth 1ms, pool 2ms, connect 10ms, tls 20ms, send 2ms, server 50ms, download 6ms, "
+        "decode 3ms"
+    )
+
+async def test_reused_connection_skips_connect_and_tls(clock: Clock) -> None:
+    timing = RequestTiming()
+    timing.enter("pool")
+    clock.now += 0.001
+    await step(timing, clock, "http2.send_request_headers.started", 0.002)
+    await step(timing, clock, "http2.receive_response_headers.started", 0.030)
+    await step(timing, clock, "http2.receive_response_body.started", 0.004)
+    timing.finish()
+
+    assert set(timing.phases) == {"auth", "pool", "send", "server", "download"}
+    assert timing.phases["server"] == pytest.approx(0.030)
+    assert timing.describe().startswith("auth 0ms, pool 1ms, send 2ms")
+
+async def test_connect_retries_count_as_connect(clock: Clock) -> None:
+    timing = RequestTiming()
+    timing.enter("pool")
+    await step(timing, clock, "connection.connect_tcp.started", 0.005)
+    await step(timing, clock, "connection.connect_tcp.failed", 0.0)
+    await step(timing, clock, "connection.retry.started", 0.100)
+    await step(timing, clock, "connection.connect_tcp.started", 0.005)
+    await step(timing, clock, "http11.send_request_headers.started", 0.001)
+    timing.finish()
+
+    assert timing.phases["connect"] == pytest.approx(0.110)
+
+async def test_unknown_steps_and_complete_events_do_not_change_phase(clock: Clock) -> None:
+    timing = RequestTiming()
+    timing.enter("pool")
+    await step(timing, clock, "http11.receive_response_headers.started", 0.010)
+    await step(timing, clock, "http11.receive_response_headers.complete", 0.002)
+    await step(timing, clock, "connection.something_new.started", 0.003)
+    timing.finish()
+
+    assert timing.phases["server"] == pytest.approx(0.015)
+
+async def test_real_request_reports_every_network_phase() -> None:
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(respond, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    timing = RequestTiming()
+    try:
+        async with httpx.AsyncClient() as client:
+            timing.enter("pool")
+            response = await client.get(
+                f"http://127.0.0.1:{port}/", extensions={"trace": timing.trace}
+            )
+            timing.finish()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert response.text == "ok"
+    assert {"pool", "connect", "send", "server", "download"} <= set(timing.phases)
+    assert "tls" not in timing.phases
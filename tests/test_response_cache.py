@@ -0,0 +1,218 @@
+import asyncio
+import json
+
+import pytest
+
+from creacion_agente_mcp.application.use_cases import (
+    CreateAgentUseCase,
+    GetAgentUseCase,
+    ListAgentsUseCase,
+)
+from creacion_agente_mcp.domain.entities import Agent
+from creacion_agente_mcp.domain.repositories import IAgentRepository
+from creacion_agente_mcp.domain.value_objects import AgentId
+from creacion_agente_mcp.infrastructure.azure import AzureFoundryClient, AzureFoundryConfig
+from creacion_agente_mcp.observability import ServerMetrics
+from creacion_agente_mcp.presentation import response_cache
+from creacion_agente_mcp.presentation.mcp_server import MCPServer
+from creacion_agente_mcp.presentation.response_cache import ResponseCache
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"payload-{self.calls}"
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "monotonic", clock)
+    return clock
+
+def make_cache(metrics: ServerMetrics) -> ResponseCache:
+    return ResponseCache(ttls={"list_models": 60.0}, stale_ttl=30.0, metrics=metrics)
+
+def results(metrics: ServerMetrics) -> dict[str, float]:
+    return {labels[1]: value for labels, value in metrics.cache_requests.samples()}
+
+async def text(cache: ResponseCache, loader: Loader, arguments: object = None) -> str:
+    return (await cache.get_or_load("list_models", arguments, loader))[0].text
+
+async def test_concurrent_misses_share_one_load(clock: Clock) -> None:
+    metrics = ServerMetrics()
+    cache, loader = make_cache(metrics), Loader()
+    loader.release.clear()
+
+    calls = [asyncio.create_task(text(cache, loader)) for _ in range(10)]
+    await settle()
+    loader.release.set()
+
+    assert await asyncio.gather(*calls) == ["payload-1"] * 10
+    assert loader.calls == 1
+    assert await text(cache, loader) == "payload-1"
+    assert results(metrics) == {"miss": 10, "hit": 1}
+
+async def test_cancelled_caller_does_not_cancel_the_shared_load(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    loader.release.clear()
+
+    first = asyncio.create_task(text(cache, loader))
+    second = asyncio.create_task(text(cache, loader))
+    await settle()
+    first.cancel()
+    loader.release.set()
+
+    assert await second == "payload-1"
+    assert loader.calls == 1
+
+async def test_arguments_are_part_of_the_key_but_none_values_are_not(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    assert await text(cache, loader, {"publisher": "x", "region": None}) == "payload-1"
+    assert await text(cache, loader, {"publisher": "x"}) == "payload-1"
+    assert await text(cache, loader, {"publisher": "y"}) == "payload-2"
+
+async def test_stale_entry_is_served_while_one_refresh_runs(clock: Clock) -> None:
+    metrics = ServerMetrics()
+    cache, loader = make_cache(metrics), Loader()
+    await text(cache, loader)
+    clock.now += 70
+    loader.release.clear()
+
+    assert await text(cache, loader) == "payload-1"
+    assert await text(cache, loader) == "payload-1"
+    await settle()
+    assert loader.calls == 2
+    loader.release.set()
+    await settle()
+
+    assert await text(cache, loader) == "payload-2"
+    clock.now += 100
+    assert await text(cache, loader) == "payload-3"
+    assert results(metrics) == {"miss": 2, "stale": 2, "hit": 1}
+
+async def test_invalidate_drops_entries_and_forces_a_load(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    await text(cache, loader)
+    assert cache.invalidate("list_projects") == 0
+    assert cache.invalidate("list_models") == 1
+    assert await text(cache, loader) == "payload-2"
+
+async def test_invalidate_can_be_limited_to_one_project(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    await text(cache, loader, {"projectName": "a"})
+    await text(cache, loader, {"projectName": "b"})
+    await text(cache, loader)
+
+    assert cache.invalidate("list_models", project="a") == 1
+    assert await text(cache, loader, {"projectName": "b"}) == "payload-2"
+    assert await text(cache, loader, {"projectName": "a"}) == "payload-4"
+
+async def test_invalidation_during_a_load_discards_its_result(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    loader.release.clear()
+
+    pending = asyncio.create_task(text(cache, loader))
+    await settle()
+    cache.invalidate()
+    loader.release.set()
+
+    # The caller still gets the answer it waited for, but it is not cached
+    assert await pending == "payload-1"
+    assert await text(cache, loader) == "payload-2"
+    assert await text(cache, loader) == "payload-2"
+
+async def test_reconfigure_discards_loads_already_running(clock: Clock) -> None:
+    cache, loader = make_cache(ServerMetrics()), Loader()
+    loader.release.clear()
+
+    pending = asyncio.create_task(text(cache, loader))
+    await settle()
+    cache.reconfigure({"list_models": 60.0}, stale_ttl=30.0, max_entries=256)
+    loader.release.set()
+
+    assert await pending == "payload-1"
+    assert await text(cache, loader) == "payload-2"
+
+async def test_failed_refresh_keeps_serving_the_stale_entry(clock: Clock) -> None:
+    metrics = ServerMetrics()
+    cache, loader = make_cache(metrics), Loader()
+    await text(cache, loader)
+    clock.now += 70
+
+    async def failing() -> str:
+        raise RuntimeError("upstream down")
+
+    assert (await cache.get_or_load("list_models", None, failing))[0].text == "payload-1"
+    await settle()
+    assert results(metrics)["refresh_error"] == 1
+    assert await text(cache, loader) == "payload-1"
+
+async def test_least_recently_used_entries_are_evicted(clock: Clock) -> None:
+    cache = ResponseCache(ttls={"list_models": 60.0}, max_entries=2, metrics=ServerMetrics())
+    loader = Loader()
+    await text(cache, loader, {"page": 1})
+    await text(cache, loader, {"page": 2})
+    await text(cache, loader, {"page": 1})
+    await text(cache, loader, {"page": 3})
+
+    assert await text(cache, loader, {"page": 1}) == "payload-1"
+    assert await text(cache, loader, {"page": 2}) == "payload-4"
+
+class InMemoryRepository(IAgentRepository):
+    def __init__(self) -> None:
+        self.agents: dict[str, list[Agent]] = {}
+
+    async def create(self, project_name: str, agent: Agent) -> Agent:
+        self.agents.setdefault(project_name, []).append(agent)
+        return agent
+
+    async def find_by_id(self, project_name: str, agent_id: AgentId) -> Agent | None:
+        return None
+
+    async def find_all(self, project_name: str) -> list[Agent]:
+        return list(self.agents.get(project_name, []))
+
+    async def delete(self, project_name: str, agent_id: AgentId) -> None:
+        pass
+
+async def test_created_agent_shows_up_in_a_cached_listing(clock: Clock) -> None:
+    repository = InMemoryRepository()
+    server = MCPServer(
+        create_agent_use_case=CreateAgentUseCase(repository),
+        get_agent_use_case=GetAgentUseCase(repository),
+        list_agents_use_case=ListAgentsUseCase(repository),
+        azure_client=AzureFoundryClient(
+            AzureFoundryConfig(endpoint="https://foundry.invalid", api_key="key")
+        ),
+        response_cache=ResponseCache(ttls={"list_agents": 60.0}, metrics=ServerMetrics()),
+    )
+
+    async def names(project: str) -> list[str]:
+        result = await server._call_tool("list_agents", {"projectName": project})
+        return [agent["name"] for agent in json.loads(result[0].text)]
+
+    assert await names("a") == []
+    assert await names("b") == []
+    arguments = {"projectName": "a", "name": "nuevo", "modelName": "gpt-4o"}
+    await server._call_tool("create_agent", arguments)
+
+    assert await names("a") == ["nuevo"]
+    # Other projects keep their cached listing
+    assert server.response_cache is not None
+    assert server.response_cache.invalidate(project="b") == 1